@@ -0,0 +1,110 @@
+# benchmarks/bench_grid.py
+"""
+Compara el backend de widgets (VirtualGrid) con el de canvas (CanvasGrid).
+
+Para 500, 2.000 y 10.000 juegos sintéticos mide:
+  - build: set_items() + primer dibujado completo
+  - wheel: media por paso de scroll con la rueda (3 unidades)
+  - jump:  media por salto a una posición aleatoria de la lista
+
+Uso (necesita pantalla):  python benchmarks/bench_grid.py [--sizes 500,2000]
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import threading
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import customtkinter as ctk
+from ui.main_window import MainWindow
+from ui.cover_loader import CoverLoader
+
+
+class BenchWindow(MainWindow):
+    """MainWindow sin BD, atlas ni red: sólo la vista de juegos."""
+
+    def __init__(self, games, backend, mode="grid"):
+        ctk.CTk.__init__(self)
+        self.geometry("1180x720")
+        self.juegos = games
+        self.view_mode = mode
+        self.render_backend = backend
+        self.atlas = None
+        self._atlas_misses = {}
+        self._palette_pending = {}
+        self._fetching = set()
+        self._preloaded = {}
+        self._pending_lock = threading.Lock()
+        self.tasks = None
+        self.covers = CoverLoader(self)
+        self.games_view = self._build_games_view()
+        self.games_view.pack(fill="both", expand=True)
+
+    def _decode_cover(self, game, size):
+        return None
+
+
+def fake_games(n):
+    return [{
+        "id": i + 1,
+        "nombre": f"Juego de prueba {i:05d}",
+        "ruta": f"C:\\Games\\Juego{i}\\juego.exe",
+        "folder": f"C:\\Games\\Juego{i}",
+        "playtime": (i * 37) % 5000,
+        "last_played": None,
+        "cover_path": None,
+    } for i in range(n)]
+
+
+def _ms(start):
+    return (time.perf_counter() - start) * 1000
+
+
+def bench(backend, n, mode="grid", wheel_steps=60, jumps=20):
+    win = BenchWindow(fake_games(n), backend, mode)
+    win.update()
+    view = win.games_view
+
+    t = time.perf_counter()
+    view.set_items(win.juegos)
+    win.update()
+    build = _ms(t)
+
+    t = time.perf_counter()
+    for _ in range(wheel_steps):
+        view.canvas.yview_scroll(3, "units")
+        view._render()
+        win.update_idletasks()
+    wheel = _ms(t) / wheel_steps
+
+    rnd = random.Random(n)
+    t = time.perf_counter()
+    for _ in range(jumps):
+        view.canvas.yview_moveto(rnd.random())
+        view._render()
+        win.update_idletasks()
+    jump = _ms(t) / jumps
+
+    binds = view.bind_count
+    win.destroy()
+    return build, wheel, jump, binds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="500,2000,10000")
+    parser.add_argument("--mode", choices=("grid", "list"), default="grid")
+    args = parser.parse_args()
+
+    print(f"{'backend':<8} {'juegos':>7} {'build ms':>9} {'wheel ms':>9} {'jump ms':>8} {'binds':>6}")
+    for n in (int(x) for x in args.sizes.split(",")):
+        for backend in ("widgets", "canvas"):
+            build, wheel, jump, binds = bench(backend, n, args.mode)
+            print(f"{backend:<8} {n:>7} {build:>9.1f} {wheel:>9.2f} {jump:>8.2f} {binds:>6}")
+
+
+if __name__ == "__main__":
+    main()
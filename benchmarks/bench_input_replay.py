@@ -0,0 +1,328 @@
+# benchmarks/bench_input_replay.py
+"""
+Ida y vuelta de una grabación de mandos (core/input_recording.py), sin mando
+ni pantalla.
+
+Publica en el servicio de mandos una secuencia sintética fija (semilla) de
+botones, ejes y hats con marcas de tiempo conocidas, la graba, la decodifica
+y la reproduce en modo directo a máxima velocidad. Comprueba que:
+  - decode() devuelve los mismos eventos y tiempos (ejes con precisión 1/32767)
+  - la reproducción directa entrega exactamente la secuencia decodificada
+y muestra el tamaño por evento y los eventos/s de la reproducción.
+
+Después graba un recorrido de navegación fijo (toques y pulsaciones largas
+de cruceta y stick, que activan la repetición, y A al final) mezclado con
+--noise eventos de ejes y botones que la navegación ignora, y lo reproduce
+en un ControllerNavigator real sobre una VirtualGrid sin Tk (canvas de
+mentira, after() con reloj virtual a los tiempos de la grabación).
+Comprueba el índice final del foco y el juego lanzado contra un modelo
+aparte de la rejilla y que pasen al menos --min-rate eventos/s.
+
+Sale con código 1 si algo no coincide, así que sirve como prueba en CI.
+
+Uso:  python benchmarks/bench_input_replay.py [--events 20000] [--seed 1]
+                                             [--noise 20000] [--min-rate 20000]
+"""
+import os
+import sys
+import time
+import heapq
+import random
+import argparse
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core.input_service import InputEvent, InputService
+from core.input_recording import InputRecorder, InputPlayer, decode, AXIS_MAX
+from ui.controller_nav import ControllerNavigator
+from ui.virtual_grid import VirtualGrid
+
+DEVICE = 7
+
+# recorrido de navegación: (control, dirección, ms pulsado); 150 ms entre uno y otro
+ITEMS, COLS, CELL_H, VIEW_H = 997, 8, 300, 720
+NAV_GAP_MS = 150
+NAV_SCRIPT = [
+    ("hat", (1, 0), 80),            # primer toque: sólo aparece el foco
+    ("hat", (1, 0), 80),
+    ("hat", (1, 0), 600),           # repetición: 4 pasos
+    ("hat", (0, 1), 1000),
+    ("stick", (-1, 0), 200),
+    ("stick", (0, -1), 480),
+    ("hat", (1, 0), 1990),          # hasta el borde derecho
+    ("hat", (0, 1), 20000),         # hasta la última fila (incompleta)
+    ("hat", (0, -1), 800),
+    ("stick", (1, 0), 130),
+]
+
+
+class OfflineService(InputService):
+    """Sólo publish/subscribe: sin hilo de SDL ni mandos reales."""
+
+    def _run(self):
+        pass
+
+
+def synthetic_events(n, seed):
+    """[(t en s, InputEvent)] como los de un mando: 6 ejes, 12 botones, 1 hat."""
+    rng = random.Random(seed)
+    events = []
+    t = 0.0
+    for _ in range(n):
+        t += rng.randint(0, 20000) / 1e6            # 0-20 ms entre eventos, en µs exactos
+        kind = rng.choice(("axis", "axis", "button", "hat"))
+        if kind == "axis":
+            index, value = rng.randrange(6), rng.uniform(-1.0, 1.0)
+        elif kind == "button":
+            index, value = rng.randrange(12), rng.random() < 0.5
+        else:
+            index, value = 0, (rng.randint(-1, 1), rng.randint(-1, 1))
+        events.append((t, InputEvent(kind, DEVICE, index, value, None)))
+    return events
+
+
+def record(service, source):
+    """Publica source ([(t en s, InputEvent)]) con sus tiempos y devuelve la grabación."""
+    recorder = InputRecorder(service).start()
+    base = recorder.origin
+    for t, event in source:
+        service.publish(event._replace(t=base + t))
+    return recorder, recorder.stop()
+
+
+def same_event(a, b):
+    if (a.kind, a.device, a.index) != (b.kind, b.device, b.index):
+        return False
+    if a.kind == "axis":
+        return abs(a.value - b.value) <= 1 / AXIS_MAX
+    return a.value == b.value
+
+
+# ----------------------------
+# Navegación sin Tk
+# ----------------------------
+class FakeCanvas:
+    """Lo que VirtualGrid usa del canvas para el foco: desplazamiento y alto."""
+
+    def __init__(self, grid, height):
+        self.grid = grid
+        self.height = height
+        self.top = 0.0
+
+    def canvasy(self, y):
+        return self.top + y
+
+    def winfo_height(self):
+        return self.height
+
+    def yview_moveto(self, fraction):
+        self.top = fraction * self.grid._rows() * self.grid.cell_height
+
+
+class HeadlessGrid(VirtualGrid):
+    """VirtualGrid sin widgets: set_focus / move_focus / ensure_visible reales, sin tarjetas."""
+
+    def __init__(self, items, cols, cell_height, height):
+        self.items = items
+        self.cols = cols
+        self.cell_height = cell_height
+        self.key = lambda item: item
+        self.focus_index = None
+        self._focus_key = None
+        self._focused_card = None
+        self._visible = {}
+        self.canvas = FakeCanvas(self, height)
+        self.renders = 0
+
+    def _scaled(self, value):
+        return value
+
+    def _schedule_render(self):
+        self.renders += 1
+
+
+class HeadlessWindow:
+    """
+    Lo que ControllerNavigator usa de MainWindow. after() no espera: guarda
+    la llamada y advance() la ejecuta cuando el reloj virtual llega a su hora.
+    """
+
+    def __init__(self, grid):
+        self.games_view = grid
+        self.game_mode = SimpleNamespace(active=False)
+        self.now_ms = 0.0
+        self.launched = []
+        self._timers = []               # (hora, orden, id, función, args)
+        self._cancelled = set()
+        self._seq = 0
+
+    def after(self, ms, func, *args):
+        self._seq += 1
+        heapq.heappush(self._timers, (self.now_ms + ms, self._seq, self._seq, func, args))
+        return self._seq
+
+    def after_cancel(self, job):
+        self._cancelled.add(job)
+
+    def advance(self, t_ms):
+        while self._timers and self._timers[0][0] <= t_ms:
+            due, _seq, job, func, args = heapq.heappop(self._timers)
+            if job in self._cancelled:
+                self._cancelled.discard(job)
+                continue
+            self.now_ms = due
+            func(*args)
+        self.now_ms = t_ms
+
+    def focus_get(self):
+        return self
+
+    def winfo_toplevel(self):
+        return self
+
+    def launch_game(self, game):
+        self.launched.append(game)
+
+    def change_cover_dialog(self, game):
+        pass
+
+
+def navigation_events(noise, seed):
+    """[(t en s, InputEvent)] del recorrido NAV_SCRIPT más noise eventos que no navegan."""
+    rng = random.Random(seed)
+    events = []
+    t_ms = NAV_GAP_MS
+    for control, (dx, dy), hold_ms in NAV_SCRIPT:
+        if control == "hat":
+            press = [InputEvent("hat", DEVICE, 0, (dx, -dy), None)]     # en el hat, arriba es +1
+            release = [InputEvent("hat", DEVICE, 0, (0, 0), None)]
+        else:
+            axis = 0 if dx else 1
+            press = [InputEvent("axis", DEVICE, axis, 0.9 * (dx or dy), None)]
+            release = [InputEvent("axis", DEVICE, axis, 0.0, None)]
+        events += [(t_ms / 1000, e) for e in press]
+        events += [((t_ms + hold_ms) / 1000, e) for e in release]
+        t_ms += hold_ms + NAV_GAP_MS
+    events.append((t_ms / 1000, InputEvent("button", DEVICE, 0, True, None)))        # A
+    events.append(((t_ms + 80) / 1000, InputEvent("button", DEVICE, 0, False, None)))
+    end_ms = t_ms
+    for _ in range(noise):
+        at = rng.randint(1, end_ms - 1) / 1000
+        if rng.random() < 0.7:
+            event = InputEvent("axis", DEVICE, rng.randrange(2, 6), rng.uniform(-1.0, 1.0), None)
+        else:
+            event = InputEvent("button", DEVICE, rng.randrange(4, 12), rng.random() < 0.5, None)
+        events.append((at, event))
+    events.sort(key=lambda te: te[0])
+    return events
+
+
+def expected_focus():
+    """Índice final según un modelo aparte de la rejilla (celdas y repetición del navegador)."""
+    rows = (ITEMS + COLS - 1) // COLS
+    focus = None
+    for _control, (dx, dy), hold_ms in NAV_SCRIPT:
+        after_delay = hold_ms - ControllerNavigator.REPEAT_DELAY_MS
+        assert after_delay <= 0 or after_delay % ControllerNavigator.REPEAT_MS, "repetición justo al soltar"
+        steps = 1 + (0 if after_delay <= 0 else -(-after_delay // ControllerNavigator.REPEAT_MS))
+        for _ in range(steps):
+            if focus is None:
+                focus = 0               # la primera celda visible: la vista empieza arriba
+                continue
+            row, col = divmod(focus, COLS)
+            col = min(max(col + dx, 0), COLS - 1)
+            row = min(max(row + dy, 0), rows - 1)
+            focus = min(row * COLS + col, ITEMS - 1)
+    return focus
+
+
+def check_navigation(service, noise, seed, min_rate):
+    """Graba el recorrido, lo reproduce en el navegador y devuelve los fallos."""
+    _recorder, data = record(service, navigation_events(noise, seed))
+    _started_at, events = decode(data)
+
+    grid = HeadlessGrid(list(range(ITEMS)), COLS, CELL_H, VIEW_H)
+    window = HeadlessWindow(grid)
+    navigator = ControllerNavigator(window)
+    navigator.service = service
+    navigator.start()
+    start = time.perf_counter()
+    for t, event in events:
+        t_ms = t * 1000
+        window.advance(t_ms)
+        service.publish(event._replace(t=time.perf_counter()))
+        window.advance(t_ms)            # el drain que pidió el evento
+    window.advance(window.now_ms + 1000)
+    elapsed = time.perf_counter() - start
+    focus = grid.focus_index
+    navigator.stop()                    # quita el foco
+
+    rate = len(events) / elapsed if elapsed else 0
+    expected = expected_focus()
+    print(f"Navegación: {len(events)} eventos en {elapsed * 1000:.1f} ms ({rate:,.0f} eventos/s), "
+          f"foco {focus} (esperado {expected}), {grid.renders} desplazamientos, "
+          f"lanzado {window.launched}")
+    failures = []
+    if focus != expected:
+        failures.append(f"navegación: foco {focus}, se esperaba {expected}")
+    if window.launched != [expected]:
+        failures.append(f"navegación: lanzado {window.launched}, se esperaba [{expected}]")
+    if rate < min_rate:
+        failures.append(f"navegación: {rate:,.0f} eventos/s < {min_rate:,.0f}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--events", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--noise", type=int, default=20000,
+                        help="eventos ignorados mezclados en el recorrido de navegación")
+    parser.add_argument("--min-rate", type=float, default=20000,
+                        help="eventos/s mínimos por el navegador")
+    args = parser.parse_args()
+
+    service = OfflineService()
+    source = synthetic_events(args.events, args.seed)
+
+    recorder, data = record(service, source)
+    print(f"Grabados {recorder.events} eventos en {len(data)} bytes "
+          f"({len(data) / max(recorder.events, 1):.1f} bytes/evento con la cabecera)")
+
+    failures = []
+    _started_at, decoded = decode(data)
+    if len(decoded) != len(source):
+        failures.append(f"decode: {len(decoded)} eventos de {len(source)}")
+    for i, ((t0, a), (t1, b)) in enumerate(zip(source, decoded)):
+        if not same_event(a, b) or abs(t0 - t1) > 1e-6:
+            failures.append(f"decode: evento {i} {a} @{t0:.6f} -> {b} @{t1:.6f}")
+            break
+
+    received = []
+    unsubscribe = service.subscribe(received.append)
+    player = InputPlayer(data, service, speed=0, direct=True).start()
+    player.wait()
+    unsubscribe()
+    rate = player.played / player.elapsed_s if player.elapsed_s else 0
+    print(f"Reproducidos {player.played} en {player.elapsed_s * 1000:.1f} ms ({rate:,.0f} eventos/s)")
+    if len(received) != len(decoded):
+        failures.append(f"replay: {len(received)} eventos de {len(decoded)}")
+    for i, (a, (_t, b)) in enumerate(zip(received, decoded)):
+        if a[:4] != b[:4]:
+            failures.append(f"replay: evento {i} {b} -> {a}")
+            break
+
+    nav_failures = check_navigation(service, args.noise, args.seed, args.min_rate)
+    failures += nav_failures
+
+    if failures:
+        print("\nNO COINCIDE:")
+        for f in failures:
+            print("  -", f)
+        sys.exit(1)
+    print("\nGrabación, reproducción directa y navegación correctas")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+# benchmarks/bench_input_stats.py
+"""
+Recuento de pulsaciones y rebotes de InputSampler.stats() (core/input_sampler.py).
+
+Un guion fijo de botones con rebotes conocidos (al pulsar, al soltar, una
+ráfaga y pulsaciones limpias) se escribe muestra a muestra en el buffer de
+un InputSampler, a 1 kHz y sin hilo ni mando, y se comprueba que stats() da
+exactamente las pulsaciones y rebotes esperados por botón. Con --virtual se
+reproduce además en tiempo real sobre un mando virtual de SDL muestreado por
+el hilo del InputSampler (sin pantalla; necesita SDL >= 2.0.14). Sale con
+código 1 si algún recuento no coincide, así que sirve como prueba en CI.
+
+Uso:  python benchmarks/bench_input_stats.py [--virtual]
+"""
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from core.input_sampler import InputSampler
+
+BOUNCE_MS = 10.0
+RATE_HZ = 1000
+
+# botón -> [(ms desde el inicio, pulsado)]; (pulsaciones, rebotes) esperados
+SCRIPT = {
+    0: [(100, 1), (103, 0), (106, 1), (200, 0),                 # rebote al pulsar
+        (300, 1), (303, 0), (306, 1), (400, 0)],                # y otra vez: 2 y 2
+    1: [(100, 1), (200, 0), (203, 1), (206, 0)],                # rebote al soltar
+    2: [(100, 1), (180, 0), (250, 1), (330, 0), (400, 1), (480, 0)],   # limpias
+    3: [(100, 1), (103, 0), (106, 1), (109, 0), (112, 1), (300, 0)],   # ráfaga de 2
+    4: [(0, 1), (150, 0)],                                      # ya pulsado al empezar
+}
+EXPECTED = {0: (2, 2), 1: (1, 1), 2: (3, 0), 3: (1, 2), 4: (0, 0)}
+DURATION_MS = 500
+
+
+class ScriptedJoystick:
+    """Sólo lo que lee InputSampler: tamaño y estado de los botones."""
+
+    def __init__(self):
+        self.pressed = [0] * len(SCRIPT)
+
+    def get_numaxes(self):
+        return 0
+
+    def get_numbuttons(self):
+        return len(SCRIPT)
+
+    def get_numhats(self):
+        return 0
+
+    def get_button(self, i):
+        return self.pressed[i]
+
+
+def state_at(ms):
+    """Estado de cada botón en el ms dado según el guion."""
+    state = []
+    for button in sorted(SCRIPT):
+        pressed = 0
+        for at, value in SCRIPT[button]:
+            if at <= ms:
+                pressed = value
+        state.append(pressed)
+    return state
+
+
+def offline_stats():
+    """Una muestra por ms escrita directamente en el buffer: resultado exacto."""
+    sampler = InputSampler(ScriptedJoystick(), rate_hz=RATE_HZ, seconds=DURATION_MS / 1000 + 1)
+    for ms in range(DURATION_MS):
+        sampler.t[ms] = ms / 1000
+        sampler.buttons[ms] = state_at(ms)
+    sampler.head = sampler.count = DURATION_MS
+    return sampler.stats(bounce_ms=BOUNCE_MS)
+
+
+def virtual_stats():
+    """El guion en tiempo real sobre un mando virtual de SDL; None si no hay soporte."""
+    import pygame
+    from core.input_sampler import VirtualJoystick
+
+    pygame.joystick.init()
+    try:
+        virtual = VirtualJoystick(axes=0, buttons=len(SCRIPT), hats=0)
+    except RuntimeError as e:
+        print("Sin mando virtual:", e)
+        return None
+    joy = pygame.joystick.Joystick(virtual.index)
+    joy.init()
+    virtual.set_button(4, True)         # el guion empieza con el botón 4 pulsado
+    sampler = InputSampler(joy, rate_hz=RATE_HZ, seconds=DURATION_MS / 1000 + 1).start()
+    changes = sorted((at, button, value) for button, steps in SCRIPT.items() for at, value in steps if at)
+    start = time.perf_counter()
+    try:
+        for at, button, value in changes:
+            delay = start + at / 1000 - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            virtual.set_button(button, bool(value))
+        time.sleep(0.05)
+    finally:
+        sampler.stop()
+        virtual.detach()
+    return sampler.stats(bounce_ms=BOUNCE_MS)
+
+
+def check(label, stats, failures):
+    print(label)
+    for button, (presses, bounces) in sorted(EXPECTED.items()):
+        got = stats["buttons"][button]
+        ok = (got["presses"], got["bounces"]) == (presses, bounces)
+        print(f"  botón {button}: {got['presses']} pulsaciones, {got['bounces']} rebotes"
+              + ("" if ok else f"  (se esperaban {presses} y {bounces})"))
+        if not ok:
+            failures.append(f"{label} botón {button}: {got['presses']}/{got['bounces']} "
+                            f"en vez de {presses}/{bounces}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--virtual", action="store_true",
+                        help="repetir en tiempo real con un mando virtual de SDL")
+    args = parser.parse_args()
+
+    failures = []
+    check("Buffer escrito a 1 kHz:", offline_stats(), failures)
+    if args.virtual:
+        stats = virtual_stats()
+        if stats is not None:
+            check(f"Mando virtual ({stats['rate_hz']:.0f} Hz reales):", stats, failures)
+
+    if failures:
+        print("\nNO COINCIDE:")
+        for f in failures:
+            print("  -", f)
+        sys.exit(1)
+    print("\nRecuentos exactos")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+# benchmarks/bench_startup.py
+"""
+Tiempo de importación del arranque, con python -X importtime.
+
+Mide en procesos nuevos (el mejor de --runs):
+  - entrada: import main (lo que se carga antes de que aparezca la intro)
+  - ventana: import ui.main_window (lo importa la precarga durante la intro)
+
+Muestra los módulos más lentos de cada uno y comprueba que ninguno carga
+pygame, requests, vlc, win32com ni numpy (se importan al usarse). Sale con
+código 1 si la entrada pasa de --budget-ms o si se cargó alguno de esos
+módulos, así que sirve como prueba en CI. Las fases del arranque real
+(core/startup.py) se muestran en consola al ejecutar main.py.
+
+Uso:  python benchmarks/bench_startup.py [--runs 5] [--budget-ms 100] [--top 10]
+"""
+import os
+import sys
+import argparse
+import subprocess
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+LAZY_MODULES = ("pygame", "requests", "vlc", "win32com", "numpy")
+TARGETS = {
+    "entrada": "main",
+    "ventana": "ui.main_window",
+}
+
+
+def import_times(module):
+    """{módulo: (propio µs, acumulado µs)} de un import en un proceso nuevo."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} falló:\n{result.stderr[-2000:]}")
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative, name = line[len("import time:"):].split("|")
+        if not self_us.strip().isdigit():
+            continue                    # cabecera
+        times[name.strip()] = (int(self_us), int(cumulative))
+    return times
+
+
+def best_of(module, runs):
+    best = None
+    for _ in range(runs):
+        times = import_times(module)
+        if best is None or times[module][1] < best[module][1]:
+            best = times
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=100.0,
+                        help="máximo para import main (antes de la intro)")
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    failures = []
+    for label, module in TARGETS.items():
+        times = best_of(module, args.runs)
+        total_ms = times[module][1] / 1000
+        print(f"{label}: import {module} {total_ms:.1f} ms")
+        slowest = sorted(times.items(), key=lambda kv: kv[1][0], reverse=True)[:args.top]
+        for name, (self_us, cumulative) in slowest:
+            print(f"    {self_us / 1000:7.1f} ms propio  {cumulative / 1000:7.1f} ms total  {name}")
+        loaded = sorted({name.split(".")[0] for name in times} & set(LAZY_MODULES))
+        if loaded:
+            failures.append(f"import {module} carga {', '.join(loaded)}")
+        if module == TARGETS["entrada"] and total_ms > args.budget_ms:
+            failures.append(f"import {module}: {total_ms:.1f} ms > {args.budget_ms:.0f} ms")
+
+    if failures:
+        print("\nFUERA DE PRESUPUESTO:")
+        for f in failures:
+            print("  -", f)
+        sys.exit(1)
+    print("\nArranque dentro de presupuesto")
+
+
+if __name__ == "__main__":
+    main()
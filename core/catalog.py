@@ -0,0 +1,273 @@
+# core/catalog.py
+import os
+import bisect
+from datetime import datetime
+
+# Campos que se ven en una tarjeta: si no cambian, la tarjeta no se toca
+RENDER_FIELDS = (
+    "nombre", "playtime", "last_played", "cover_path",
+    "dominant_color", "placeholder",
+)
+
+
+def render_signature(game):
+    """Tupla con lo que una tarjeta muestra de un juego."""
+    return tuple(game.get(f) for f in RENDER_FIELDS)
+
+
+def game_key(game):
+    """Identidad estable de un juego (id de la BD, o la ruta si aún no tiene)."""
+    return game.get("id") or game.get("ruta")
+
+
+def merge_games(current, fresh):
+    """
+    Reconcilia la lista en memoria con la recién leída de la BD.
+
+    Los juegos que ya existían conservan su diccionario (se actualiza en
+    sitio), así las tarjetas que los referencian siguen siendo válidas.
+    Devuelve (lista_nueva, diff) donde diff es un dict con los conjuntos
+    "added", "removed" y "changed" (claves de juego) y "reordered" (bool).
+    """
+    by_key = {game_key(g): g for g in current}
+    old_order = [game_key(g) for g in current]
+    result = []
+    added = set()
+    changed = set()
+    for row in fresh:
+        k = game_key(row)
+        g = by_key.pop(k, None)
+        if g is None:
+            added.add(k)
+            result.append(row)
+            continue
+        if render_signature(g) != render_signature(row):
+            changed.add(k)
+        g.update(row)
+        result.append(g)
+    removed = set(by_key)
+    new_order = [game_key(g) for g in result if game_key(g) not in added]
+    kept_old_order = [k for k in old_order if k not in removed]
+    diff = {
+        "added": added,
+        "removed": removed,
+        "changed": changed,
+        "reordered": new_order != kept_old_order,
+    }
+    return result, diff
+
+
+# ----------------------------
+# Orden, filtros y grupos
+# ----------------------------
+def _parse_date(value):
+    """Timestamp de una fecha guardada (ISO o "dd/mm/YYYY HH:MM"), o None."""
+    if not value:
+        return None
+    for fmt in (None, "%d/%m/%Y %H:%M"):
+        try:
+            if fmt is None:
+                return datetime.fromisoformat(value).timestamp()
+            return datetime.strptime(value, fmt).timestamp()
+        except (ValueError, TypeError):
+            continue
+    return None
+
+
+def _desc(value):
+    # descendente; los juegos sin dato van al final
+    return (1, 0) if value is None else (0, -value)
+
+
+SORTS = {
+    "nombre": lambda g: (g.get("nombre") or "").casefold(),
+    "playtime": lambda g: -(g.get("playtime") or 0),
+    "last_played": lambda g: _desc(_parse_date(g.get("last_played"))),
+    "added_at": lambda g: _desc(_parse_date(g.get("added_at"))),
+    "size": lambda g: _desc(g.get("size_bytes")),
+}
+
+
+def _exists(game):
+    path = game.get("resolved_path") or game.get("ruta")
+    return bool(path) and os.path.exists(path)
+
+
+FILTERS = {
+    "all": None,
+    "installed": _exists,
+    "missing": lambda g: not _exists(g),
+    "with_cover": lambda g: bool(g.get("cover_path") or g.get("palette_stamp")),
+    "no_cover": lambda g: not (g.get("cover_path") or g.get("palette_stamp")),
+    "shortcut": lambda g: bool(g.get("is_shortcut")),
+    "exe": lambda g: not g.get("is_shortcut"),
+}
+
+# filtros que tocan el disco: se calculan la primera vez que se piden
+_LAZY_FILTERS = {"installed", "missing"}
+
+
+def library_root(game):
+    root = game.get("library_root")
+    if root:
+        return root
+    folder = game.get("folder") or os.path.dirname(game.get("ruta") or "")
+    return os.path.dirname(folder) or folder
+
+
+class CatalogIndex:
+    """
+    Permutaciones ordenadas y filtros precalculados sobre el catálogo.
+
+    Cada orden de SORTS se guarda como lista de (valor, clave) ordenada y se
+    mantiene con bisect al añadir, quitar o cambiar un juego. Las vistas
+    (orden, filtro, agrupado) se cachean: cambiar de orden o de filtro es
+    devolver una lista ya construida; sólo se rehacen las vistas afectadas
+    por un cambio.
+    """
+
+    def __init__(self, games=()):
+        self._games = {}
+        self._values = {name: {} for name in SORTS}     # orden -> clave -> valor
+        self._orders = {name: [] for name in SORTS}     # orden -> [(valor, str(clave), clave)]
+        self._masks = {}                                # filtro -> set de claves
+        self._roots = {}                                # clave -> biblioteca
+        self._views = {}                                # (orden, filtro, agrupar) -> lista
+        for g in games:
+            k = game_key(g)
+            self._games[k] = g
+            self._roots[k] = library_root(g)
+            for name, fn in SORTS.items():
+                v = fn(g)
+                self._values[name][k] = v
+                self._orders[name].append((v, str(k), k))
+        for order in self._orders.values():
+            # str(clave) desempata sin comparar ids con rutas
+            order.sort()
+        for name, fn in FILTERS.items():
+            if fn is not None and name not in _LAZY_FILTERS:
+                self._masks[name] = {k for k, g in self._games.items() if fn(g)}
+
+    def __len__(self):
+        return len(self._games)
+
+    # ----------------------------
+    # Cambios incrementales
+    # ----------------------------
+    def add(self, game):
+        k = game_key(game)
+        if k in self._games:
+            return self.update(game)
+        self._games[k] = game
+        self._roots[k] = library_root(game)
+        for name, fn in SORTS.items():
+            v = fn(game)
+            self._values[name][k] = v
+            bisect.insort(self._orders[name], (v, str(k), k))
+        for name, mask in self._masks.items():
+            if FILTERS[name](game):
+                mask.add(k)
+        self._views.clear()
+        return True
+
+    def remove(self, key):
+        if self._games.pop(key, None) is None:
+            return False
+        self._roots.pop(key, None)
+        for name in SORTS:
+            v = self._values[name].pop(key)
+            order = self._orders[name]
+            del order[bisect.bisect_left(order, (v, str(key), key))]
+        for mask in self._masks.values():
+            mask.discard(key)
+        self._views.clear()
+        return True
+
+    def update(self, game):
+        """
+        Re-posiciona un juego que cambió. Devuelve True si cambió alguna
+        vista (orden, filtro o grupo), False si sólo cambió su contenido.
+        """
+        k = game_key(game)
+        if k not in self._games:
+            return self.add(game)
+        self._games[k] = game
+        moved_sorts = set()
+        for name, fn in SORTS.items():
+            old = self._values[name][k]
+            new = fn(game)
+            if new == old:
+                continue
+            order = self._orders[name]
+            del order[bisect.bisect_left(order, (old, str(k), k))]
+            bisect.insort(order, (new, str(k), k))
+            self._values[name][k] = new
+            moved_sorts.add(name)
+        moved_filters = set()
+        for name, mask in self._masks.items():
+            if FILTERS[name](game) != (k in mask):
+                mask.symmetric_difference_update((k,))
+                moved_filters.add(name)
+        root = library_root(game)
+        regrouped = root != self._roots[k]
+        self._roots[k] = root
+        stale = [v for v in self._views
+                 if v[0] in moved_sorts or v[1] in moved_filters or (regrouped and v[2])]
+        for v in stale:
+            del self._views[v]
+        return bool(moved_sorts or moved_filters or regrouped)
+
+    def sync(self, games):
+        """Aplica una lista completa (tras releer la BD) de forma incremental."""
+        # carpetas borradas o restauradas fuera del launcher no llegan por la BD
+        self.invalidate_disk()
+        keys = set()
+        for g in games:
+            keys.add(game_key(g))
+            self.update(g)
+        for k in [k for k in self._games if k not in keys]:
+            self.remove(k)
+
+    def invalidate_disk(self):
+        """Los filtros que miran el disco se recalculan la próxima vez que se pidan."""
+        for name in _LAZY_FILTERS:
+            self._masks.pop(name, None)
+        for v in [v for v in self._views if v[1] in _LAZY_FILTERS]:
+            del self._views[v]
+
+    # ----------------------------
+    # Vistas
+    # ----------------------------
+    def _mask(self, name):
+        fn = FILTERS[name]
+        if fn is None:
+            return None
+        if name not in self._masks:
+            self._masks[name] = {k for k, g in self._games.items() if fn(g)}
+        return self._masks[name]
+
+    def view(self, sort="nombre", filt="all", group=False):
+        """Lista de juegos en el orden pedido (cacheada)."""
+        cache_key = (sort, filt, group)
+        cached = self._views.get(cache_key)
+        if cached is not None:
+            return cached
+        mask = self._mask(filt)
+        keys = [k for _v, _s, k in self._orders[sort] if mask is None or k in mask]
+        if group:
+            # orden estable: agrupa por biblioteca respetando el orden elegido
+            keys.sort(key=lambda k: self._roots[k].casefold())
+        result = [self._games[k] for k in keys]
+        self._views[cache_key] = result
+        return result
+
+    def groups(self, view):
+        """[(biblioteca, índice_inicial, cantidad)] de una vista agrupada."""
+        result = []
+        for index, g in enumerate(view):
+            root = self._roots[game_key(g)]
+            if result and result[-1][0] == root:
+                result[-1][2] += 1
+            else:
+                result.append([root, index, 1])
+        return [tuple(r) for r in result]
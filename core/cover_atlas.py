@@ -0,0 +1,234 @@
+# core/cover_atlas.py
+import os
+import json
+import mmap
+import threading
+from PIL import Image, ImageOps
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+DATA_DIR = os.path.join(BASE_DIR, "data")
+ATLAS_FILE = os.path.join(DATA_DIR, "covers.atlas")
+ATLAS_INDEX = os.path.join(DATA_DIR, "covers.atlas.json")
+
+GRID_SIZE = (180, 240)
+
+_MAGIC = b"GLATLAS1"
+_INDEX_VERSION = 1
+# si los bytes huérfanos superan esto (y a los vivos) se compacta al abrir
+_COMPACT_MIN_DEAD = 4 * 1024 * 1024
+
+os.makedirs(DATA_DIR, exist_ok=True)
+
+
+def atlas_key(path: str, size):
+    """Clave del índice: ruta normalizada + tamaño de miniatura."""
+    return f"{os.path.normcase(os.path.abspath(path))}|{size[0]}x{size[1]}"
+
+
+def _source_stamp(path: str):
+    """(mtime_ns, tamaño) del archivo fuente, o None si no existe."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class CoverAtlas:
+    """
+    Atlas de portadas: un único archivo con todas las miniaturas en RGBA crudo
+    más un índice JSON con offsets. Se mapea en memoria (mmap) para construir
+    las imágenes sin abrir un archivo por portada.
+
+    Cada entrada del índice es [offset, ancho, alto, mtime_ns, tamaño_fuente];
+    si el archivo fuente cambió la entrada se considera obsoleta y lookup()
+    devuelve None para que el llamador cargue la imagen del disco.
+    """
+
+    def __init__(self, atlas_file: str = ATLAS_FILE, index_file: str = ATLAS_INDEX):
+        self.atlas_file = atlas_file
+        self.index_file = index_file
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._dead = 0       # bytes ocupados por entradas reemplazadas
+        self._mm = None
+        self._size = 0
+        self._opened = False
+
+    # ----------------------------
+    # Apertura / persistencia
+    # ----------------------------
+    def open(self):
+        """
+        Carga el índice y mapea el atlas. Si algo no cuadra, empieza vacío.
+        Sólo la primera vez (al arrancar) puede reescribir el archivo: después
+        sólo se vuelve a mapear, ver reopen().
+        """
+        if self._opened:
+            return self.reopen()
+        with self._lock:
+            self._opened = True
+            self._load_index()
+            if not self._valid_file():
+                self._entries = {}
+                self._dead = 0
+                with open(self.atlas_file, "wb") as f:
+                    f.write(_MAGIC)
+                self._save_index()
+            elif self._dead > _COMPACT_MIN_DEAD and self._dead > self._live_bytes():
+                self._compact()
+            self._remap()
+        return self
+
+    def _load_index(self):
+        self._entries = {}
+        self._dead = 0
+        if not os.path.isfile(self.index_file):
+            return
+        try:
+            with open(self.index_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != _INDEX_VERSION:
+                return
+            self._entries = data.get("entries", {})
+            self._dead = int(data.get("dead", 0))
+        except Exception:
+            self._entries = {}
+            self._dead = 0
+
+    def _save_index(self):
+        tmp = self.index_file + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": _INDEX_VERSION, "dead": self._dead, "entries": self._entries}, f)
+        os.replace(tmp, self.index_file)
+
+    def _valid_file(self):
+        try:
+            with open(self.atlas_file, "rb") as f:
+                if f.read(len(_MAGIC)) != _MAGIC:
+                    return False
+                f.seek(0, os.SEEK_END)
+                end = f.tell()
+        except OSError:
+            return False
+        # ninguna entrada puede apuntar más allá del final
+        for off, w, h, _mt, _sz in self._entries.values():
+            if off + w * h * 4 > end:
+                return False
+        return True
+
+    def _live_bytes(self):
+        return sum(w * h * 4 for _off, w, h, _mt, _sz in self._entries.values())
+
+    def _compact(self):
+        """Reescribe el atlas sin las entradas huérfanas (sólo antes de mapear)."""
+        tmp = self.atlas_file + ".tmp"
+        new_entries = {}
+        with open(self.atlas_file, "rb") as src, open(tmp, "wb") as dst:
+            dst.write(_MAGIC)
+            for key, (off, w, h, mt, sz) in self._entries.items():
+                src.seek(off)
+                data = src.read(w * h * 4)
+                new_entries[key] = [dst.tell(), w, h, mt, sz]
+                dst.write(data)
+        os.replace(tmp, self.atlas_file)
+        self._entries = new_entries
+        self._dead = 0
+        self._save_index()
+
+    def close(self):
+        """Suelta el mmap (se libera cuando ninguna imagen lo use); reopen() lo recupera."""
+        with self._lock:
+            self._mm = None
+            self._size = 0
+
+    def reopen(self):
+        """
+        Vuelve a mapear tras close() sin releer el índice ni compactar: puede
+        haber imágenes en pantalla sobre el mmap anterior, así que el archivo
+        no se reemplaza ni se trunca.
+        """
+        with self._lock:
+            self._remap()
+        return self
+
+    def _remap(self):
+        # El mmap anterior no se cierra: puede haber imágenes que aún usan sus
+        # buffers. Se libera solo cuando dejan de referenciarse.
+        with open(self.atlas_file, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._size = len(self._mm)
+
+    # ----------------------------
+    # Lectura
+    # ----------------------------
+    def lookup(self, path: str, size=GRID_SIZE):
+        """
+        Devuelve una PIL.Image (RGBA, sólo lectura) construida sobre el mmap,
+        sin copiar, o None si la portada no está en el atlas o está obsoleta.
+        """
+        if not path or self._mm is None:
+            return None
+        key = atlas_key(path, size)
+        with self._lock:
+            entry = self._entries.get(key)
+            mm = self._mm
+            mm_size = self._size
+        if entry is None:
+            return None
+        off, w, h, mt, sz = entry
+        if _source_stamp(path) != (mt, sz):
+            return None
+        end = off + w * h * 4
+        if end > mm_size:
+            return None
+        return Image.frombuffer("RGBA", (w, h), memoryview(mm)[off:end], "raw", "RGBA", 0, 1)
+
+    def is_fresh(self, path: str, size=GRID_SIZE):
+        entry = self._entries.get(atlas_key(path, size))
+        return entry is not None and _source_stamp(path) == (entry[3], entry[4])
+
+    # ----------------------------
+    # Actualización incremental
+    # ----------------------------
+    def update_many(self, paths, size=GRID_SIZE):
+        """
+        Añade al final del atlas las portadas que faltan o cambiaron.
+        Las entradas reemplazadas quedan como bytes huérfanos hasta la
+        próxima compactación. Devuelve cuántas portadas se escribieron.
+        """
+        pending = []
+        for p in dict.fromkeys(paths):
+            if p and os.path.isfile(p) and not self.is_fresh(p, size):
+                pending.append(p)
+        if not pending:
+            return 0
+
+        # decodificar fuera del lock
+        blobs = []
+        for p in pending:
+            stamp = _source_stamp(p)
+            try:
+                img = Image.open(p).convert("RGBA")
+                img = ImageOps.contain(img, size)
+            except Exception:
+                continue
+            blobs.append((atlas_key(p, size), img.width, img.height, stamp, img.tobytes()))
+        if not blobs:
+            return 0
+
+        with self._lock:
+            with open(self.atlas_file, "ab") as f:
+                for key, w, h, stamp, data in blobs:
+                    old = self._entries.get(key)
+                    if old is not None:
+                        self._dead += old[1] * old[2] * 4
+                    off = f.tell()
+                    f.write(data)
+                    self._entries[key] = [off, w, h, stamp[0], stamp[1]]
+            self._save_index()
+            self._remap()
+        return len(blobs)
+
+    def update(self, path: str, size=GRID_SIZE):
+        return self.update_many([path], size) > 0
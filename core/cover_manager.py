@@ -1,31 +1,14 @@
 # core/cover_manager.py
 import os
-import json
-import requests
 from PIL import Image
+from core.settings import CONFIG_DIR, SETTINGS_FILE, _load_settings, _save_settings
 
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 ASSETS_DIR = os.path.join(BASE_DIR, "assets")
 COVERS_DIR = os.path.join(ASSETS_DIR, "covers")
-CONFIG_DIR = os.path.join(BASE_DIR, "config")
-SETTINGS_FILE = os.path.join(CONFIG_DIR, "settings.json")
 DEFAULT_COVER = os.path.join(ASSETS_DIR, "default_cover.png")
 
 os.makedirs(COVERS_DIR, exist_ok=True)
-os.makedirs(CONFIG_DIR, exist_ok=True)
-
-def _load_settings():
-    if os.path.exists(SETTINGS_FILE):
-        try:
-            with open(SETTINGS_FILE, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except Exception:
-            return {}
-    return {}
-
-def _save_settings(s):
-    with open(SETTINGS_FILE, "w", encoding="utf-8") as f:
-        json.dump(s, f, indent=2, ensure_ascii=False)
 
 def _safe_name(name: str) -> str:
     # crea un nombre de archivo seguro a partir del nombre del juego
@@ -133,6 +116,11 @@ def search_cover_online(game_name):
     if not api_key:
         print("No hay API key para SteamGridDB")
         return None
+    try:
+        import requests     # sólo hace falta aquí: no retrasar el arranque
+    except ImportError:
+        print("requests no está instalado: no se pueden buscar portadas online")
+        return None
 
     headers = {"Authorization": f"Bearer {api_key}"}
     safe_name = _safe_name(game_name)
@@ -0,0 +1,164 @@
+# core/cover_palette.py
+import os
+from PIL import Image
+
+# numpy es opcional: sin él se usa Pillow imagen por imagen. Se importa con
+# el primer lote (en segundo plano), no al arrancar
+np = None
+_HAS_NUMPY = None
+
+
+def _load_numpy():
+    global np, _HAS_NUMPY
+    if _HAS_NUMPY is None:
+        try:
+            import numpy
+            np = numpy
+            _HAS_NUMPY = True
+        except Exception:
+            _HAS_NUMPY = False
+    return _HAS_NUMPY
+
+PLACEHOLDER_SIZE = (8, 12)          # ancho x alto del placeholder borroso
+_BLOCK = 4                          # cada pixel del placeholder = bloque 4x4
+_SAMPLE_SIZE = (PLACEHOLDER_SIZE[0] * _BLOCK, PLACEHOLDER_SIZE[1] * _BLOCK)
+N_COLORS = 3
+BATCH_SIZE = 64
+
+_BINS = 16                          # 4 bits por canal -> 4096 cubos de color
+
+
+def cover_stamp(path: str):
+    """Identifica la versión de una portada (ruta + mtime + tamaño)."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return f"{path}|{st.st_mtime_ns}|{st.st_size}"
+
+
+def _hex(rgb):
+    return "#{:02x}{:02x}{:02x}".format(*(int(v) for v in rgb))
+
+
+def _parse_hex(color: str):
+    color = color.lstrip("#")
+    return tuple(int(color[i:i + 2], 16) for i in (0, 2, 4))
+
+
+def _load_sample(path: str):
+    """Abre la portada reducida a _SAMPLE_SIZE (draft acelera mucho los JPEG)."""
+    img = Image.open(path)
+    img.draft("RGB", _SAMPLE_SIZE)
+    return img.convert("RGB").resize(_SAMPLE_SIZE, Image.BILINEAR)
+
+
+def _batch_numpy(samples):
+    n = len(samples)
+    w, h = _SAMPLE_SIZE
+    arr = np.stack([np.asarray(s, dtype=np.uint8) for s in samples])    # (n, h, w, 3)
+
+    # placeholder: media de bloques 4x4 de todo el lote a la vez
+    ph = arr.reshape(n, PLACEHOLDER_SIZE[1], _BLOCK, PLACEHOLDER_SIZE[0], _BLOCK, 3)
+    ph = ph.mean(axis=(2, 4)).round().astype(np.uint8)
+
+    # colores dominantes: histograma por cubos de 4 bits, un bincount para el lote
+    px = arr.reshape(n, h * w, 3).astype(np.int64)
+    q = px >> 4
+    codes = (q[..., 0] * _BINS + q[..., 1]) * _BINS + q[..., 2]
+    nbins = _BINS ** 3
+    codes = codes + (np.arange(n)[:, None] * nbins)
+    flat = codes.ravel()
+    counts = np.bincount(flat, minlength=n * nbins).reshape(n, nbins)
+    sums = np.stack([
+        np.bincount(flat, weights=px[..., ch].ravel(), minlength=n * nbins)
+        for ch in range(3)
+    ], axis=-1).reshape(n, nbins, 3)
+
+    top = np.argsort(-counts, axis=1)[:, :N_COLORS]
+    idx = np.arange(n)[:, None]
+    top_counts = counts[idx, top]
+    means = sums[idx, top] / np.maximum(top_counts, 1)[..., None]
+
+    results = []
+    for i in range(n):
+        colors = [_hex(means[i, k]) for k in range(N_COLORS) if top_counts[i, k] > 0]
+        results.append((colors, ph[i].tobytes()))
+    return results
+
+
+def _single_pillow(sample):
+    ph = sample.resize(PLACEHOLDER_SIZE, Image.BOX).tobytes()
+    pal_img = sample.quantize(colors=N_COLORS)
+    pal = pal_img.getpalette() or []
+    counts = sorted(pal_img.getcolors() or [], reverse=True)
+    colors = [_hex(pal[i * 3:i * 3 + 3]) for _c, i in counts[:N_COLORS]]
+    return colors, ph
+
+
+def compute_palettes(paths):
+    """
+    Calcula colores dominantes y placeholder de varias portadas.
+    Con numpy el lote entero se procesa en una sola pasada vectorizada.
+    Devuelve una lista paralela a paths con (colores, placeholder_bytes)
+    o None para las portadas que no se pudieron abrir.
+    """
+    samples = []
+    valid = []
+    for i, p in enumerate(paths):
+        try:
+            samples.append(_load_sample(p))
+            valid.append(i)
+        except Exception:
+            continue
+
+    results = [None] * len(paths)
+    if not samples:
+        return results
+    if _load_numpy():
+        computed = _batch_numpy(samples)
+    else:
+        computed = [_single_pillow(s) for s in samples]
+    for i, res in zip(valid, computed):
+        results[i] = res
+    return results
+
+
+def precompute(pending):
+    """
+    pending: dict ruta_juego -> ruta_portada.
+    Devuelve filas listas para database.update_palettes().
+    """
+    items = list(pending.items())
+    rows = []
+    for start in range(0, len(items), BATCH_SIZE):
+        batch = items[start:start + BATCH_SIZE]
+        stamps = [cover_stamp(cover) for _ruta, cover in batch]
+        results = compute_palettes([cover for _ruta, cover in batch])
+        for (ruta, _cover), stamp, res in zip(batch, stamps, results):
+            if res is None or stamp is None or not res[0]:
+                continue
+            colors, ph = res
+            rows.append((ruta, colors[0], colors, ph, stamp))
+    return rows
+
+
+def placeholder_image(game, size):
+    """Imagen borrosa instantánea a partir del placeholder guardado, o None."""
+    data = game.get("placeholder")
+    if not data or len(data) != PLACEHOLDER_SIZE[0] * PLACEHOLDER_SIZE[1] * 3:
+        return None
+    img = Image.frombytes("RGB", PLACEHOLDER_SIZE, bytes(data))
+    return img.resize(size, Image.BILINEAR).convert("RGBA")
+
+
+def tint_color(color, base="#2b2b2b", amount=0.3):
+    """Mezcla el color dominante con el fondo de la tarjeta."""
+    if not color:
+        return base
+    try:
+        c = _parse_hex(color)
+        b = _parse_hex(base)
+    except ValueError:
+        return base
+    return _hex(b[i] + (c[i] - b[i]) * amount for i in range(3))
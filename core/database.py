@@ -1,6 +1,7 @@
 # core/database.py
 import sqlite3
 import os
+import json
 from datetime import datetime
 
 DB_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "launcher.db")
@@ -23,15 +24,97 @@ def init_db():
             cover_path TEXT
         )
     ''')
+    _ensure_columns(c, "juegos", {
+        "dominant_color": "TEXT",
+        "palette": "TEXT",
+        "placeholder": "BLOB",
+        "palette_stamp": "TEXT",
+        "added_at": "TEXT",
+        "size_bytes": "INTEGER",
+        "library_root": "TEXT",
+    })
+    # Sesiones de juego: se abren al lanzar y se marcan cada cierto tiempo,
+    # así una sesión cortada por un cierre inesperado se recupera al arrancar
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS sesiones (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            ruta TEXT NOT NULL,
+            pid INTEGER,
+            started_at REAL NOT NULL,
+            checkpoint_at REAL NOT NULL,
+            ended_at REAL
+        )
+    ''')
+    c.execute("CREATE INDEX IF NOT EXISTS idx_sesiones_abiertas ON sesiones(ended_at)")
+    # Perfil de lanzamiento por juego (ver core/launch_profiles.py)
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS perfiles (
+            ruta TEXT PRIMARY KEY,
+            nice INTEGER,
+            priority_class TEXT,
+            affinity TEXT,
+            io_class TEXT,
+            io_level INTEGER,
+            args TEXT,
+            env TEXT
+        )
+    ''')
+    _ensure_columns(c, "perfiles", {"warmup": "INTEGER"})
+    # Archivos que cada juego leyó al arrancar: qué precargar la próxima vez
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS archivos_calientes (
+            ruta TEXT NOT NULL,
+            path TEXT NOT NULL,
+            size INTEGER,
+            hits INTEGER DEFAULT 1,
+            last_seen REAL,
+            PRIMARY KEY (ruta, path)
+        )
+    ''')
+    # Un registro por lanzamiento: fases en ms desde el clic, método, salida
+    # y cuánto tardó en cargar con y sin precarga (ver core/launch_metrics.py)
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS lanzamientos (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            ruta TEXT NOT NULL,
+            launched_at REAL NOT NULL,
+            warmup INTEGER DEFAULT 0,
+            warm_files INTEGER,
+            warm_bytes INTEGER,
+            warm_ms REAL,
+            ready_ms REAL
+        )
+    ''')
+    _ensure_columns(c, "lanzamientos", {
+        "method": "TEXT",
+        "fallbacks": "TEXT",
+        "resolve_ms": "REAL",
+        "spawn_ms": "REAL",
+        "active_ms": "REAL",
+        "exit_ms": "REAL",
+        "exit_code": "INTEGER",
+        "crashed": "INTEGER",
+        "error": "TEXT",
+    })
+    c.execute("CREATE INDEX IF NOT EXISTS idx_lanzamientos_ruta ON lanzamientos(ruta)")
     conn.commit()
     conn.close()
 
+def _ensure_columns(c, table, columns):
+    """Añade columnas nuevas a una tabla existente (migración simple)."""
+    existing = {row[1] for row in c.execute(f"PRAGMA table_info({table})")}
+    for name, decl in columns.items():
+        if name not in existing:
+            c.execute(f"ALTER TABLE {table} ADD COLUMN {name} {decl}")
+
 def get_all_games():
     """Devuelve lista de diccionarios con todos los juegos ordenados por nombre."""
     conn = sqlite3.connect(DB_PATH)
     c = conn.cursor()
     c.execute('''
-        SELECT nombre, ruta, folder, is_shortcut, resolved_path, playtime, last_played, cover_path
+        SELECT nombre, ruta, folder, is_shortcut, resolved_path, playtime, last_played, cover_path,
+               id, dominant_color, palette, placeholder, palette_stamp,
+               added_at, size_bytes, library_root
         FROM juegos
         ORDER BY nombre COLLATE NOCASE
     ''')
@@ -47,7 +130,15 @@ def get_all_games():
             "resolved_path": row[4],
             "playtime": row[5] if row[5] is not None else 0,
             "last_played": row[6],
-            "cover_path": row[7]
+            "cover_path": row[7],
+            "id": row[8],
+            "dominant_color": row[9],
+            "palette": row[10].split(",") if row[10] else [],
+            "placeholder": row[11],
+            "palette_stamp": row[12],
+            "added_at": row[13],
+            "size_bytes": row[14],
+            "library_root": row[15]
         })
     return juegos
 
@@ -55,7 +146,8 @@ def insert_or_update_game(game_dict):
     """
     Inserta o actualiza un juego en la BD.
     game_dict debe contener al menos: nombre, ruta, folder, is_shortcut, resolved_path.
-    Opcionalmente puede incluir playtime, last_played, cover_path.
+    Opcionalmente puede incluir playtime, last_played, cover_path,
+    size_bytes y library_root. added_at se fija sólo al insertar.
     """
     conn = sqlite3.connect(DB_PATH)
     c = conn.cursor()
@@ -68,10 +160,14 @@ def insert_or_update_game(game_dict):
     playtime = game_dict.get("playtime", 0)
     last_played = game_dict.get("last_played")
     cover_path = game_dict.get("cover_path")
+    added_at = game_dict.get("added_at") or datetime.now().isoformat()
+    size_bytes = game_dict.get("size_bytes")
+    library_root = game_dict.get("library_root")
 
     c.execute('''
-        INSERT INTO juegos (nombre, ruta, folder, is_shortcut, resolved_path, playtime, last_played, cover_path)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        INSERT INTO juegos (nombre, ruta, folder, is_shortcut, resolved_path, playtime, last_played, cover_path,
+                            added_at, size_bytes, library_root)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         ON CONFLICT(ruta) DO UPDATE SET
             nombre=excluded.nombre,
             folder=excluded.folder,
@@ -79,8 +175,11 @@ def insert_or_update_game(game_dict):
             resolved_path=excluded.resolved_path,
             playtime=excluded.playtime,
             last_played=excluded.last_played,
-            cover_path=excluded.cover_path
-    ''', (nombre, ruta, folder, is_shortcut, resolved_path, playtime, last_played, cover_path))
+            cover_path=excluded.cover_path,
+            size_bytes=COALESCE(excluded.size_bytes, size_bytes),
+            library_root=COALESCE(excluded.library_root, library_root)
+    ''', (nombre, ruta, folder, is_shortcut, resolved_path, playtime, last_played, cover_path,
+          added_at, size_bytes, library_root))
     conn.commit()
     conn.close()
 
@@ -104,4 +203,204 @@ def update_cover_path(ruta, cover_path):
     c = conn.cursor()
     c.execute('UPDATE juegos SET cover_path = ? WHERE ruta = ?', (cover_path, ruta))
     conn.commit()
-    conn.close()
\ No newline at end of file
+    conn.close()
+
+def update_sizes(rows):
+    """Guarda en un solo commit el tamaño en disco de varios juegos. rows: (ruta, size_bytes)"""
+    conn = sqlite3.connect(DB_PATH)
+    c = conn.cursor()
+    c.executemany('UPDATE juegos SET size_bytes = ? WHERE ruta = ?', [(size, ruta) for ruta, size in rows])
+    conn.commit()
+    conn.close()
+
+def update_palettes(rows):
+    """
+    Guarda en un solo commit los colores precalculados de varias portadas.
+    rows: iterable de (ruta, dominant_color, [colores], placeholder_bytes, stamp)
+    """
+    conn = sqlite3.connect(DB_PATH)
+    c = conn.cursor()
+    c.executemany('''
+        UPDATE juegos
+        SET dominant_color = ?, palette = ?, placeholder = ?, palette_stamp = ?
+        WHERE ruta = ?
+    ''', [(dom, ",".join(pal), ph, stamp, ruta) for ruta, dom, pal, ph, stamp in rows])
+    conn.commit()
+    conn.close()
+
+def open_session(ruta, pid, started_at):
+    """Registra una sesión en curso. Devuelve su id."""
+    conn = sqlite3.connect(DB_PATH)
+    c = conn.cursor()
+    c.execute(
+        "INSERT INTO sesiones (ruta, pid, started_at, checkpoint_at) VALUES (?, ?, ?, ?)",
+        (ruta, pid, started_at, started_at)
+    )
+    session_id = c.lastrowid
+    conn.commit()
+    conn.close()
+    return session_id
+
+def checkpoint_sessions(rows):
+    """rows: [(session_id, checkpoint_at)]. Una sola transacción para todas."""
+    if not rows:
+        return
+    conn = sqlite3.connect(DB_PATH)
+    c = conn.cursor()
+    c.executemany(
+        "UPDATE sesiones SET checkpoint_at = ? WHERE id = ? AND ended_at IS NULL",
+        [(at, session_id) for session_id, at in rows]
+    )
+    conn.commit()
+    conn.close()
+
+def close_session(session_id, ruta, minutes, last_played, ended_at):
+    """Cierra la sesión y suma los minutos al juego en la misma transacción."""
+    conn = sqlite3.connect(DB_PATH)
+    c = conn.cursor()
+    c.execute(
+        "UPDATE sesiones SET ended_at = ?, checkpoint_at = ? WHERE id = ?",
+        (ended_at, ended_at, session_id)
+    )
+    c.execute('''
+        UPDATE juegos
+        SET playtime = playtime + ?, last_played = ?
+        WHERE ruta = ?
+    ''', (minutes, last_played, ruta))
+    conn.commit()
+    conn.close()
+
+def get_open_sessions():
+    """Sesiones que no llegaron a cerrarse (cierre inesperado del launcher)."""
+    conn = sqlite3.connect(DB_PATH)
+    c = conn.cursor()
+    c.execute("SELECT id, ruta, pid, started_at, checkpoint_at FROM sesiones WHERE ended_at IS NULL")
+    rows = c.fetchall()
+    conn.close()
+    return [
+        {"id": r[0], "ruta": r[1], "pid": r[2], "started_at": r[3], "checkpoint_at": r[4]}
+        for r in rows
+    ]
+
+PROFILE_FIELDS = ("nice", "priority_class", "affinity", "io_class", "io_level", "args", "env", "warmup")
+
+def get_profile(ruta):
+    """Perfil de lanzamiento del juego (dict) o None si no tiene."""
+    conn = sqlite3.connect(DB_PATH)
+    c = conn.cursor()
+    c.execute(f"SELECT {', '.join(PROFILE_FIELDS)} FROM perfiles WHERE ruta = ?", (ruta,))
+    row = c.fetchone()
+    conn.close()
+    if row is None:
+        return None
+    profile = dict(zip(PROFILE_FIELDS, row))
+    profile["env"] = json.loads(profile["env"]) if profile["env"] else {}
+    return profile
+
+def save_profile(ruta, profile):
+    """Guarda (o reemplaza) el perfil de lanzamiento de un juego."""
+    values = [profile.get(f) for f in PROFILE_FIELDS]
+    env = profile.get("env")
+    values[PROFILE_FIELDS.index("env")] = json.dumps(env) if env else None
+    conn = sqlite3.connect(DB_PATH)
+    c = conn.cursor()
+    c.execute(
+        f"INSERT OR REPLACE INTO perfiles (ruta, {', '.join(PROFILE_FIELDS)}) "
+        f"VALUES (?{', ?' * len(PROFILE_FIELDS)})",
+        [ruta] + values
+    )
+    conn.commit()
+    conn.close()
+
+def delete_profile(ruta):
+    conn = sqlite3.connect(DB_PATH)
+    c = conn.cursor()
+    c.execute("DELETE FROM perfiles WHERE ruta = ?", (ruta,))
+    conn.commit()
+    conn.close()
+
+def get_hot_files(ruta, limit=64):
+    """[(path, size, hits)] que el juego leyó en sesiones anteriores, los más vistos primero."""
+    conn = sqlite3.connect(DB_PATH)
+    c = conn.cursor()
+    c.execute(
+        "SELECT path, size, hits FROM archivos_calientes WHERE ruta = ? "
+        "ORDER BY hits DESC, size DESC LIMIT ?",
+        (ruta, limit)
+    )
+    rows = c.fetchall()
+    conn.close()
+    return rows
+
+def record_hot_files(ruta, rows, seen_at):
+    """rows: [(path, size)] vistos en una sesión; suma una visita a cada uno."""
+    if not rows:
+        return
+    conn = sqlite3.connect(DB_PATH)
+    c = conn.cursor()
+    c.executemany('''
+        INSERT INTO archivos_calientes (ruta, path, size, hits, last_seen) VALUES (?, ?, ?, 1, ?)
+        ON CONFLICT(ruta, path) DO UPDATE SET
+            size = excluded.size, hits = hits + 1, last_seen = excluded.last_seen
+    ''', [(ruta, path, size, seen_at) for path, size in rows])
+    conn.commit()
+    conn.close()
+
+LAUNCH_FIELDS = (
+    "ruta", "launched_at", "method", "fallbacks", "resolve_ms", "spawn_ms", "active_ms",
+    "ready_ms", "exit_ms", "exit_code", "crashed", "error",
+    "warmup", "warm_files", "warm_bytes", "warm_ms",
+)
+
+def open_launch(fields):
+    """Registra un lanzamiento (dict con columnas de LAUNCH_FIELDS). Devuelve su id."""
+    cols = [f for f in LAUNCH_FIELDS if f in fields]
+    conn = sqlite3.connect(DB_PATH)
+    c = conn.cursor()
+    c.execute(
+        f"INSERT INTO lanzamientos ({', '.join(cols)}) VALUES ({', '.join('?' * len(cols))})",
+        [fields[f] for f in cols]
+    )
+    launch_id = c.lastrowid
+    conn.commit()
+    conn.close()
+    return launch_id
+
+def update_launch(launch_id, fields):
+    cols = [f for f in LAUNCH_FIELDS if f in fields]
+    if not cols:
+        return
+    conn = sqlite3.connect(DB_PATH)
+    c = conn.cursor()
+    c.execute(
+        f"UPDATE lanzamientos SET {', '.join(f + ' = ?' for f in cols)} WHERE id = ?",
+        [fields[f] for f in cols] + [launch_id]
+    )
+    conn.commit()
+    conn.close()
+
+def get_launches(ruta=None):
+    """Lanzamientos (dicts con LAUNCH_FIELDS), de un juego o de toda la biblioteca."""
+    conn = sqlite3.connect(DB_PATH)
+    c = conn.cursor()
+    sql = f"SELECT {', '.join(LAUNCH_FIELDS)} FROM lanzamientos"
+    if ruta is None:
+        c.execute(sql + " ORDER BY launched_at")
+    else:
+        c.execute(sql + " WHERE ruta = ? ORDER BY launched_at", (ruta,))
+    rows = c.fetchall()
+    conn.close()
+    return [dict(zip(LAUNCH_FIELDS, r)) for r in rows]
+
+def get_launch_times(ruta):
+    """{warmup (0/1): (lanzamientos, media de ready_ms)} del juego."""
+    conn = sqlite3.connect(DB_PATH)
+    c = conn.cursor()
+    c.execute(
+        "SELECT warmup, COUNT(*), AVG(ready_ms) FROM lanzamientos "
+        "WHERE ruta = ? AND ready_ms IS NOT NULL GROUP BY warmup",
+        (ruta,)
+    )
+    rows = c.fetchall()
+    conn.close()
+    return {w: (n, avg) for w, n, avg in rows}
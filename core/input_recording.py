@@ -0,0 +1,232 @@
+# core/input_recording.py
+import sys
+import time
+import struct
+import threading
+
+from core.input_service import InputEvent, get_service
+
+# Cabecera: magia, versión, hora de inicio (epoch)
+MAGIC = b"GLIR"
+VERSION = 1
+_HEADER = struct.Struct("<4sB3xd")
+# Evento: delta en µs desde el anterior, tipo, dispositivo, índice, valor (10 bytes)
+_EVENT = struct.Struct("<IBHBh")
+
+KINDS = {"button": 1, "axis": 2, "hat": 3, "added": 4, "removed": 5}
+_KIND_NAMES = {code: name for name, code in KINDS.items()}
+AXIS_MAX = 32767
+_MAX_DELTA = 0xFFFFFFFF
+
+
+def _encode_value(kind, value):
+    if kind == "axis":
+        return int(round(max(-1.0, min(1.0, value)) * AXIS_MAX))
+    if kind == "button":
+        return 1 if value else 0
+    if kind == "hat":
+        return (value[0] + 1) * 3 + (value[1] + 1)
+    return 0
+
+
+def _decode_value(kind, value):
+    if kind == "axis":
+        return value / AXIS_MAX
+    if kind == "button":
+        return bool(value)
+    if kind == "hat":
+        return (value // 3 - 1, value % 3 - 1)
+    return None
+
+
+def decode(data):
+    """(hora de inicio, [(t en s desde el inicio, InputEvent)]) de una grabación."""
+    magic, version, started_at = _HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("No es una grabación de mandos válida")
+    events = []
+    t_us = 0
+    for delta, code, device, index, value in _EVENT.iter_unpack(memoryview(data)[_HEADER.size:]):
+        t_us += delta
+        kind = _KIND_NAMES[code]
+        events.append((t_us / 1e6, InputEvent(kind, device, index, _decode_value(kind, value), None)))
+    return started_at, events
+
+
+class InputRecorder:
+    """
+    Graba los eventos del servicio de mandos en un bytearray: cabecera fija
+    y 10 bytes por evento (delta de tiempo en µs, tipo, dispositivo, índice y
+    valor; los ejes en 16 bits como los da SDL). Sin objetos por evento.
+    """
+
+    def __init__(self, service=None):
+        self.service = service or get_service()
+        self.data = bytearray(_HEADER.pack(MAGIC, VERSION, time.time()))
+        self.events = 0
+        self.origin = None
+        self._last_us = 0
+        self._unsubscribe = None
+
+    def start(self):
+        self.origin = time.perf_counter()
+        self._unsubscribe = self.service.subscribe(self._on_input)
+        return self
+
+    def stop(self):
+        if self._unsubscribe is not None:
+            self._unsubscribe()
+            self._unsubscribe = None
+        return bytes(self.data)
+
+    def _on_input(self, event):
+        now = event.t if event.t is not None else time.perf_counter()
+        # deltas sobre µs absolutos desde el inicio: redondear no acumula deriva
+        now_us = round((now - self.origin) * 1e6)
+        delta = min(max(now_us - self._last_us, 0), _MAX_DELTA)
+        self._last_us += delta
+        self.data += _EVENT.pack(
+            delta, KINDS[event.kind], event.device & 0xFFFF,
+            event.index or 0, _encode_value(event.kind, event.value)
+        )
+        self.events += 1
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(self.data)
+
+
+class InputPlayer:
+    """
+    Reproduce una grabación a speed veces la velocidad real (speed=0: sin
+    esperas, para pruebas de carga).
+
+    Por defecto los eventos se inyectan en un mando virtual de SDL
+    (core/input_sampler.py), así recorren el mismo camino que los de un mando
+    real: SDL -> pygame -> servicio -> suscriptores. El mando virtual tiene
+    tantos ejes, botones y hats como use la grabación y es un dispositivo
+    nuevo (device, "Virtual Controller"): el tester sólo muestra sus eventos
+    si se elige ese mando. No es determinista: SDL emite sus propios eventos
+    al conectar y desconectar el mando (se esperan SETTLE_S antes y después
+    para que queden fuera de la reproducción) y sólo cambios de estado entre
+    lecturas, así que a mucha velocidad llegan menos eventos que los grabados,
+    como con un mando físico.
+
+    Con direct=True los eventos se publican tal cual en el servicio, sin SDL:
+    es el modo exacto y determinista (pruebas de carga, CI; ver
+    benchmarks/bench_input_replay.py). device reasigna todos los eventos a
+    ese dispositivo, p.ej. el elegido en el tester.
+    """
+
+    SETTLE_S = 0.25
+
+    def __init__(self, data, service=None, speed=1.0, direct=False, device=None):
+        self.started_at, self.events = decode(data)
+        self.service = service or get_service()
+        self.speed = speed
+        self.direct = direct
+        self.device = device
+        self.played = 0
+        self.elapsed_s = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def wait(self, timeout=None):
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _layout(self):
+        """(ejes, botones, hats) que necesita la grabación."""
+        counts = {"axis": 0, "button": 0, "hat": 0}
+        for _t, event in self.events:
+            if event.kind in counts:
+                counts[event.kind] = max(counts[event.kind], event.index + 1)
+        return counts["axis"], counts["button"], counts["hat"]
+
+    def _run(self):
+        virtual = None
+        if not self.direct:
+            from core.input_sampler import VirtualJoystick
+            virtual = VirtualJoystick(*self._layout())
+            self.device = virtual.instance_id
+            self._stop.wait(self.SETTLE_S)      # eventos iniciales de SDL al conectar
+        start = time.perf_counter()
+        try:
+            for t, event in self.events:
+                if self._stop.is_set():
+                    break
+                if self.speed:
+                    delay = start + t / self.speed - time.perf_counter()
+                    if delay > 0 and self._stop.wait(delay):
+                        break
+                if virtual is not None:
+                    self._inject(virtual, event)
+                elif event.kind not in ("added", "removed"):
+                    device = event.device if self.device is None else self.device
+                    self.service.publish(event._replace(device=device, t=time.perf_counter()))
+                self.played += 1
+        finally:
+            self.elapsed_s = time.perf_counter() - start
+            if virtual is not None:
+                self._stop.wait(self.SETTLE_S)  # que lleguen los últimos antes de desconectar
+                virtual.detach()
+
+    @staticmethod
+    def _inject(virtual, event):
+        if event.kind == "button":
+            virtual.set_button(event.index, event.value)
+        elif event.kind == "axis":
+            virtual.set_axis(event.index, event.value)
+        elif event.kind == "hat":
+            virtual.set_hat(event.index, event.value)
+        # conexiones / desconexiones: el propio mando virtual ya las genera
+
+
+def record(seconds, service=None):
+    """Graba durante seconds segundos y devuelve los bytes."""
+    recorder = InputRecorder(service).start()
+    time.sleep(seconds)
+    return recorder.stop()
+
+
+def replay(data, speed=1.0, direct=False, device=None, service=None):
+    """Reproduce data y espera a que termine. Devuelve el InputPlayer."""
+    player = InputPlayer(data, service, speed, direct, device).start()
+    player.wait()
+    return player
+
+
+if __name__ == "__main__":
+    # python -m core.input_recording record archivo.glir [segundos]
+    # python -m core.input_recording replay archivo.glir [velocidad] [--direct]
+    # python -m core.input_recording info archivo.glir
+    command, path = sys.argv[1], sys.argv[2]
+    if command == "record":
+        seconds = float(sys.argv[3]) if len(sys.argv) > 3 else 10.0
+        data = record(seconds)
+        with open(path, "wb") as f:
+            f.write(data)
+        print(f"{(len(data) - _HEADER.size) // _EVENT.size} eventos, {len(data)} bytes")
+    else:
+        with open(path, "rb") as f:
+            data = f.read()
+        started_at, events = decode(data)
+        duration = events[-1][0] if events else 0.0
+        print(f"{len(events)} eventos en {duration:.2f} s, {len(data)} bytes")
+        if command == "replay":
+            speed = float(sys.argv[3]) if len(sys.argv) > 3 and sys.argv[3] != "--direct" else 1.0
+            received = []
+            unsubscribe = get_service().subscribe(received.append)
+            player = replay(data, speed=speed, direct="--direct" in sys.argv)
+            unsubscribe()
+            rate = player.played / player.elapsed_s if player.elapsed_s else 0
+            print(f"Reproducidos {player.played} en {player.elapsed_s:.3f} s ({rate:.0f} eventos/s), "
+                  f"recibidos por el servicio: {len(received)}")
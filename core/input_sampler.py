@@ -0,0 +1,341 @@
+# core/input_sampler.py
+import os
+import sys
+import glob
+import time
+import ctypes
+import ctypes.util
+import threading
+
+# numpy es opcional: sin él no hay muestreo de alta frecuencia ni estadísticas
+try:
+    import numpy as np
+    _HAS_NUMPY = True
+except Exception:
+    _HAS_NUMPY = False
+
+import pygame
+
+_IS_WINDOWS = sys.platform == "win32"
+
+AXIS_MAX = 32767
+
+
+# ----------------------------
+# SDL2 de pygame vía ctypes
+# ----------------------------
+def _sdl_candidates():
+    base = os.path.dirname(pygame.__file__)
+    for folder in (base, os.path.join(base, "..", "pygame.libs"), os.path.join(base, ".dylibs")):
+        for path in sorted(glob.glob(os.path.join(folder, "*SDL2*"))):
+            name = os.path.basename(path)
+            name = name[3:] if name.startswith("lib") else name
+            # SDL2.dll, libSDL2-2.0.so.0, libSDL2-2-<hash>.so...; no SDL2_image, SDL2_mixer...
+            if name.startswith("SDL2") and not name.startswith("SDL2_"):
+                yield path
+    found = ctypes.util.find_library("SDL2")
+    if found:
+        yield found
+
+
+_sdl = None
+
+
+def sdl():
+    """La misma biblioteca SDL2 que usa pygame (estado compartido), o None."""
+    global _sdl
+    if _sdl is not None:
+        return _sdl or None
+    _sdl = False
+    for path in _sdl_candidates():
+        try:
+            lib = ctypes.CDLL(path)
+            lib.SDL_JoystickUpdate.restype = None
+        except (OSError, AttributeError):
+            continue
+        lib.SDL_JoystickOpen.argtypes = [ctypes.c_int]
+        lib.SDL_JoystickOpen.restype = ctypes.c_void_p
+        lib.SDL_JoystickClose.argtypes = [ctypes.c_void_p]
+        lib.SDL_JoystickInstanceID.argtypes = [ctypes.c_void_p]
+        lib.SDL_JoystickInstanceID.restype = ctypes.c_int32
+        if hasattr(lib, "SDL_JoystickAttachVirtual"):       # SDL >= 2.0.14
+            lib.SDL_JoystickAttachVirtual.argtypes = [ctypes.c_int] * 4
+            lib.SDL_JoystickDetachVirtual.argtypes = [ctypes.c_int]
+            lib.SDL_JoystickSetVirtualAxis.argtypes = [ctypes.c_void_p, ctypes.c_int, ctypes.c_int16]
+            lib.SDL_JoystickSetVirtualButton.argtypes = [ctypes.c_void_p, ctypes.c_int, ctypes.c_uint8]
+            lib.SDL_JoystickSetVirtualHat.argtypes = [ctypes.c_void_p, ctypes.c_int, ctypes.c_uint8]
+        _sdl = lib
+        break
+    return _sdl or None
+
+
+_HAT_BITS = {(0, 1): 1, (1, 0): 2, (0, -1): 4, (-1, 0): 8}
+
+
+class VirtualJoystick:
+    """
+    Mando virtual de SDL (SDL_JoystickAttachVirtual): aparece en
+    pygame.joystick como uno más, sin hardware ni pantalla. Sirve para probar
+    el tester y el muestreador en una máquina sin mandos.
+    """
+
+    SDL_JOYSTICK_TYPE_GAMECONTROLLER = 1
+
+    def __init__(self, axes=4, buttons=16, hats=1):
+        lib = sdl()
+        if lib is None or not hasattr(lib, "SDL_JoystickAttachVirtual"):
+            raise RuntimeError("SDL sin soporte de mandos virtuales (hace falta SDL >= 2.0.14)")
+        self.lib = lib
+        self.index = lib.SDL_JoystickAttachVirtual(self.SDL_JOYSTICK_TYPE_GAMECONTROLLER, axes, buttons, hats)
+        if self.index < 0:
+            raise RuntimeError("No se pudo crear el mando virtual")
+        self._handle = lib.SDL_JoystickOpen(self.index)
+        # el mismo id que InputEvent.device y pygame get_instance_id()
+        self.instance_id = lib.SDL_JoystickInstanceID(self._handle)
+
+    def set_axis(self, axis, value):
+        v = int(max(-1.0, min(1.0, value)) * AXIS_MAX)
+        self.lib.SDL_JoystickSetVirtualAxis(self._handle, axis, v)
+
+    def set_button(self, button, pressed):
+        self.lib.SDL_JoystickSetVirtualButton(self._handle, button, 1 if pressed else 0)
+
+    def set_hat(self, hat, value):
+        bits = _HAT_BITS.get((value[0], 0), 0) | _HAT_BITS.get((0, value[1]), 0)
+        self.lib.SDL_JoystickSetVirtualHat(self._handle, hat, bits)
+
+    def detach(self):
+        if self._handle:
+            self.lib.SDL_JoystickClose(self._handle)
+            self._handle = None
+        self.lib.SDL_JoystickDetachVirtual(self.index)
+
+
+# ----------------------------
+# Muestreo
+# ----------------------------
+class _TimerResolution:
+    """En Windows sleep() va a saltos de ~15 ms salvo que se pida 1 ms al sistema."""
+
+    def __enter__(self):
+        if _IS_WINDOWS:
+            ctypes.windll.winmm.timeBeginPeriod(1)
+        return self
+
+    def __exit__(self, *exc):
+        if _IS_WINDOWS:
+            ctypes.windll.winmm.timeEndPeriod(1)
+
+
+class InputSampler:
+    """
+    Hilo que lee el estado de un mando hasta rate_hz veces por segundo y lo
+    guarda en un buffer circular preasignado (arrays de numpy: tiempos,
+    ejes, botones y hats), sin crear objetos por muestra.
+
+    Cada vuelta llama a SDL_JoystickUpdate (el estado de SDL sólo se refresca
+    al bombear eventos); si no se encuentra la biblioteca de SDL, lee lo que
+    haya dejado el último bombeo del hilo de Tk y la frecuencia real será la
+    de ese bombeo. stats() analiza la ventana guardada.
+    """
+
+    def __init__(self, joystick, rate_hz=1000, seconds=10.0):
+        if not _HAS_NUMPY:
+            raise RuntimeError("El muestreo de mandos necesita numpy")
+        self.joystick = joystick
+        self.rate_hz = rate_hz
+        self.capacity = int(rate_hz * seconds)
+        self.naxes = joystick.get_numaxes()
+        self.nbuttons = joystick.get_numbuttons()
+        self.nhats = joystick.get_numhats()
+        self.t = np.zeros(self.capacity, dtype=np.float64)
+        self.axes = np.zeros((self.capacity, self.naxes), dtype=np.float32)
+        self.buttons = np.zeros((self.capacity, self.nbuttons), dtype=np.uint8)
+        self.hats = np.zeros((self.capacity, self.nhats, 2), dtype=np.int8)
+        self.head = 0                   # próxima fila a escribir
+        self.count = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self):
+        lib = sdl()
+        update = lib.SDL_JoystickUpdate if lib is not None else None
+        joy = self.joystick
+        axis_range, button_range, hat_range = range(self.naxes), range(self.nbuttons), range(self.nhats)
+        period = 1.0 / self.rate_hz
+        with _TimerResolution():
+            next_at = time.perf_counter()
+            while not self._stop.is_set():
+                if update is not None:
+                    update()
+                now = time.perf_counter()
+                with self._lock:
+                    row = self.head
+                    self.t[row] = now
+                    axes, buttons, hats = self.axes[row], self.buttons[row], self.hats[row]
+                    for i in axis_range:
+                        axes[i] = joy.get_axis(i)
+                    for i in button_range:
+                        buttons[i] = joy.get_button(i)
+                    for i in hat_range:
+                        hats[i] = joy.get_hat(i)
+                    self.head = (row + 1) % self.capacity
+                    self.count = min(self.count + 1, self.capacity)
+                next_at += period
+                delay = next_at - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    next_at = time.perf_counter()    # vamos tarde: no intentar recuperar
+
+    def window(self):
+        """Copia ordenada (de la más antigua a la más nueva) de lo guardado."""
+        with self._lock:
+            order = np.roll(np.arange(self.capacity), -self.head)[-self.count:] if self.count else []
+            return self.t[order], self.axes[order], self.buttons[order], self.hats[order]
+
+    def stats(self, rest=0.15, bounce_ms=5.0):
+        """
+        Sobre la ventana guardada:
+          - interval: media, desviación (jitter), p99 y máximo entre muestras (ms)
+            y frecuencia efectiva;
+          - report_ms: mediana entre cambios de estado, que aproxima cada
+            cuánto informa el propio mando;
+          - axes: por eje, desplazamiento del centro y ruido (desviación) de
+            las muestras en reposo (|valor| < rest), y deriva en unidades/s
+            (pendiente de una recta ajustada a esas muestras);
+          - buttons: por botón, pulsaciones reales, rebotes y pulsación más
+            corta. Un rebote es un pulso espurio: dos cambios seguidos a menos
+            de bounce_ms (pulsar-soltar-pulsar al apretar, soltar-pulsar-soltar
+            al soltar); cuenta una vez y su pulsación no cuenta como pulsación.
+        """
+        t, axes, buttons, hats = self.window()
+        if len(t) < 3:
+            return None
+        dt = np.diff(t) * 1000
+        result = {
+            "samples": int(len(t)),
+            "rate_hz": float(1000 / dt.mean()),
+            "interval": {
+                "mean_ms": float(dt.mean()),
+                "jitter_ms": float(dt.std()),
+                "p99_ms": float(np.percentile(dt, 99)),
+                "max_ms": float(dt.max()),
+            },
+        }
+        state = np.concatenate([axes, buttons, hats.reshape(len(t), -1)], axis=1)
+        changed = np.flatnonzero(np.any(state[1:] != state[:-1], axis=1)) + 1
+        result["report_ms"] = float(np.median(np.diff(t[changed])) * 1000) if len(changed) > 2 else None
+
+        result["axes"] = []
+        for i in range(axes.shape[1]):
+            values = axes[:, i]
+            at_rest = np.abs(values) < rest
+            if at_rest.sum() < 3:
+                result["axes"].append(None)
+                continue
+            v, ts = values[at_rest], t[at_rest]
+            slope = np.polyfit(ts - ts[0], v, 1)[0] if ts[-1] > ts[0] else 0.0
+            result["axes"].append({
+                "offset": float(v.mean()),
+                "noise": float(v.std()),
+                "drift_per_s": float(slope),
+            })
+
+        result["buttons"] = []
+        for i in range(buttons.shape[1]):
+            edges = np.diff(buttons[:, i].astype(np.int8))
+            downs = t[1:][edges == 1]
+            ups = t[1:][edges == -1]
+            if len(ups) and len(downs) and ups[0] < downs[0]:
+                ups = ups[1:]               # ya estaba pulsado al empezar la ventana
+            n = min(len(downs), len(ups))
+            held = (ups[:n] - downs[:n]) * 1000
+            bounces = count_bounces(t[1:][edges != 0], bounce_ms)
+            result["buttons"].append({
+                "presses": int(len(downs)) - bounces,
+                "bounces": bounces,
+                "min_press_ms": float(held.min()) if n else None,
+            })
+        return result
+
+
+def count_bounces(changes, bounce_ms):
+    """Pulsos espurios en una serie de tiempos de cambio (s): cada par de cambios seguidos a menos de bounce_ms."""
+    bounces, k = 0, 0
+    while k < len(changes) - 1:
+        if (changes[k + 1] - changes[k]) * 1000 < bounce_ms:
+            bounces += 1
+            k += 2                      # el par entero es el rebote
+        else:
+            k += 1
+    return bounces
+
+
+def format_stats(stats):
+    """Resumen en texto para el tester de mandos."""
+    if not stats:
+        return "Midiendo..."
+    iv = stats["interval"]
+    lines = [
+        f"Muestreo: {stats['rate_hz']:.0f} Hz ({stats['samples']} muestras)",
+        f"Intervalo: {iv['mean_ms']:.2f} ms, jitter {iv['jitter_ms']:.3f} ms, "
+        f"p99 {iv['p99_ms']:.2f} ms, máx {iv['max_ms']:.2f} ms",
+    ]
+    if stats["report_ms"] is not None:
+        lines.append(f"El mando informa cada ~{stats['report_ms']:.1f} ms")
+    for i, a in enumerate(stats["axes"]):
+        if a:
+            lines.append(f"Eje {i}: centro {a['offset']:+.3f}, ruido {a['noise']:.4f}, "
+                         f"deriva {a['drift_per_s']:+.4f}/s")
+    for i, b in enumerate(stats["buttons"]):
+        if b["presses"]:
+            shortest = f", mín {b['min_press_ms']:.1f} ms" if b["min_press_ms"] is not None else ""
+            lines.append(f"Botón {i}: {b['presses']} pulsaciones, {b['bounces']} rebotes{shortest}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    # Prueba sin mando ni pantalla: python -m core.input_sampler [segundos] [hz]
+    # Un mando virtual de SDL recibe ruido en los ejes y pulsaciones con rebote.
+    import random
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 3.0
+    rate = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    pygame.joystick.init()
+    virtual = VirtualJoystick()
+    joy = pygame.joystick.Joystick(virtual.index)
+    joy.init()
+    sampler = InputSampler(joy, rate_hz=rate, seconds=seconds).start()
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        virtual.set_axis(0, random.gauss(0.01, 0.005))
+        virtual.set_axis(1, random.gauss(-0.02, 0.01))
+        if random.random() < 0.02:
+            virtual.set_button(0, True)
+            time.sleep(0.002)
+            virtual.set_button(0, False)        # rebote: 2 ms
+            time.sleep(0.002)
+            virtual.set_button(0, True)
+            time.sleep(0.08)
+            virtual.set_button(0, False)
+        time.sleep(0.004)
+    sampler.stop()
+    print(format_stats(sampler.stats()))
+    virtual.detach()
@@ -0,0 +1,149 @@
+# core/input_service.py
+import os
+import time
+import threading
+from collections import namedtuple
+
+import pygame
+
+# kind: "added" / "removed" (device = instance id), "button" / "axis" / "hat"
+# (index y value del control); t = time.perf_counter() al leerlo
+InputEvent = namedtuple("InputEvent", "kind device index value t")
+
+
+class InputService:
+    """
+    Servicio de mandos único para toda la app.
+
+    Inicia sólo el subsistema de joystick de pygame, una vez. La cola de
+    eventos de pygame exige además iniciar el de vídeo: se usa el driver
+    "dummy" (no abre ventana ni toca Tk) y sólo se dejan pasar eventos JOY*.
+    Los mandos se siguen con JOYDEVICEADDED/REMOVED, sin re-enumerar.
+
+    Un hilo espera eventos (pygame.event.wait con timeout) mientras haya
+    suscriptores y los publica como InputEvent; sin suscriptores el hilo
+    termina. Los callbacks corren en ese hilo: la UI debe pasar a Tk con after.
+    """
+
+    WAIT_MS = 100
+    JOY_EVENTS = (
+        pygame.JOYAXISMOTION, pygame.JOYBUTTONDOWN, pygame.JOYBUTTONUP, pygame.JOYHATMOTION,
+        pygame.JOYDEVICEADDED, pygame.JOYDEVICEREMOVED,
+    )
+
+    def __init__(self):
+        self._subscribers = []
+        self._joysticks = {}            # instance id -> pygame.joystick.Joystick
+        self._lock = threading.Lock()
+        self._thread = None
+        self._initialized = False
+
+    # ----------------------------
+    # Suscripción
+    # ----------------------------
+    def subscribe(self, callback):
+        """callback(InputEvent) por cada evento. Devuelve una función para anular."""
+        with self._lock:
+            self._subscribers.append(callback)
+            start = self._thread is None
+            if start:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+        if start:
+            self._thread.start()
+
+        def unsubscribe():
+            with self._lock:
+                if callback in self._subscribers:
+                    self._subscribers.remove(callback)
+        return unsubscribe
+
+    def publish(self, event):
+        with self._lock:
+            callbacks = list(self._subscribers)
+        for cb in callbacks:
+            try:
+                cb(event)
+            except Exception as e:
+                print("Error en suscriptor de mandos:", e)
+
+    # ----------------------------
+    # Dispositivos
+    # ----------------------------
+    def devices(self):
+        """[{id, name, axes, buttons, hats}] de los mandos conectados."""
+        with self._lock:
+            joysticks = list(self._joysticks.items())
+        return [
+            {"id": jid, "name": joy.get_name(), "axes": joy.get_numaxes(),
+             "buttons": joy.get_numbuttons(), "hats": joy.get_numhats()}
+            for jid, joy in joysticks
+        ]
+
+    def joystick(self, device):
+        with self._lock:
+            return self._joysticks.get(device)
+
+    # ----------------------------
+    # Hilo
+    # ----------------------------
+    def _init(self):
+        if self._initialized:
+            return
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        pygame.display.init()
+        pygame.joystick.init()
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed(list(self.JOY_EVENTS))
+        self._initialized = True
+
+    def _run(self):
+        try:
+            self._init()
+        except pygame.error as e:
+            print("No se pudo iniciar el soporte de mandos:", e)
+            with self._lock:
+                self._thread = None
+            return
+        while True:
+            with self._lock:
+                if not self._subscribers:
+                    self._thread = None
+                    return
+            first = pygame.event.wait(self.WAIT_MS)
+            if first.type == pygame.NOEVENT:
+                continue
+            for event in [first] + pygame.event.get():
+                self._dispatch(event)
+
+    def _dispatch(self, event):
+        now = time.perf_counter()
+        t = event.type
+        if t == pygame.JOYDEVICEADDED:
+            joy = pygame.joystick.Joystick(event.device_index)
+            joy.init()
+            device = joy.get_instance_id()
+            with self._lock:
+                self._joysticks[device] = joy
+            self.publish(InputEvent("added", device, None, joy.get_name(), now))
+        elif t == pygame.JOYDEVICEREMOVED:
+            with self._lock:
+                self._joysticks.pop(event.instance_id, None)
+            self.publish(InputEvent("removed", event.instance_id, None, None, now))
+        elif t in (pygame.JOYBUTTONDOWN, pygame.JOYBUTTONUP):
+            self.publish(InputEvent("button", event.instance_id, event.button, t == pygame.JOYBUTTONDOWN, now))
+        elif t == pygame.JOYAXISMOTION:
+            self.publish(InputEvent("axis", event.instance_id, event.axis, event.value, now))
+        elif t == pygame.JOYHATMOTION:
+            self.publish(InputEvent("hat", event.instance_id, event.hat, tuple(event.value), now))
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_service():
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = InputService()
+        return _service
@@ -0,0 +1,300 @@
+# core/launch_metrics.py
+import math
+import sys
+import threading
+import time
+
+from core.database import open_launch, update_launch, get_launches, get_launch_times
+from core.proc_tree import process_files, process_read_bytes, process_cpu_seconds, window_pids
+from core import warmup
+
+PHASES = ("resolve_ms", "spawn_ms", "active_ms", "ready_ms", "exit_ms")
+CRASH_S = 10.0                  # salir antes de esto desde el clic puede ser un cierre instantáneo (crashed)
+
+
+class LaunchTrace:
+    """
+    Fases de un lanzamiento en ms desde el clic en "Jugar":
+    resolve (ruta / .lnk resuelto), spawn (vuelve Popen o ShellExecuteExW),
+    active (primera ventana o primera CPU del juego), ready (deja de leer
+    del disco) y exit. fallbacks son los métodos que fallaron antes del bueno.
+    """
+
+    def __init__(self, game):
+        self.game = game
+        self.launched_at = time.time()
+        self._t0 = time.perf_counter()
+        self.phases = {}
+        self.method = None
+        self.fallbacks = []
+        self.launch_id = None
+
+    def elapsed_ms(self, t=None):
+        return ((t or time.perf_counter()) - self._t0) * 1000
+
+    def mark(self, phase, t=None):
+        self.phases.setdefault(phase + "_ms", self.elapsed_ms(t))
+
+    def failed(self, method):
+        self.fallbacks.append(method)
+
+    def row(self):
+        return {
+            "ruta": self.game.get("ruta"),
+            "launched_at": self.launched_at,
+            "method": self.method,
+            "fallbacks": ",".join(self.fallbacks) or None,
+            **self.phases,
+        }
+
+
+def record_failure(trace, error):
+    """Un lanzamiento que no llegó a crear proceso."""
+    try:
+        open_launch({**trace.row(), "error": str(error)[:200]})
+    except Exception as e:
+        print("No se pudo guardar el lanzamiento:", e)
+
+
+# ----------------------------
+# Primeros segundos de la sesión
+# ----------------------------
+class StartupWatch:
+    """
+    Muestrea el árbol de procesos de una sesión recién lanzada.
+
+    active: primera ventana visible del árbol (Windows) o, si no, la primera
+    muestra en que el árbol ha gastado CPU (ACTIVE_CPU_S, un par de ticks).
+    ready: última lectura antes de SETTLE_S segundos sin leer del disco; es
+    lo que la precarga intenta acortar, y se mide igual con y sin ella.
+    De paso anota los archivos que tiene abiertos o mapeados, de los que
+    core/warmup.py aprende qué precargar la próxima vez.
+    """
+
+    INTERVAL = 0.25
+    FAST_INTERVAL = 0.05            # hasta que el juego está activo
+    FILES_INTERVAL = 1.0            # listar archivos abiertos cada segundo
+    ACTIVE_CPU_S = 0.02
+    SETTLE_S = 2.0
+    LEARN_S = 15.0                  # seguir viendo archivos tras cargar
+    WINDOW_S = 120.0
+
+    def __init__(self, session):
+        self.session = session
+        self.trace = session.trace
+        self.files = set()
+
+    def start(self):
+        threading.Thread(target=self._run, daemon=True).start()
+        return self
+
+    def _pids(self):
+        tree = self.session.tree
+        return set(tree.pids) if tree is not None else {self.session.pid}
+
+    def _run(self):
+        s, trace = self.session, self.trace
+        last_total, last_change = None, None
+        start = time.perf_counter()
+        next_files = start
+        while s.running and time.perf_counter() - start < self.WINDOW_S:
+            pids = self._pids()
+            now = time.perf_counter()
+            if "active_ms" not in trace.phases:
+                cpu = sum(c for c in map(process_cpu_seconds, pids) if c)
+                if cpu >= self.ACTIVE_CPU_S or pids & window_pids():
+                    trace.mark("active", now)
+            total = sum(c for c in map(process_read_bytes, pids) if c)
+            if last_total is None or total > last_total:
+                last_total, last_change = total, now
+            elif now - last_change >= self.SETTLE_S:
+                trace.mark("ready", last_change)
+            if now >= next_files:
+                for pid in pids:
+                    self.files.update(process_files(pid))
+                next_files = now + self.FILES_INTERVAL
+            if "ready_ms" in trace.phases and now - last_change >= self.LEARN_S:
+                break                   # cargado y con unos segundos de archivos vistos
+            s.wait(self.INTERVAL if "active_ms" in trace.phases else self.FAST_INTERVAL)
+        self._save()
+
+    def _save(self):
+        s, trace = self.session, self.trace
+        warm = s.warmup
+        fields = {k: trace.phases.get(k) for k in ("active_ms", "ready_ms")}
+        if warm is not None:
+            fields.update(warm_files=len(warm.files), warm_bytes=warm.bytes, warm_ms=warm.elapsed_ms)
+        try:
+            warmup.learn(s.game, s.exe, self.files)
+            update_launch(trace.launch_id, fields)
+        except Exception as e:
+            print("No se pudo guardar el arranque:", e)
+            return
+        if fields["ready_ms"] is not None:
+            self._report(fields["ready_ms"], warm is not None)
+
+    def _report(self, ready_ms, warmed):
+        times = get_launch_times(self.session.game.get("ruta"))
+        other = times.get(0 if warmed else 1)
+        line = f"Carga de {self.session.game.get('nombre')}: {ready_ms / 1000:.1f} s"
+        line += " con precarga" if warmed else " sin precarga"
+        if other:
+            line += f" (media {'sin' if warmed else 'con'}: {other[1] / 1000:.1f} s en {other[0]})"
+        print(line)
+
+
+# ----------------------------
+# Suscriptores del supervisor
+# ----------------------------
+def _on_start(session):
+    trace = session.trace
+    if trace is None:
+        return                          # sesión re-adoptada: su arranque ya pasó
+    trace.method = session.method
+    try:
+        trace.launch_id = open_launch({**trace.row(), "warmup": int(session.warmup is not None)})
+    except Exception as e:
+        print("No se pudo guardar el lanzamiento:", e)
+        return
+    if session.pid:
+        StartupWatch(session).start()
+
+
+def crashed(session, exit_ms):
+    """
+    Cierre instantáneo: antes de CRASH_S y, o el proceso lanzado salió con
+    error (código distinto de 0; negativo si lo mató una señal), o su código
+    no dice nada del juego (no se conoce, o era un bootstrap con más procesos
+    detrás) y todo el árbol vigilado ha desaparecido. Un proceso solo que
+    sale con 0 es una salida limpia; sin código ni árbol, no se sabe.
+    """
+    if not session.tracked or exit_ms >= CRASH_S * 1000:
+        return False
+    if session.exit_code not in (None, 0):
+        return True
+    tree = session.tree
+    return tree is not None and not tree and (session.exit_code is None or tree.seen > 1)
+
+
+def _on_exit(session):
+    if session.warmup is not None:
+        session.warmup.cancel()
+    trace = session.trace
+    if trace is None or trace.launch_id is None:
+        return
+    exit_ms = trace.elapsed_ms()
+    crash = crashed(session, exit_ms)
+    try:
+        update_launch(trace.launch_id, {
+            "exit_ms": exit_ms, "exit_code": session.exit_code, "crashed": int(crash),
+        })
+    except Exception as e:
+        print("No se pudo guardar el lanzamiento:", e)
+    if crash:
+        print(f"{session.game.get('nombre')} se cerró a los {exit_ms / 1000:.1f} s "
+              f"(código {session.exit_code}, {session.method})")
+
+
+def install(supervisor):
+    """Guarda las fases de cada lanzamiento y aprende qué precargar."""
+    supervisor.subscribe("start", _on_start)
+    supervisor.subscribe("exit", _on_exit)
+
+
+# ----------------------------
+# Resúmenes
+# ----------------------------
+def percentile(values, p):
+    """Percentil p (0-100) por rango más cercano; None si no hay valores."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    k = max(0, min(len(ordered) - 1, math.ceil(p / 100 * len(ordered)) - 1))
+    return ordered[k]
+
+
+def summarize(rows, percentiles=(50, 90, 99)):
+    """
+    Resumen de una lista de lanzamientos (get_launches): cuántos, fallos al
+    lanzar, cierres instantáneos (y sus códigos de salida), percentiles de
+    cada fase y, por método, cuántas veces se usó, cuántas falló y la
+    mediana hasta spawn. De las salidas antes de CRASH_S (las demás son
+    tiempo de juego) hay percentiles aparte para los cierres (crash_ms) y
+    para las salidas limpias (exit_ms).
+    """
+    crashed_rows = [r for r in rows if r["crashed"] and not r["error"]]
+    summary = {
+        "launches": len(rows),
+        "failed": sum(1 for r in rows if r["error"]),
+        "crashed": len(crashed_rows),
+        "exit_codes": {},
+        "phases": {},
+        "methods": {},
+    }
+    for r in crashed_rows:
+        summary["exit_codes"][r["exit_code"]] = summary["exit_codes"].get(r["exit_code"], 0) + 1
+    for phase in PHASES:
+        values = [r[phase] for r in rows if r[phase] is not None]
+        if phase == "exit_ms":
+            quick = [r for r in rows if r["exit_ms"] is not None and r["exit_ms"] < CRASH_S * 1000]
+            summary["phases"]["crash_ms"] = {
+                p: percentile([r["exit_ms"] for r in quick if r["crashed"]], p) for p in percentiles}
+            values = [r["exit_ms"] for r in quick if not r["crashed"]]
+        summary["phases"][phase] = {p: percentile(values, p) for p in percentiles}
+    for r in rows:
+        for method in (r["fallbacks"] or "").split(","):
+            if method:
+                summary["methods"].setdefault(method, {"used": 0, "failed": 0, "spawn": []})["failed"] += 1
+        if r["method"]:
+            m = summary["methods"].setdefault(r["method"], {"used": 0, "failed": 0, "spawn": []})
+            m["used"] += 1
+            if r["spawn_ms"] is not None:
+                m["spawn"].append(r["spawn_ms"])
+    for m in summary["methods"].values():
+        m["spawn_p50"] = percentile(m.pop("spawn"), 50)
+    return summary
+
+
+def game_summary(ruta):
+    return summarize(get_launches(ruta))
+
+
+def library_summary():
+    """(resumen de toda la biblioteca, {ruta: resumen por juego})."""
+    rows = get_launches()
+    by_game = {}
+    for r in rows:
+        by_game.setdefault(r["ruta"], []).append(r)
+    return summarize(rows), {ruta: summarize(game_rows) for ruta, game_rows in by_game.items()}
+
+
+def _fmt_ms(v):
+    return "-" if v is None else (f"{v:.0f} ms" if v < 10000 else f"{v / 1000:.1f} s")
+
+
+def format_summary(summary, title):
+    lines = [
+        f"{title}: {summary['launches']} lanzamientos, "
+        f"{summary['failed']} fallidos, {summary['crashed']} cierres instantáneos"
+    ]
+    if summary["exit_codes"]:
+        codes = sorted(summary["exit_codes"].items(), key=lambda kv: -kv[1])
+        lines[0] += " (códigos: " + ", ".join(f"{'?' if c is None else c} x{n}" for c, n in codes) + ")"
+    for phase, values in summary["phases"].items():
+        if any(v is not None for v in values.values()):
+            cols = "  ".join(f"p{p} {_fmt_ms(v)}" for p, v in values.items())
+            lines.append(f"  {phase[:-3]:<8} {cols}")
+    for method, m in sorted(summary["methods"].items()):
+        lines.append(f"  {method:<13} {m['used']} ok, {m['failed']} fallos, spawn p50 {_fmt_ms(m['spawn_p50'])}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    # python -m core.launch_metrics [ruta]: resumen de un juego o de la biblioteca
+    if len(sys.argv) > 1:
+        print(format_summary(game_summary(sys.argv[1]), sys.argv[1]))
+    else:
+        total, per_game = library_summary()
+        print(format_summary(total, "Biblioteca"))
+        for ruta, summary in sorted(per_game.items(), key=lambda kv: -(kv[1]["phases"]["active_ms"][50] or 0)):
+            print(format_summary(summary, ruta))
@@ -0,0 +1,176 @@
+# core/launch_profiles.py
+import os
+import sys
+import shlex
+import platform
+
+_IS_WINDOWS = sys.platform == "win32"
+_IS_LINUX = sys.platform.startswith("linux")
+
+if _IS_WINDOWS:
+    import ctypes
+    from ctypes import wintypes
+
+    _kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    _kernel32.OpenProcess.argtypes = [wintypes.DWORD, wintypes.BOOL, wintypes.DWORD]
+    _kernel32.OpenProcess.restype = wintypes.HANDLE
+    _kernel32.SetProcessAffinityMask.argtypes = [wintypes.HANDLE, ctypes.c_size_t]
+    _kernel32.SetPriorityClass.argtypes = [wintypes.HANDLE, wintypes.DWORD]
+    _kernel32.CloseHandle.argtypes = [wintypes.HANDLE]
+    PROCESS_SET_INFORMATION = 0x0200
+    PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+
+# Clases de prioridad de Windows y su equivalente aproximado en nice
+PRIORITY_CLASSES = {
+    "idle": (0x00000040, 19),
+    "below_normal": (0x00004000, 10),
+    "normal": (0x00000020, 0),
+    "above_normal": (0x00008000, -5),
+    "high": (0x00000080, -10),
+}
+
+# ioprio de Linux (ver ioprio_set(2))
+IO_CLASSES = {"realtime": 1, "best_effort": 2, "idle": 3}
+_IOPRIO_CLASS_SHIFT = 13
+_IOPRIO_WHO_PROCESS = 1
+_SYS_IOPRIO_SET = {"x86_64": 251, "i386": 289, "i686": 289, "aarch64": 30, "armv7l": 314}
+
+
+def parse_cpu_list(text):
+    """"0-3,6" -> {0, 1, 2, 3, 6}. Vacío o None -> None (sin restricción)."""
+    if not text:
+        return None
+    cpus = set()
+    for part in str(text).split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            lo, hi = part.split("-", 1)
+            cpus.update(range(int(lo), int(hi) + 1))
+        else:
+            cpus.add(int(part))
+    return cpus or None
+
+
+def _nice_for(profile):
+    if profile.get("nice") is not None:
+        return int(profile["nice"])
+    cls = PRIORITY_CLASSES.get(profile.get("priority_class") or "")
+    return cls[1] if cls else None
+
+
+def _priority_class_for(profile):
+    cls = PRIORITY_CLASSES.get(profile.get("priority_class") or "")
+    if cls:
+        return cls[0]
+    nice = profile.get("nice")
+    if nice is None:
+        return None
+    # el más cercano por nice
+    return min(PRIORITY_CLASSES.values(), key=lambda c: abs(c[1] - int(nice)))[0]
+
+
+# ----------------------------
+# Linux: se aplica en el hijo antes de exec
+# ----------------------------
+def _ioprio_setter(io_class, level):
+    """Prepara (en el padre) la llamada ioprio_set para el hijo, o None."""
+    import ctypes
+    nr = _SYS_IOPRIO_SET.get(platform.machine())
+    if nr is None or io_class not in IO_CLASSES:
+        return None
+    value = (IO_CLASSES[io_class] << _IOPRIO_CLASS_SHIFT) | (level if io_class != "idle" else 0)
+    syscall = ctypes.CDLL(None, use_errno=True).syscall
+    return lambda: syscall(nr, _IOPRIO_WHO_PROCESS, 0, value)
+
+
+def _linux_preexec(profile):
+    nice = _nice_for(profile)
+    cpus = parse_cpu_list(profile.get("affinity"))
+    io_level = min(max(int(profile.get("io_level") or 4), 0), 7)
+    ioprio = _ioprio_setter(profile.get("io_class"), io_level)
+    if nice is None and cpus is None and ioprio is None:
+        return None
+
+    def preexec():
+        # corre en el proceso hijo tras fork: nada de imports, prints ni locks;
+        # los errores se ignoran (bajar el nice o ioprio realtime piden privilegios)
+        if nice:
+            try:
+                os.nice(nice)
+            except OSError:
+                pass
+        if cpus is not None:
+            try:
+                os.sched_setaffinity(0, cpus)
+            except OSError:
+                pass
+        if ioprio is not None:
+            ioprio()
+    return preexec
+
+
+# ----------------------------
+# API
+# ----------------------------
+def extra_args(profile):
+    args = (profile or {}).get("args")
+    if not args:
+        return []
+    return shlex.split(args, posix=not _IS_WINDOWS)
+
+
+def popen_kwargs(profile):
+    """Argumentos extra para subprocess.Popen según el perfil (aplicados al crear el proceso)."""
+    if not profile:
+        return {}
+    kwargs = {}
+    if profile.get("env"):
+        env = dict(os.environ)
+        env.update({str(k): str(v) for k, v in profile["env"].items()})
+        kwargs["env"] = env
+    if _IS_WINDOWS:
+        cls = _priority_class_for(profile)
+        if cls is not None:
+            kwargs["creationflags"] = cls
+    elif _IS_LINUX:
+        preexec = _linux_preexec(profile)
+        if preexec is not None:
+            kwargs["preexec_fn"] = preexec
+    else:
+        nice = _nice_for(profile)
+        if nice:
+            kwargs["preexec_fn"] = lambda: os.nice(nice)
+    return kwargs
+
+
+def apply_after_spawn(profile, pid=None, handle=None):
+    """
+    Lo que no se puede fijar al crear el proceso: en Windows la afinidad
+    (y la prioridad de lo lanzado con ShellExecuteExW, p.ej. un .lnk).
+    La clase de E/S no tiene API pública en Windows: se omite.
+    """
+    if not profile or not _IS_WINDOWS:
+        return
+    cpus = parse_cpu_list(profile.get("affinity"))
+    cls = _priority_class_for(profile)
+    if cpus is None and cls is None:
+        return
+    own = False
+    if handle is None and pid:
+        handle = _kernel32.OpenProcess(PROCESS_SET_INFORMATION | PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+        own = True
+    if not handle:
+        return
+    try:
+        if cpus is not None:
+            mask = 0
+            for cpu in cpus:
+                mask |= 1 << cpu
+            _kernel32.SetProcessAffinityMask(handle, mask)
+        if cls is not None:
+            _kernel32.SetPriorityClass(handle, cls)
+    finally:
+        if own:
+            _kernel32.CloseHandle(handle)
@@ -1,91 +1,576 @@
 # core/launcher.py
 import os
+import sys
+import time
+import shlex
+import select
+import threading
 import subprocess
 
-# Intento de soporte para resolver .lnk usando pywin32 si está instalado
-_HAS_PYWIN32 = False
-try:
-    from win32com.client import Dispatch  # type: ignore
-    _HAS_PYWIN32 = True
-except Exception:
-    _HAS_PYWIN32 = False
-
-def _resolve_lnk(lnk_path: str):
-    """Si pywin32 está disponible intenta resolver el .lnk al target."""
-    if not _HAS_PYWIN32:
-        return None
-    try:
-        shell = Dispatch("WScript.Shell")
-        shortcut = shell.CreateShortcut(lnk_path)
-        target = shortcut.Targetpath
-        if target and os.path.exists(target):
-            return os.path.abspath(target)
-    except Exception:
-        return None
-    return None
+from core.proc_tree import ProcessTree, TreeSampler, become_subreaper, snapshot
+from core import launch_profiles, launch_metrics, warmup
+from core.settings import get_setting
+# .lnk -> destino con pywin32 (importado al resolver el primero)
+from core.scanner import _resolve_lnk
+
+_IS_WINDOWS = sys.platform == "win32"
+if _IS_WINDOWS:
+    import ctypes
+    from ctypes import wintypes
+
+    _kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    _shell32 = ctypes.WinDLL("shell32", use_last_error=True)
 
-def _run_as_admin(path: str, cwd: str = None):
-    """Intentar ejecutar como administrador. Devuelve True si parece ok."""
+    SEE_MASK_NOCLOSEPROCESS = 0x00000040
+    SEE_MASK_NOASYNC = 0x00000100
+    SYNCHRONIZE = 0x00100000
+    PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+    WAIT_OBJECT_0 = 0
+    STILL_ACTIVE = 259
+
+    class _SHELLEXECUTEINFOW(ctypes.Structure):
+        _fields_ = [
+            ("cbSize", wintypes.DWORD),
+            ("fMask", wintypes.ULONG),
+            ("hwnd", wintypes.HWND),
+            ("lpVerb", wintypes.LPCWSTR),
+            ("lpFile", wintypes.LPCWSTR),
+            ("lpParameters", wintypes.LPCWSTR),
+            ("lpDirectory", wintypes.LPCWSTR),
+            ("nShow", ctypes.c_int),
+            ("hInstApp", wintypes.HINSTANCE),
+            ("lpIDList", ctypes.c_void_p),
+            ("lpClass", wintypes.LPCWSTR),
+            ("hkeyClass", wintypes.HKEY),
+            ("dwHotKey", wintypes.DWORD),
+            ("hIconOrMonitor", wintypes.HANDLE),
+            ("hProcess", wintypes.HANDLE),
+        ]
+
+    _shell32.ShellExecuteExW.argtypes = [ctypes.POINTER(_SHELLEXECUTEINFOW)]
+    _shell32.ShellExecuteExW.restype = wintypes.BOOL
+    _kernel32.GetProcessId.argtypes = [wintypes.HANDLE]
+    _kernel32.GetProcessId.restype = wintypes.DWORD
+    _kernel32.OpenProcess.argtypes = [wintypes.DWORD, wintypes.BOOL, wintypes.DWORD]
+    _kernel32.OpenProcess.restype = wintypes.HANDLE
+    _kernel32.WaitForSingleObject.argtypes = [wintypes.HANDLE, wintypes.DWORD]
+    _kernel32.WaitForSingleObject.restype = wintypes.DWORD
+    _kernel32.GetExitCodeProcess.argtypes = [wintypes.HANDLE, ctypes.POINTER(wintypes.DWORD)]
+    _kernel32.GetExitCodeProcess.restype = wintypes.BOOL
+    _kernel32.CloseHandle.argtypes = [wintypes.HANDLE]
+
+
+def _shell_execute(path: str, cwd: str = None, verb: str = None, params: str = None):
+    """
+    ShellExecuteExW pidiendo el handle del proceso creado (para .lnk, "runas"
+    y todo lo que antes iba por os.startfile). Devuelve el handle, o None si
+    el shell no creó un proceso propio (p.ej. reutilizó una instancia abierta).
+    Lanza OSError si falla.
+    """
+    info = _SHELLEXECUTEINFOW()
+    info.cbSize = ctypes.sizeof(info)
+    info.fMask = SEE_MASK_NOCLOSEPROCESS | SEE_MASK_NOASYNC
+    info.lpVerb = verb
+    info.lpFile = path
+    info.lpParameters = params or None
+    info.lpDirectory = cwd or os.path.dirname(path)
+    info.nShow = 1
+    if not _shell32.ShellExecuteExW(ctypes.byref(info)):
+        raise ctypes.WinError(ctypes.get_last_error())
+    return info.hProcess or None
+
+
+def pid_alive(pid):
+    """True si existe un proceso con ese pid."""
+    if not pid:
+        return False
+    if _IS_WINDOWS:
+        handle = _kernel32.OpenProcess(SYNCHRONIZE, False, pid)
+        if not handle:
+            return False
+        try:
+            return _kernel32.WaitForSingleObject(handle, 0) != WAIT_OBJECT_0
+        finally:
+            _kernel32.CloseHandle(handle)
     try:
-        import ctypes
-        params = None
-        res = ctypes.windll.shell32.ShellExecuteW(None, "runas", path, params, cwd or os.path.dirname(path), 1)
-        return int(res) > 32
-    except Exception:
+        os.kill(pid, 0)
+    except ProcessLookupError:
         return False
+    except PermissionError:
+        return True
+    return True
 
-def launch_game(path: str, resolved_path: str = None):
+
+# ----------------------------
+# Sesiones
+# ----------------------------
+class LaunchSession:
     """
-    Lanza el juego de forma robusta.
-    - path: la ruta que tenemos (puede ser .exe o .lnk)
-    - resolved_path: si conoces el exe real, pásalo (preferido)
+    Un juego en marcha. method es "subprocess", "shell", "shellexecute"
+    (.lnk) o "runas"; tracked es False si no hay proceso al que seguir (el
+    shell abrió algo que no es un proceso nuevo): su exit llega enseguida.
     """
-    if not path:
-        raise FileNotFoundError("No se proporcionó ruta al juego.")
 
-    # Si resolved_path válido, preferirlo
-    exe_to_launch = None
-    cwd = None
+    def __init__(self, game, method, proc=None, handle=None, pid=None, started_at=None):
+        self.game = game
+        self.method = method
+        self.proc = proc
+        self.handle = handle
+        self.pid = pid or (proc.pid if proc is not None else None)
+        self.started_at = started_at or time.time()
+        self.ended_at = None
+        self.exit_code = None
+        self.pidfd = None
+        self.tree = None                # ProcessTree si se sigue el árbol de procesos
+        self.journal_id = None          # fila en la tabla sesiones (core/session_journal.py)
+        self.root_exited = False
+        self.exe = None                 # lo que se ejecutó (exe resuelto o .lnk)
+        self.trace = None               # core.launch_metrics.LaunchTrace; None si se re-adoptó
+        self.warmup = None              # core.warmup.Warmup si se precargaron archivos
+        self._done = threading.Event()
 
-    if resolved_path and os.path.isfile(resolved_path) and resolved_path.lower().endswith(".exe"):
-        exe_to_launch = resolved_path
-        cwd = os.path.dirname(resolved_path)
-    else:
-        # si path es lnk intentar resolver
-        if path.lower().endswith(".lnk"):
-            dynamic = _resolve_lnk(path)
-            if dynamic and os.path.isfile(dynamic) and dynamic.lower().endswith(".exe"):
-                exe_to_launch = dynamic
-                cwd = os.path.dirname(dynamic)
+    @property
+    def tracked(self):
+        return self.proc is not None or self.handle is not None or self.pid is not None
+
+    @property
+    def running(self):
+        return not self._done.is_set()
+
+    def duration(self):
+        end = self.ended_at or time.time()
+        return max(0.0, end - self.started_at)
+
+    def wait(self, timeout=None):
+        return self._done.wait(timeout)
+
+    def __repr__(self):
+        return f"<LaunchSession {self.game.get('nombre')!r} pid={self.pid} {self.method}>"
+
+
+class ProcessSupervisor:
+    """
+    Un único hilo que vigila todos los juegos en marcha.
+
+    En Linux espera sobre pidfds con poll() (sin sondeo); en otras
+    plataformas, o si pidfd no está disponible, comprueba las sesiones cada
+    POLL_INTERVAL segundos. Emite "start" y "exit" a los suscriptores, que se
+    llaman desde el hilo del supervisor (la UI debe pasar a su hilo con after).
+
+    Con follow_tree la sesión no termina al salir el proceso lanzado sino
+    cuando muere todo su árbol (hijos, nietos y, con match_folder, procesos
+    cuyo exe está en la carpeta del juego): juegos que arrancan con un
+    bootstrap que lanza el ejecutable real y sale. El árbol se mira ya en
+    add() y otra vez antes de recoger un proceso lanzado que terminó; en
+    Linux el launcher es además subreaper: los huérfanos del árbol pasan a
+    ser hijos suyos en vez de perderse en init.
+
+    Mientras haya sesiones, cada checkpoint_interval segundos emite
+    "checkpoint" con la lista de sesiones abiertas (una escritura en bloque).
+    """
+
+    POLL_INTERVAL = 1.0
+
+    def __init__(self, follow_tree=None, tree_interval=None, match_folder=None,
+                 checkpoint_interval=None):
+        self.follow_tree = get_setting("follow_process_tree", True) if follow_tree is None else follow_tree
+        self.match_folder = get_setting("track_game_folder", True) if match_folder is None else match_folder
+        self.sampler = TreeSampler(get_setting("tree_interval", 2.0) if tree_interval is None else tree_interval)
+        self.checkpoint_interval = (get_setting("checkpoint_interval", 60)
+                                    if checkpoint_interval is None else checkpoint_interval)
+        self._next_checkpoint = None
+        self._sessions = {}             # id(sesión) -> sesión
+        self._subreaper = bool(self.follow_tree) and become_subreaper()
+        self._orphans = set()           # huérfanos adoptados (subreaper) sin recoger
+        self._subscribers = {"start": [], "exit": [], "checkpoint": []}
+        self._lock = threading.Lock()
+        self._thread = None
+        self._wake_event = threading.Event()
+        self._use_pidfd = hasattr(os, "pidfd_open") and hasattr(select, "poll")
+        self._wake_r = self._wake_w = None
+        if self._use_pidfd:
+            self._wake_r, self._wake_w = os.pipe()
+            os.set_blocking(self._wake_r, False)
+
+    # ----------------------------
+    # Suscripción
+    # ----------------------------
+    def subscribe(self, event, callback):
+        """
+        callback(sesión) en cada "start" / "exit"; callback(lista de sesiones)
+        en cada "checkpoint". Devuelve una función para anular.
+        """
+        with self._lock:
+            self._subscribers[event].append(callback)
+
+        def unsubscribe():
+            with self._lock:
+                if callback in self._subscribers[event]:
+                    self._subscribers[event].remove(callback)
+        return unsubscribe
+
+    def _emit(self, event, arg):
+        with self._lock:
+            callbacks = list(self._subscribers[event])
+        for cb in callbacks:
+            try:
+                cb(arg)
+            except Exception as e:
+                print(f"Error en suscriptor de '{event}':", e)
+
+    # ----------------------------
+    # Sesiones
+    # ----------------------------
+    def add(self, session):
+        self._emit("start", session)
+        if not session.tracked:
+            self._finish(session, None)
+            return session
+        if self._use_pidfd and session.pid:
+            try:
+                session.pidfd = os.pidfd_open(session.pid)
+            except OSError:
+                session.pidfd = None
+        if self.follow_tree and session.pid:
+            session.tree = ProcessTree(session.pid, self._game_folder(session.game))
+            # primera instantánea aquí: el bootstrap puede salir antes de que muestree el hilo
+            session.tree.update(snapshot())
+            self.sampler.burst()          # muestras seguidas: el bootstrap puede salir pronto
+        with self._lock:
+            self._sessions[id(session)] = session
+        self._ensure_thread()
+        self._wake()
+        return session
+
+    def checkpoint_now(self):
+        """Emite un checkpoint ya (p.ej. al cerrar el launcher)."""
+        sessions = self.sessions()
+        if sessions:
+            self._emit("checkpoint", sessions)
+        self._next_checkpoint = time.monotonic() + self.checkpoint_interval
+
+    def _game_folder(self, game):
+        if not self.match_folder:
+            return None
+        folder = game.get("folder")
+        # un exe suelto en la raíz de la biblioteca no tiene carpeta propia
+        if not folder or folder == game.get("library_root") or not os.path.isdir(folder):
+            return None
+        return folder
+
+    def sessions(self):
+        with self._lock:
+            return list(self._sessions.values())
+
+    def _wake(self):
+        if self._wake_w is not None:
+            try:
+                os.write(self._wake_w, b"\0")
+            except OSError:
+                pass
+        self._wake_event.set()
+
+    def _ensure_thread(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _close_pidfd(self, session):
+        if session.pidfd is not None:
+            os.close(session.pidfd)
+            session.pidfd = None
+
+    def _finish(self, session, exit_code):
+        session.exit_code = exit_code
+        session.ended_at = time.time()
+        self._close_pidfd(session)
+        if session.handle is not None and _IS_WINDOWS:
+            _kernel32.CloseHandle(session.handle)
+            session.handle = None
+        with self._lock:
+            self._sessions.pop(id(session), None)
+        session._done.set()
+        self._emit("exit", session)
+
+    # ----------------------------
+    # Bucle
+    # ----------------------------
+    def _run(self):
+        while True:
+            sessions = self.sessions()
+            if not sessions:
+                self._next_checkpoint = None
+                self._wait_idle()
+                continue
+            trees = [s for s in sessions if s.tree is not None]
+            waiting = [s for s in sessions if not s.root_exited]
+            polled = [s for s in waiting if s.pidfd is not None]
+            timeout = None if len(polled) == len(waiting) else self.POLL_INTERVAL
+            if trees:
+                t = self.sampler.timeout()
+                timeout = t if timeout is None else min(timeout, t)
+            if self._next_checkpoint is None:
+                self._next_checkpoint = time.monotonic() + self.checkpoint_interval
+            t = max(0.0, self._next_checkpoint - time.monotonic())
+            timeout = t if timeout is None else min(timeout, t)
+            if self._use_pidfd:
+                poller = select.poll()
+                poller.register(self._wake_r, select.POLLIN)
+                for s in polled:
+                    poller.register(s.pidfd, select.POLLIN)
+                poller.poll(None if timeout is None else int(timeout * 1000))
+                self._drain_wake()
             else:
-                # no pudimos resolver: usar startfile sobre .lnk (mantiene args/workingdir que tenga el lnk)
-                try:
-                    os.startfile(path)
-                    return True
-                except Exception as e_start:
-                    raise RuntimeError(f"Fallo al abrir shortcut con startfile: {e_start}")
+                self._wake_event.wait(timeout)
+                self._wake_event.clear()
+
+            # muestra antes de recoger un proceso lanzado que ya terminó
+            exiting = [s for s in waiting if s.tree is not None and self._exited(s)]
+            if exiting:
+                self._sample(trees, exiting)
+            root_exited = False
+            for s in waiting:
+                done, code = self._check(s)
+                if not done:
+                    continue
+                if s.tree is None:
+                    self._finish(s, code)
+                    continue
+                # el proceso lanzado terminó; la sesión sigue si quedan otros del árbol
+                s.root_exited = True
+                s.exit_code = code
+                self._close_pidfd(s)
+                root_exited = True
+            if trees and (root_exited or self.sampler.due()):
+                self._sample(trees)
+                for s in trees:
+                    if s.root_exited and not s.tree:
+                        self._finish(s, s.exit_code)
+            if time.monotonic() >= self._next_checkpoint:
+                self.checkpoint_now()
+
+    def _wait_idle(self):
+        if self._use_pidfd:
+            select.select([self._wake_r], [], [])
+            self._drain_wake()
         else:
-            # path suele ser .exe
-            exe_to_launch = path
-            cwd = os.path.dirname(path)
+            self._wake_event.wait()
+            self._wake_event.clear()
+
+    def _drain_wake(self):
+        try:
+            while os.read(self._wake_r, 512):
+                pass
+        except (BlockingIOError, OSError):
+            pass
+
+    def _sample(self, sessions, exiting=()):
+        """Una instantánea para todos los árboles; con subreaper, reparte y recoge huérfanos."""
+        procs = self.sampler.sample([s.tree for s in sessions])
+        if self._subreaper:
+            self._adopt(procs, sessions, exiting)
+
+    def _adopt(self, procs, sessions, exiting):
+        """
+        Huérfanos que el sistema nos ha pasado: los que no estaban ya en un
+        árbol entran en el del lanzamiento más reciente cuyo proceso raíz
+        terminó (o en el único vigilado) junto con sus descendientes. Al
+        morir los recogemos nosotros: ya no son zombis de nadie más.
+        """
+        me = os.getpid()
+        roots = {s.pid for s in sessions}
+        orphans = {pid for pid, ppid in procs.items() if ppid == me and pid not in roots}
+        known = set().union(*(s.tree.pids for s in sessions))
+        new = orphans - known
+        if new:
+            owners = [s for s in sessions if s.root_exited or s in exiting]
+            if not owners and len(sessions) == 1:
+                owners = sessions
+            if owners:
+                owner = max(owners, key=lambda s: s.started_at)
+                owner.tree.adopt(new, procs)
+        self._orphans |= orphans
+        for pid in self._orphans - procs.keys():
+            try:
+                if os.waitpid(pid, os.WNOHANG)[0] == 0:
+                    continue
+            except ChildProcessError:
+                pass
+            self._orphans.discard(pid)
+
+    def _exited(self, session):
+        """Como _check pero sin recoger el proceso lanzado (queda como zombi)."""
+        if session.proc is not None and hasattr(os, "waitid"):
+            try:
+                return os.waitid(os.P_PID, session.pid, os.WEXITED | os.WNOHANG | os.WNOWAIT) is not None
+            except ChildProcessError:
+                return True
+        return self._check(session)[0]
+
+    def _check(self, session):
+        """(terminó, código de salida)."""
+        if session.proc is not None:
+            code = session.proc.poll()
+            return code is not None, code
+        if session.handle is not None:
+            if _kernel32.WaitForSingleObject(session.handle, 0) != WAIT_OBJECT_0:
+                return False, None
+            code = wintypes.DWORD()
+            _kernel32.GetExitCodeProcess(session.handle, ctypes.byref(code))
+            return True, code.value
+        # proceso que no es hijo nuestro: sólo sabemos si sigue vivo
+        if session.pidfd is not None:
+            ready = select.poll()
+            ready.register(session.pidfd, select.POLLIN)
+            return bool(ready.poll(0)), None
+        return not pid_alive(session.pid), None
+
+
+_supervisor = None
+_supervisor_lock = threading.Lock()
+
 
-    if not exe_to_launch or not os.path.exists(exe_to_launch):
-        raise FileNotFoundError(f"Archivo a ejecutar no existe: {exe_to_launch}")
+def get_supervisor():
+    global _supervisor
+    with _supervisor_lock:
+        if _supervisor is None:
+            _supervisor = ProcessSupervisor()
+        return _supervisor
 
-    # Intentar lanzar con subprocess
+
+def subscribe(event, callback):
+    return get_supervisor().subscribe(event, callback)
+
+
+# ----------------------------
+# Lanzar
+# ----------------------------
+def _target_for(game):
+    """(ruta a ejecutar, cwd, es_atajo) a partir de ruta / resolved_path."""
+    path = game.get("ruta")
+    resolved = game.get("resolved_path")
+    if not path and not resolved:
+        raise FileNotFoundError("No se proporcionó ruta al juego.")
+
+    if resolved and os.path.isfile(resolved) and resolved.lower().endswith(".exe"):
+        return resolved, os.path.dirname(resolved), False
+    if path and path.lower().endswith(".lnk"):
+        dynamic = _resolve_lnk(path)
+        if dynamic and os.path.isfile(dynamic) and dynamic.lower().endswith(".exe"):
+            return dynamic, os.path.dirname(dynamic), False
+        # no pudimos resolver: abrir el .lnk (mantiene args/workingdir que tenga)
+        return path, os.path.dirname(path), True
+    return path, os.path.dirname(path), False
+
+
+def _load_profile(game):
     try:
-        # Intento normal
-        subprocess.Popen([exe_to_launch], cwd=cwd)
-        return True
-    except Exception as e_sub:
-        # Intentar con shell
+        from core.database import get_profile
+        return get_profile(game.get("ruta"))
+    except Exception as e:
+        print("No se pudo leer el perfil de lanzamiento:", e)
+        return None
+
+
+def launch(game, profile=None):
+    """
+    Lanza un juego y devuelve su LaunchSession, ya vigilada por el supervisor.
+    Orden de intentos: subprocess, shell=True y, en Windows, ShellExecuteExW
+    (también "runas" como último recurso). Lanza una excepción si todo falla.
+
+    profile (por defecto el guardado en la BD para el juego) fija prioridad,
+    afinidad, clase de E/S, argumentos y entorno; ver core/launch_profiles.py.
+    Si la precarga está activa (ajuste "warmup" o el perfil) los archivos
+    calientes del juego se leen, tras crear el proceso, mientras arranca;
+    ver core/warmup.py.
+    Las fases del lanzamiento se guardan en la BD (core/launch_metrics.py).
+    """
+    trace = launch_metrics.LaunchTrace(game)
+    try:
+        return _launch(game, profile, trace)
+    except Exception as e:
+        launch_metrics.record_failure(trace, e)
+        raise
+
+
+def _launch(game, profile, trace):
+    exe, cwd, is_shortcut = _target_for(game)
+    if not os.path.exists(exe):
+        raise FileNotFoundError(f"Archivo a ejecutar no existe: {exe}")
+    trace.mark("resolve")
+    supervisor = get_supervisor()
+    if profile is None:
+        profile = _load_profile(game)
+    args = launch_profiles.extra_args(profile)
+    params = subprocess.list2cmdline(args) if args else None
+
+    def started(session, **spawned):
+        """
+        El proceso ya existe: perfil y seguimiento se aplican con sus propios
+        errores y nunca vuelven a lanzar el juego.
+        """
+        trace.mark("spawn")
         try:
-            subprocess.Popen(exe_to_launch, cwd=cwd, shell=True)
-            return True
-        except Exception:
-            # Intentar elevar a administrador
-            ok = _run_as_admin(exe_to_launch, cwd=cwd)
-            if ok:
-                return True
-            # si todo falla, reportar el error original
-            raise RuntimeError(f"Fallo al lanzar con subprocess: {e_sub}")
\ No newline at end of file
+            launch_profiles.apply_after_spawn(profile, **spawned)
+        except Exception as e:
+            print("No se pudo aplicar el perfil de lanzamiento:", e)
+        session.exe = exe
+        session.trace = trace
+        # la precarga se planifica en su propio hilo: el proceso ya existe
+        try:
+            session.warmup = None if is_shortcut else warmup.start(game, exe, profile)
+        except Exception as e:
+            print("No se pudo iniciar la precarga:", e)
+        try:
+            return supervisor.add(session)
+        except Exception as e:
+            print("El juego se lanzó pero no se pudo vigilar:", e)
+            return session
+
+    def shell_started(handle, verb=None):
+        pid = _kernel32.GetProcessId(handle) if handle else None
+        # el entorno no se puede pasar por ShellExecuteExW; prioridad y afinidad sí
+        return started(LaunchSession(game, "runas" if verb == "runas" else "shellexecute",
+                                     handle=handle, pid=pid), handle=handle)
+
+    if is_shortcut:
+        if not _IS_WINDOWS:
+            raise RuntimeError("Los accesos directos .lnk sólo se pueden abrir en Windows.")
+        try:
+            handle = _shell_execute(exe, cwd, params=params)
+        except OSError as e:
+            trace.failed("shellexecute")
+            raise RuntimeError(f"Fallo al abrir shortcut: {e}")
+        return shell_started(handle)
+
+    # Sólo la creación del proceso va dentro de cada try: si falla algo
+    # después, el juego ya está abierto y no se pasa al siguiente método
+    kwargs = launch_profiles.popen_kwargs(profile)
+    try:
+        proc = subprocess.Popen([exe] + args, cwd=cwd, **kwargs)
+    except Exception as e:
+        trace.failed("subprocess")
+        error = e
+    else:
+        return started(LaunchSession(game, "subprocess", proc=proc), pid=proc.pid)
+
+    # algunos launchers requieren shell
+    try:
+        command = subprocess.list2cmdline([exe] + args) if _IS_WINDOWS else shlex.join([exe] + args)
+        proc = subprocess.Popen(command, cwd=cwd, shell=True, **kwargs)
+    except Exception:
+        trace.failed("shell")
+    else:
+        return started(LaunchSession(game, "shell", proc=proc), pid=proc.pid)
+
+    if _IS_WINDOWS:
+        # intentar elevar a administrador
+        try:
+            handle = _shell_execute(exe, cwd, verb="runas", params=params)
+        except OSError:
+            trace.failed("runas")
+        else:
+            return shell_started(handle, verb="runas")
+    raise RuntimeError(f"Fallo al lanzar con subprocess: {error}")
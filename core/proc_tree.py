@@ -0,0 +1,385 @@
+# core/proc_tree.py
+import os
+import sys
+import time
+
+# psutil es opcional: sin él se lee /proc (Linux) o Toolhelp32 (Windows)
+_HAS_PSUTIL = False
+try:
+    import psutil  # type: ignore
+    _HAS_PSUTIL = True
+except Exception:
+    _HAS_PSUTIL = False
+
+_IS_WINDOWS = sys.platform == "win32"
+if _IS_WINDOWS:
+    import ctypes
+    from ctypes import wintypes
+
+    _kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    TH32CS_SNAPPROCESS = 0x00000002
+    PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+    _INVALID_HANDLE = wintypes.HANDLE(-1).value
+
+    class _PROCESSENTRY32W(ctypes.Structure):
+        _fields_ = [
+            ("dwSize", wintypes.DWORD),
+            ("cntUsage", wintypes.DWORD),
+            ("th32ProcessID", wintypes.DWORD),
+            ("th32DefaultHeapID", ctypes.c_size_t),
+            ("th32ModuleID", wintypes.DWORD),
+            ("cntThreads", wintypes.DWORD),
+            ("th32ParentProcessID", wintypes.DWORD),
+            ("pcPriClassBase", ctypes.c_long),
+            ("dwFlags", wintypes.DWORD),
+            ("szExeFile", wintypes.WCHAR * 260),
+        ]
+
+    _kernel32.CreateToolhelp32Snapshot.argtypes = [wintypes.DWORD, wintypes.DWORD]
+    _kernel32.CreateToolhelp32Snapshot.restype = wintypes.HANDLE
+    _kernel32.Process32FirstW.argtypes = [wintypes.HANDLE, ctypes.POINTER(_PROCESSENTRY32W)]
+    _kernel32.Process32NextW.argtypes = [wintypes.HANDLE, ctypes.POINTER(_PROCESSENTRY32W)]
+    _kernel32.OpenProcess.argtypes = [wintypes.DWORD, wintypes.BOOL, wintypes.DWORD]
+    _kernel32.OpenProcess.restype = wintypes.HANDLE
+    _kernel32.QueryFullProcessImageNameW.argtypes = [
+        wintypes.HANDLE, wintypes.DWORD, wintypes.LPWSTR, ctypes.POINTER(wintypes.DWORD)
+    ]
+    _kernel32.CloseHandle.argtypes = [wintypes.HANDLE]
+
+    class _IO_COUNTERS(ctypes.Structure):
+        _fields_ = [(name, ctypes.c_ulonglong) for name in (
+            "ReadOperationCount", "WriteOperationCount", "OtherOperationCount",
+            "ReadTransferCount", "WriteTransferCount", "OtherTransferCount",
+        )]
+
+    _kernel32.GetProcessIoCounters.argtypes = [wintypes.HANDLE, ctypes.POINTER(_IO_COUNTERS)]
+    _kernel32.GetProcessTimes.argtypes = [wintypes.HANDLE] + [ctypes.POINTER(wintypes.FILETIME)] * 4
+
+    _user32 = ctypes.WinDLL("user32", use_last_error=True)
+    _WNDENUMPROC = ctypes.WINFUNCTYPE(wintypes.BOOL, wintypes.HWND, wintypes.LPARAM)
+    _user32.EnumWindows.argtypes = [_WNDENUMPROC, wintypes.LPARAM]
+    _user32.GetWindowThreadProcessId.argtypes = [wintypes.HWND, ctypes.POINTER(wintypes.DWORD)]
+    _user32.IsWindowVisible.argtypes = [wintypes.HWND]
+
+
+def _norm(path):
+    return os.path.normcase(os.path.abspath(path))
+
+
+# ----------------------------
+# Instantáneas: pid -> ppid (+ exe bajo demanda)
+# ----------------------------
+def _snapshot_psutil():
+    procs = {}
+    for p in psutil.process_iter(["pid", "ppid", "status"]):
+        if p.info["status"] != psutil.STATUS_ZOMBIE:
+            procs[p.info["pid"]] = p.info["ppid"]
+    return procs
+
+
+def _snapshot_proc():
+    procs = {}
+    for name in os.listdir("/proc"):
+        if not name.isdigit():
+            continue
+        try:
+            with open(f"/proc/{name}/stat", "rb") as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # el nombre (campo 2) puede tener espacios: el ppid va tras el último ')'
+        fields = stat[stat.rfind(b")") + 2:].split()
+        if fields[0] != b"Z":           # un zombi ya terminó, sólo falta que lo recojan
+            procs[int(name)] = int(fields[1])
+    return procs
+
+
+def _snapshot_toolhelp():
+    procs = {}
+    snap = _kernel32.CreateToolhelp32Snapshot(TH32CS_SNAPPROCESS, 0)
+    if not snap or snap == _INVALID_HANDLE:
+        return procs
+    try:
+        entry = _PROCESSENTRY32W()
+        entry.dwSize = ctypes.sizeof(entry)
+        ok = _kernel32.Process32FirstW(snap, ctypes.byref(entry))
+        while ok:
+            procs[entry.th32ProcessID] = entry.th32ParentProcessID
+            ok = _kernel32.Process32NextW(snap, ctypes.byref(entry))
+    finally:
+        _kernel32.CloseHandle(snap)
+    return procs
+
+
+def snapshot():
+    """{pid: ppid} de todos los procesos, con la fuente más barata disponible."""
+    if _HAS_PSUTIL:
+        return _snapshot_psutil()
+    if _IS_WINDOWS:
+        return _snapshot_toolhelp()
+    if os.path.isdir("/proc"):
+        return _snapshot_proc()
+    return {}
+
+
+PR_SET_CHILD_SUBREAPER = 36
+
+
+def become_subreaper():
+    """
+    Linux: los descendientes de lo que lancemos que se queden sin padre pasan
+    a este proceso en vez de a init, con lo que se les puede seguir viendo
+    (su ppid es el nuestro). Hay que recogerlos al morir. True si se activó.
+    """
+    if not sys.platform.startswith("linux"):
+        return False
+    try:
+        import ctypes
+        libc = ctypes.CDLL(None, use_errno=True)
+        return libc.prctl(PR_SET_CHILD_SUBREAPER, 1, 0, 0, 0) == 0
+    except Exception:
+        return False
+
+
+def process_exe(pid):
+    """Ruta del ejecutable de pid, o None si no se puede leer."""
+    try:
+        if _HAS_PSUTIL:
+            return psutil.Process(pid).exe() or None
+        if _IS_WINDOWS:
+            handle = _kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+            if not handle:
+                return None
+            try:
+                buf = ctypes.create_unicode_buffer(1024)
+                size = wintypes.DWORD(len(buf))
+                if _kernel32.QueryFullProcessImageNameW(handle, 0, buf, ctypes.byref(size)):
+                    return buf.value
+            finally:
+                _kernel32.CloseHandle(handle)
+            return None
+        return os.readlink(f"/proc/{pid}/exe")
+    except Exception:
+        return None
+
+
+def process_files(pid):
+    """Archivos abiertos o mapeados (exe, DLLs, paquetes de datos) por pid."""
+    files = set()
+    try:
+        if _HAS_PSUTIL:
+            p = psutil.Process(pid)
+            files.update(f.path for f in p.open_files())
+            files.update(m.path for m in p.memory_maps() if os.path.isabs(m.path))
+            return files
+        if _IS_WINDOWS or not os.path.isdir("/proc"):
+            return files                # sin psutil no hay forma barata de listarlos
+        for fd in os.listdir(f"/proc/{pid}/fd"):
+            try:
+                files.add(os.readlink(f"/proc/{pid}/fd/{fd}"))
+            except OSError:
+                pass
+        with open(f"/proc/{pid}/maps", "r", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                parts = line.split(None, 5)
+                if len(parts) == 6 and parts[5].startswith("/"):
+                    files.add(parts[5].rstrip("\n"))
+    except Exception:
+        pass
+    return {f for f in files if os.path.isabs(f)}     # fuera sockets, pipes...
+
+
+def process_read_bytes(pid):
+    """Bytes leídos por pid hasta ahora (lecturas lógicas), o None."""
+    try:
+        if _HAS_PSUTIL:
+            io = psutil.Process(pid).io_counters()
+            return getattr(io, "read_chars", io.read_bytes)
+        if _IS_WINDOWS:
+            handle = _kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+            if not handle:
+                return None
+            try:
+                counters = _IO_COUNTERS()
+                if _kernel32.GetProcessIoCounters(handle, ctypes.byref(counters)):
+                    return counters.ReadTransferCount
+            finally:
+                _kernel32.CloseHandle(handle)
+            return None
+        with open(f"/proc/{pid}/io", "rb") as f:
+            for line in f:
+                if line.startswith(b"rchar:"):
+                    return int(line.split()[1])
+    except Exception:
+        pass
+    return None
+
+
+def _filetime_s(ft):
+    return ((ft.dwHighDateTime << 32) | ft.dwLowDateTime) / 1e7
+
+
+def process_cpu_seconds(pid):
+    """Tiempo de CPU (usuario + sistema) consumido por pid, o None."""
+    try:
+        if _HAS_PSUTIL:
+            t = psutil.Process(pid).cpu_times()
+            return t.user + t.system
+        if _IS_WINDOWS:
+            handle = _kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+            if not handle:
+                return None
+            try:
+                times = [wintypes.FILETIME() for _ in range(4)]
+                if _kernel32.GetProcessTimes(handle, *[ctypes.byref(t) for t in times]):
+                    return _filetime_s(times[2]) + _filetime_s(times[3])
+            finally:
+                _kernel32.CloseHandle(handle)
+            return None
+        with open(f"/proc/{pid}/stat", "rb") as f:
+            fields = f.read().rsplit(b")", 1)[1].split()
+        # utime y stime son los campos 14 y 15 (11 y 12 tras el nombre)
+        return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+    except Exception:
+        return None
+
+
+def window_pids():
+    """Pids con alguna ventana visible (sólo Windows; en otros sistemas, conjunto vacío)."""
+    pids = set()
+    if not _IS_WINDOWS:
+        return pids
+
+    def on_window(hwnd, _lparam):
+        if _user32.IsWindowVisible(hwnd):
+            pid = wintypes.DWORD()
+            _user32.GetWindowThreadProcessId(hwnd, ctypes.byref(pid))
+            pids.add(pid.value)
+        return True
+    _user32.EnumWindows(_WNDENUMPROC(on_window), 0)
+    return pids
+
+
+# ----------------------------
+# Árbol de un juego
+# ----------------------------
+class ProcessTree:
+    """
+    Procesos que pertenecen a un juego: el lanzado, sus descendientes y
+    (opcional) cualquier proceso cuyo exe esté dentro de la carpeta del juego.
+    Un pid que entra en el árbol se queda hasta que muere, aunque su padre
+    termine y el sistema lo re-asigne a otro padre. seen cuenta todos los
+    que han pasado por el árbol (1: sólo el lanzado).
+    """
+
+    def __init__(self, root_pid, folder=None):
+        self.pids = {root_pid} if root_pid else set()
+        self.seen = len(self.pids)
+        self.folder = _norm(folder) + os.sep if folder else None
+        self._checked = set()           # pids cuyo exe ya se comparó con la carpeta
+
+    def update(self, procs):
+        """Aplica una instantánea {pid: ppid}. Devuelve cuántos procesos siguen vivos."""
+        self.pids &= procs.keys()
+        self._checked &= procs.keys()
+        # descendientes: repetir hasta que no entre ninguno (nietos, etc.)
+        grew = True
+        while grew:
+            grew = False
+            for pid, ppid in procs.items():
+                if ppid in self.pids and pid not in self.pids:
+                    self.pids.add(pid)
+                    self.seen += 1
+                    grew = True
+        if self.folder:
+            for pid in procs.keys() - self.pids - self._checked:
+                self._checked.add(pid)
+                exe = process_exe(pid)
+                if exe and _norm(exe).startswith(self.folder):
+                    self.pids.add(pid)
+                    self.seen += 1
+        return len(self.pids)
+
+    def adopt(self, pids, procs):
+        """Añade pids (huérfanos que sabemos que son del juego) y sus descendientes."""
+        pids = set(pids) - self.pids
+        self.pids |= pids
+        self.seen += len(pids)
+        return self.update(procs)
+
+    def __bool__(self):
+        return bool(self.pids)
+
+
+class TreeSampler:
+    """
+    Toma una instantánea por intervalo para todos los árboles vigilados y
+    mide lo que cuesta (tiempo de CPU del hilo que muestrea).
+
+    Tras un lanzamiento muestrea más seguido durante unos segundos (burst):
+    un bootstrap que lanza el juego y sale enseguida deja a su hijo sin padre
+    conocido si no lo vimos antes.
+    """
+
+    BURST_INTERVAL = 0.1
+
+    def __init__(self, interval=2.0):
+        self.interval = interval
+        self.next_due = 0.0
+        self.burst_until = 0.0
+        self.samples = 0
+        self.cpu_s = 0.0                # CPU total gastada muestreando
+        self.wall_s = 0.0
+        self._started = time.monotonic()
+
+    def burst(self, seconds=5.0):
+        now = time.monotonic()
+        self.burst_until = now + seconds
+        self.next_due = now
+
+    def due(self, now=None):
+        return (now or time.monotonic()) >= self.next_due
+
+    def timeout(self, now=None):
+        return max(0.0, self.next_due - (now or time.monotonic()))
+
+    def sample(self, trees):
+        """Actualiza cada árbol con una única instantánea. Devuelve la instantánea."""
+        cpu0 = time.thread_time()
+        wall0 = time.perf_counter()
+        procs = snapshot()
+        for tree in trees:
+            tree.update(procs)
+        self.cpu_s += time.thread_time() - cpu0
+        self.wall_s += time.perf_counter() - wall0
+        self.samples += 1
+        now = time.monotonic()
+        interval = min(self.interval, self.BURST_INTERVAL) if now < self.burst_until else self.interval
+        self.next_due = now + interval
+        return procs
+
+    def stats(self):
+        elapsed = max(time.monotonic() - self._started, 1e-9)
+        return {
+            "samples": self.samples,
+            "interval_s": self.interval,
+            "avg_sample_ms": round(self.wall_s / self.samples * 1000, 3) if self.samples else 0.0,
+            "avg_cpu_ms": round(self.cpu_s / self.samples * 1000, 3) if self.samples else 0.0,
+            "cpu_percent": round(self.cpu_s / elapsed * 100, 4),
+        }
+
+
+if __name__ == "__main__":
+    # Coste de una instantánea: python -m core.proc_tree [muestras] [carpeta]
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    folder = sys.argv[2] if len(sys.argv) > 2 else None
+    sampler = TreeSampler(interval=0)
+    tree = ProcessTree(os.getpid(), folder)
+    for _ in range(n):
+        sampler.sample([tree])
+    fuente = "psutil" if _HAS_PSUTIL else ("toolhelp32" if _IS_WINDOWS else "/proc")
+    s = sampler.stats()
+    print(f"Fuente: {fuente}, procesos: {len(snapshot())}")
+    print(f"Por muestra: {s['avg_sample_ms']} ms reales, {s['avg_cpu_ms']} ms de CPU")
+    for interval in (1, 2, 5):
+        print(f"  cada {interval} s -> {s['avg_cpu_ms'] / (interval * 10):.4f} % de un núcleo")
@@ -0,0 +1,90 @@
+# core/resource_usage.py
+import gc
+import os
+import sys
+import time
+
+# psutil es opcional: sin él se lee /proc (Linux) o GetProcessMemoryInfo (Windows)
+_HAS_PSUTIL = False
+try:
+    import psutil  # type: ignore
+    _HAS_PSUTIL = True
+except Exception:
+    _HAS_PSUTIL = False
+
+_IS_WINDOWS = sys.platform == "win32"
+if _IS_WINDOWS:
+    import ctypes
+    from ctypes import wintypes
+
+    class _PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+        _fields_ = [
+            ("cb", wintypes.DWORD),
+            ("PageFaultCount", wintypes.DWORD),
+            ("PeakWorkingSetSize", ctypes.c_size_t),
+            ("WorkingSetSize", ctypes.c_size_t),
+            ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+            ("PagefileUsage", ctypes.c_size_t),
+            ("PeakPagefileUsage", ctypes.c_size_t),
+        ]
+
+    _kernel32 = ctypes.WinDLL("kernel32")
+    _psapi = ctypes.WinDLL("psapi")
+    _kernel32.GetCurrentProcess.restype = wintypes.HANDLE
+    _psapi.GetProcessMemoryInfo.argtypes = [
+        wintypes.HANDLE, ctypes.POINTER(_PROCESS_MEMORY_COUNTERS), wintypes.DWORD
+    ]
+    _psapi.EmptyWorkingSet.argtypes = [wintypes.HANDLE]
+
+
+def rss_bytes():
+    """Memoria residente del proceso actual, o None si no se puede medir."""
+    try:
+        if _HAS_PSUTIL:
+            return psutil.Process().memory_info().rss
+        if _IS_WINDOWS:
+            counters = _PROCESS_MEMORY_COUNTERS()
+            counters.cb = ctypes.sizeof(counters)
+            if _psapi.GetProcessMemoryInfo(_kernel32.GetCurrentProcess(), ctypes.byref(counters), counters.cb):
+                return counters.WorkingSetSize
+            return None
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except Exception:
+        return None
+
+
+def release_memory():
+    """Recoge basura y devuelve al sistema la memoria libre del heap."""
+    gc.collect()
+    try:
+        if _IS_WINDOWS:
+            _psapi.EmptyWorkingSet(_kernel32.GetCurrentProcess())
+        elif sys.platform.startswith("linux"):
+            import ctypes
+            ctypes.CDLL("libc.so.6").malloc_trim(0)
+    except Exception:
+        pass
+
+
+def fmt_mb(value):
+    return "?" if value is None else f"{value / (1024 * 1024):.1f} MB"
+
+
+class UsageMeter:
+    """RSS actual y % de CPU (de un núcleo) desde la muestra anterior."""
+
+    def __init__(self):
+        self._cpu = time.process_time()
+        self._wall = time.monotonic()
+
+    def sample(self):
+        cpu = time.process_time()
+        wall = time.monotonic()
+        elapsed = max(wall - self._wall, 1e-9)
+        percent = (cpu - self._cpu) / elapsed * 100
+        self._cpu, self._wall = cpu, wall
+        return {"rss": rss_bytes(), "cpu_percent": percent, "seconds": elapsed}
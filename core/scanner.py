@@ -1,18 +1,28 @@
 # core/scanner.py
 import os
 import re
+import stat
 
 # Intenta usar pywin32 para resolver .lnk (opcional)
-_HAS_PYWIN32 = False
-try:
-    from win32com.client import Dispatch  # type: ignore
-    _HAS_PYWIN32 = True
-except Exception:
-    _HAS_PYWIN32 = False
+# (se importa al resolver el primer .lnk: win32com tarda en cargar)
+_dispatch = None
+
+
+def _shell_dispatch():
+    """win32com.client.Dispatch, o None sin pywin32."""
+    global _dispatch
+    if _dispatch is None:
+        try:
+            from win32com.client import Dispatch  # type: ignore
+            _dispatch = Dispatch
+        except Exception:
+            _dispatch = False
+    return _dispatch or None
 
 def _resolve_lnk(lnk_path: str):
     """Intenta resolver un acceso directo .lnk a su destino real."""
-    if not _HAS_PYWIN32:
+    Dispatch = _shell_dispatch()
+    if Dispatch is None:
         return None
     try:
         shell = Dispatch("WScript.Shell")
@@ -84,6 +94,26 @@ def _best_exe_for_group(exe_paths, top_folder_name):
     except Exception:
         return exe_paths[0]
 
+def folder_size(folder: str):
+    """Tamaño total en bytes de una carpeta (recursivo, ignora errores)."""
+    total = 0
+    stack = [folder]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            total += entry.stat(follow_symlinks=False).st_size
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+    return total
+
 def buscar_juegos(root_folder: str, include_lnks_root: bool = True, debug: bool = False):
     """
     Escanea la carpeta root_folder y devuelve una lista de juegos encontrados.
@@ -101,11 +131,15 @@ def buscar_juegos(root_folder: str, include_lnks_root: bool = True, debug: bool
             - is_shortcut (bool): True si es un acceso directo.
             - resolved_path (str or None): Ruta real del .exe si se pudo resolver.
             - cover_path (None): Inicialmente None, para ser completado después.
+            - size_bytes (int or None): Tamaño de la carpeta del juego (None en
+              los accesos directos: su destino puede estar fuera de la carpeta).
+            - library_root (str): Carpeta escaneada (biblioteca de origen).
     """
     root_folder = os.path.abspath(root_folder)
     juegos = []
     skipped = []
     grouped = {}  # top_level_name -> list of exe paths
+    sizes = {}    # top_level_name -> bytes (medidos en el mismo recorrido)
     seen_exes = set()
 
     # Recorrer recursivamente y agrupar por top-level folder
@@ -118,9 +152,16 @@ def buscar_juegos(root_folder: str, include_lnks_root: bool = True, debug: bool
             top_key = rel.split(os.sep)[0]
 
         for f in filenames:
+            ruta = os.path.join(dirpath, f)
+            if top_key is not None:
+                try:
+                    st = os.lstat(ruta)
+                    if stat.S_ISREG(st.st_mode):
+                        sizes[top_key] = sizes.get(top_key, 0) + st.st_size
+                except OSError:
+                    pass
             if not f.lower().endswith(".exe"):
                 continue
-            ruta = os.path.join(dirpath, f)
             # Excluir por nombre o carpeta
             if _is_excluded_by_name(f):
                 skipped.append((ruta, "excluded_by_name"))
@@ -160,7 +201,9 @@ def buscar_juegos(root_folder: str, include_lnks_root: bool = True, debug: bool
             "folder": os.path.dirname(abs_chosen),
             "is_shortcut": False,
             "resolved_path": abs_chosen,
-            "cover_path": None  # Para compatibilidad con BD
+            "cover_path": None,  # Para compatibilidad con BD
+            "size_bytes": sizes.get(top, 0) if top else os.path.getsize(abs_chosen),
+            "library_root": root_folder
         })
 
     # Procesar .lnk en la raíz (si se pide)
@@ -186,7 +229,9 @@ def buscar_juegos(root_folder: str, include_lnks_root: bool = True, debug: bool
                             "folder": os.path.dirname(abs_res),
                             "is_shortcut": True,
                             "resolved_path": abs_res,
-                            "cover_path": None
+                            "cover_path": None,
+                            "size_bytes": None,     # lo mide la UI en segundo plano
+                            "library_root": root_folder
                         })
                         seen_exes.add(abs_res)
                     else:
@@ -200,7 +245,9 @@ def buscar_juegos(root_folder: str, include_lnks_root: bool = True, debug: bool
                             "folder": folder_for_cover,
                             "is_shortcut": True,
                             "resolved_path": None,
-                            "cover_path": None
+                            "cover_path": None,
+                            "size_bytes": None,
+                            "library_root": root_folder
                         })
         except Exception:
             pass
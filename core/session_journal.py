@@ -0,0 +1,100 @@
+# core/session_journal.py
+import os
+import time
+from datetime import datetime
+
+from core.database import (
+    open_session, checkpoint_sessions, close_session, get_open_sessions
+)
+from core.launcher import LaunchSession, pid_alive
+from core.proc_tree import process_exe
+
+
+def _minutes(started_at, ended_at):
+    return max(0, int((ended_at - started_at) / 60))
+
+
+def _fmt(ts):
+    return datetime.fromtimestamp(ts).strftime("%d/%m/%Y %H:%M")
+
+
+# ----------------------------
+# Suscriptores del supervisor
+# ----------------------------
+def _on_start(session):
+    if session.journal_id is not None:
+        return                          # sesión re-adoptada: ya tiene fila
+    try:
+        session.journal_id = open_session(session.game.get("ruta"), session.pid, session.started_at)
+    except Exception as e:
+        print("No se pudo registrar la sesión:", e)
+
+
+def _on_checkpoint(sessions):
+    now = time.time()
+    checkpoint_sessions([(s.journal_id, now) for s in sessions if s.journal_id is not None])
+
+
+def _on_exit(session):
+    ended = session.ended_at or time.time()
+    close_session(
+        session.journal_id, session.game.get("ruta"),
+        _minutes(session.started_at, ended), _fmt(ended), ended
+    )
+
+
+def install(supervisor):
+    """Guarda en la BD el inicio, los checkpoints y el final de cada sesión."""
+    supervisor.subscribe("start", _on_start)
+    supervisor.subscribe("checkpoint", _on_checkpoint)
+    supervisor.subscribe("exit", _on_exit)
+
+
+# ----------------------------
+# Recuperación al arrancar
+# ----------------------------
+def _same_game(pid, game):
+    """El pid sigue siendo el juego (y no otro proceso que reutilizó el pid)."""
+    if not pid_alive(pid):
+        return False
+    exe = process_exe(pid)
+    if not exe:
+        return False
+    exe = os.path.normcase(os.path.abspath(exe))
+    for path in (game.get("resolved_path"), game.get("ruta")):
+        if path and os.path.normcase(os.path.abspath(path)) == exe:
+            return True
+    folder = game.get("folder")
+    if folder and folder != game.get("library_root"):
+        return exe.startswith(os.path.normcase(os.path.abspath(folder)) + os.sep)
+    return False
+
+
+def recover(supervisor, games):
+    """
+    Sesiones que quedaron abiertas (el launcher o el equipo se cerró con el
+    juego en marcha). Si el proceso sigue vivo se vuelve a vigilar con su
+    hora de inicio original; si no, se cierra sumando el tiempo hasta el
+    último checkpoint. games se actualiza en memoria igual que la BD.
+    Devuelve (re-adoptadas, cerradas).
+    """
+    by_ruta = {g["ruta"]: g for g in games}
+    adopted = closed = 0
+    for row in get_open_sessions():
+        game = by_ruta.get(row["ruta"])
+        if game is not None and _same_game(row["pid"], game):
+            session = LaunchSession(game, "adopted", pid=row["pid"], started_at=row["started_at"])
+            session.journal_id = row["id"]
+            supervisor.add(session)
+            adopted += 1
+            continue
+        ended = row["checkpoint_at"]
+        minutes = _minutes(row["started_at"], ended)
+        close_session(row["id"], row["ruta"], minutes, _fmt(ended), ended)
+        if game is not None:
+            game["playtime"] = game.get("playtime", 0) + minutes
+            game["last_played"] = _fmt(ended)
+        closed += 1
+    if adopted or closed:
+        print(f"Sesiones recuperadas: {adopted} en curso, {closed} cerradas")
+    return adopted, closed
@@ -0,0 +1,32 @@
+# core/settings.py
+import os
+import json
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+CONFIG_DIR = os.path.join(BASE_DIR, "config")
+SETTINGS_FILE = os.path.join(CONFIG_DIR, "settings.json")
+
+os.makedirs(CONFIG_DIR, exist_ok=True)
+
+def _load_settings():
+    if os.path.exists(SETTINGS_FILE):
+        try:
+            with open(SETTINGS_FILE, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception:
+            return {}
+    return {}
+
+def _save_settings(s):
+    with open(SETTINGS_FILE, "w", encoding="utf-8") as f:
+        json.dump(s, f, indent=2, ensure_ascii=False)
+
+def get_setting(key, default=None):
+    """Lee una opción de config/settings.json (o default si no está)."""
+    return _load_settings().get(key, default)
+
+def set_setting(key, value):
+    """Guarda una opción en config/settings.json."""
+    s = _load_settings()
+    s[key] = value
+    _save_settings(s)
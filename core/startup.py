@@ -0,0 +1,45 @@
+# core/startup.py
+import time
+import threading
+from contextlib import contextmanager
+
+# referencia: importar este módulo es lo primero que hace main.py
+_T0 = time.perf_counter()
+_lock = threading.Lock()
+_phases = []                    # (nombre, inicio ms, duración ms, hilo)
+
+
+@contextmanager
+def phase(name):
+    """Mide una fase del arranque y la anota (y muestra) al terminar."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        end = time.perf_counter()
+        row = (name, (start - _T0) * 1000, (end - start) * 1000, threading.current_thread().name)
+        with _lock:
+            _phases.append(row)
+        print(f"Arranque: {name} {row[2]:.0f} ms (desde el inicio: {(end - _T0) * 1000:.0f} ms)")
+
+
+def mark(name):
+    """Hito sin duración (p.ej. "intro cerrada")."""
+    with phase(name):
+        pass
+
+
+def phases():
+    with _lock:
+        return list(_phases)
+
+
+def report():
+    """Resumen de las fases, en orden de inicio."""
+    rows = sorted(phases(), key=lambda r: r[1])
+    total = (time.perf_counter() - _T0) * 1000
+    lines = [f"Arranque completo en {total:.0f} ms:"]
+    for name, start, duration, thread in rows:
+        where = "" if thread == "MainThread" else f"  [{thread}]"
+        lines.append(f"  {start:7.0f} ms  +{duration:6.0f} ms  {name}{where}")
+    print("\n".join(lines))
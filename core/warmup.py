@@ -0,0 +1,215 @@
+# core/warmup.py
+import os
+import threading
+import time
+
+from core.database import get_hot_files, record_hot_files
+from core.settings import get_setting
+
+_HAS_FADVISE = hasattr(os, "posix_fadvise") and hasattr(os, "POSIX_FADV_WILLNEED")
+
+LIB_EXTS = (".dll", ".so", ".dylib")
+LARGEST_FILES = 8               # sin historial: los N archivos más grandes de la carpeta
+MAX_SCAN = 20000                # archivos como mucho al buscar los más grandes
+MAX_LEARNED = 64                # archivos aprendidos por sesión
+CHUNK = 1024 * 1024
+
+
+def _norm(path):
+    return os.path.normcase(os.path.abspath(path))
+
+
+def game_folder(game, exe):
+    """Carpeta propia del juego; un exe suelto en la raíz de la biblioteca sólo cuenta su carpeta."""
+    folder = game.get("folder")
+    if not folder or folder == game.get("library_root") or not os.path.isdir(folder):
+        return os.path.dirname(exe)
+    return folder
+
+
+def _size(path):
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return None
+
+
+def _largest(folder, n):
+    found = []
+    scanned = 0
+    for root, _dirs, files in os.walk(folder):
+        for name in files:
+            size = _size(os.path.join(root, name))
+            if size:
+                found.append((size, os.path.join(root, name)))
+            scanned += 1
+            if scanned >= MAX_SCAN:
+                break
+        if scanned >= MAX_SCAN:
+            break
+    found.sort(reverse=True)
+    return [path for _, path in found[:n]]
+
+
+def plan(game, exe, budget_bytes):
+    """
+    Archivos a precargar, en orden: el exe, las DLLs junto a él, lo que el
+    juego leyó en sesiones anteriores (más visto primero) y, si aún no hay
+    historial, los archivos más grandes de su carpeta. Hasta budget_bytes.
+    """
+    candidates = [exe]
+    exe_dir = os.path.dirname(exe)
+    try:
+        candidates += sorted(
+            os.path.join(exe_dir, name) for name in os.listdir(exe_dir)
+            if name.lower().endswith(LIB_EXTS)
+        )
+    except OSError:
+        pass
+    learned = [row[0] for row in get_hot_files(game.get("ruta"))]
+    candidates += learned or _largest(game_folder(game, exe), LARGEST_FILES)
+
+    files, total, seen = [], 0, set()
+    for path in candidates:
+        key = _norm(path)
+        size = _size(path)
+        if key in seen or not size:
+            continue
+        seen.add(key)
+        if total + size > budget_bytes:
+            continue                    # uno más pequeño detrás puede caber
+        files.append((path, size))
+        total += size
+    return files
+
+
+class Warmup:
+    """
+    Lee por adelantado los archivos calientes de un juego mientras arranca.
+
+    start(game, exe) vuelve al momento: el plan (listar la carpeta, consultar
+    la BD) se hace ya en el hilo de la precarga, así el lanzamiento nunca
+    espera por él.
+
+    Con posix_fadvise (Linux) basta con pedir WILLNEED por archivo: el kernel
+    lee en segundo plano y no pasa nada por este proceso. Sin él (Windows) se
+    leen los archivos a trozos en `threads` hilos, limitados a rate_mb MB/s
+    entre todos para no quitarle el disco al propio juego. cancel() para en
+    cuanto termina el trozo en curso.
+    """
+
+    def __init__(self, budget_mb=1024, rate_mb=200, threads=2, timeout=30.0):
+        self.budget = budget_mb * 1024 * 1024
+        self.files = []
+        self.rate = rate_mb * 1024 * 1024
+        self.threads = threads
+        self.timeout = timeout
+        self.bytes = 0
+        self.elapsed_ms = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._pending = []
+        self._started = None
+
+    def start(self, game, exe):
+        self._started = time.perf_counter()
+        threading.Thread(target=self._run, args=(game, exe), daemon=True).start()
+        return self
+
+    def cancel(self):
+        self._stop.set()
+
+    def _run(self, game, exe):
+        try:
+            try:
+                files = plan(game, exe, self.budget)
+            except Exception as e:
+                print("No se pudo preparar la precarga:", e)
+                return
+            with self._lock:
+                self.files = files
+                self._pending = list(reversed(files))
+            if self._stop.is_set():
+                return
+            if _HAS_FADVISE:
+                self._advise()
+            else:
+                workers = [threading.Thread(target=self._read_loop, daemon=True)
+                           for _ in range(max(1, self.threads))]
+                for w in workers:
+                    w.start()
+                for w in workers:
+                    w.join()
+        finally:
+            self.elapsed_ms = (time.perf_counter() - self._started) * 1000
+
+    def _advise(self):
+        for path, size in self.files:
+            if self._stop.is_set():
+                return
+            try:
+                fd = os.open(path, os.O_RDONLY)
+            except OSError:
+                continue
+            try:
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+                self.bytes += size
+            except OSError:
+                pass
+            finally:
+                os.close(fd)
+
+    def _next_file(self):
+        with self._lock:
+            return self._pending.pop() if self._pending else None
+
+    def _read_loop(self):
+        buf = bytearray(CHUNK)
+        deadline = self._started + self.timeout
+        while not self._stop.is_set():
+            item = self._next_file()
+            if item is None:
+                return
+            try:
+                with open(item[0], "rb", buffering=0) as f:
+                    while not self._stop.is_set():
+                        n = f.readinto(buf)
+                        if not n:
+                            break
+                        self._throttle(n)
+                        if time.perf_counter() > deadline:
+                            self._stop.set()
+            except OSError:
+                continue
+
+    def _throttle(self, n):
+        with self._lock:
+            self.bytes += n
+            ahead = self.bytes / self.rate - (time.perf_counter() - self._started)
+        if ahead > 0:
+            self._stop.wait(ahead)
+
+
+def enabled(profile=None):
+    """La precarga es opcional: el perfil del juego manda sobre el ajuste global."""
+    if profile and profile.get("warmup") is not None:
+        return bool(profile["warmup"])
+    return bool(get_setting("warmup", False))
+
+
+def start(game, exe, profile=None):
+    """Arranca la precarga de exe (recién lanzado) o devuelve None si está desactivada."""
+    if not enabled(profile):
+        return None
+    return Warmup(
+        budget_mb=get_setting("warmup_max_mb", 1024),
+        rate_mb=get_setting("warmup_rate_mb", 200),
+    ).start(game, exe)
+
+
+def learn(game, exe, files):
+    """Guarda qué archivos de la carpeta del juego usó al arrancar (ver core/launch_metrics.py)."""
+    folder = _norm(game_folder(game, exe)) + os.sep
+    rows = [(path, _size(path)) for path in files if _norm(path).startswith(folder)]
+    rows = sorted((r for r in rows if r[1]), key=lambda r: -r[1])[:MAX_LEARNED]
+    record_hot_files(game.get("ruta"), rows, time.time())
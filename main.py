@@ -1,27 +1,25 @@
 # main.py (arranque)
-import os
-import tkinter as tk
+from core import startup
+from ui.preload import Preload
 from ui.intro_screen import IntroWindow
-from ui.main_window import MainWindow  
-def start_launcher_after_intro():
-   
-    app = MainWindow()
+
+
+def start_launcher_after_intro(preload):
+    with startup.phase("ventana principal"):
+        from ui.main_window import MainWindow   # ya importado por la precarga
+        app = MainWindow(preload=preload.take())
     app.mainloop()
 
 if __name__ == "__main__":
-    
+
     video_path = r"C:\Users\Alexander\Downloads\GAME LAUNCHER\assets\intro.mp4"
 
-    
+    # BD, catálogo, módulos de la ventana y primeras portadas se cargan
+    # mientras se ve la intro
+    preload = Preload(modules=("ui.main_window",)).start()
+
     intro = IntroWindow(video_path=video_path, mute=False, allow_skip=True)
-    
     intro.mainloop()
+    startup.mark("intro cerrada")
 
-   
-    start_launcher_after_intro()
-
-    
-
- 
-    
-   
\ No newline at end of file
+    start_launcher_after_intro(preload)
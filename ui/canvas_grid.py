@@ -0,0 +1,220 @@
+# ui/canvas_grid.py
+import itertools
+import customtkinter as ctk
+from PIL import ImageTk
+
+from ui.virtual_grid import VirtualGrid
+
+
+def _round_rect_points(x1, y1, x2, y2, r):
+    """Puntos de un polígono suavizado que imita un rectángulo redondeado."""
+    r = max(0, min(r, (x2 - x1) / 2, (y2 - y1) / 2))
+    return [
+        x1 + r, y1, x2 - r, y1, x2, y1, x2, y1 + r,
+        x2, y2 - r, x2, y2, x2 - r, y2, x1 + r, y2,
+        x1, y2, x1, y2 - r, x1, y1 + r, x1, y1,
+    ]
+
+
+class CanvasCard:
+    """
+    Tarjeta dibujada con items de un único canvas: fondo, portada, textos y
+    dos "botones" (rectángulo + texto) con hit-test. No crea ningún widget.
+    Expone lo mismo que las tarjetas de widgets: game, cover_token y
+    set_cover(img, size).
+    """
+
+    GRID_SIZE = (220, 340)
+    LIST_HEIGHT = 60
+    BUTTON_HEIGHT = 28
+    FOCUS_COLOR = "#00ff88"
+
+    def __init__(self, grid, mode="grid"):
+        self.grid = grid
+        self.canvas = grid.canvas
+        self.mode = mode
+        self.tag = f"card{next(grid._card_ids)}"
+        self.game = None
+        self.cover_token = None
+        self.photo = None
+        self.x = 0
+        self.y = 0
+        self.width = None
+
+        c = self.canvas
+        f = grid._scaled(1)
+        self._f = f
+        theme = ctk.ThemeManager.theme["CTkButton"]
+        self.btn_color = grid._apply_appearance_mode(theme["fg_color"])
+        self.btn_hover = grid._apply_appearance_mode(theme["hover_color"])
+        btn_text = grid._apply_appearance_mode(theme["text_color"])
+        text_color = grid._apply_appearance_mode(ctk.ThemeManager.theme["CTkLabel"]["text_color"])
+        tags = (self.tag,)
+
+        self.bg = c.create_polygon(0, 0, 0, 0, smooth=True, outline="", tags=tags)
+        self.image = c.create_image(0, 0, anchor="nw", tags=tags)
+        self.buttons = {}
+        if mode == "grid":
+            w, h = self.GRID_SIZE
+            c.coords(self.bg, *_round_rect_points(0, 0, w * f, h * f, 8 * f))
+            c.coords(self.image, 20 * f, 12 * f)
+            self.name = c.create_text(
+                w / 2 * f, 262 * f, anchor="n", width=200 * f, justify="center",
+                font=("Arial", -round(12 * f)), fill=text_color, tags=tags
+            )
+            y1 = (h - 12 - self.BUTTON_HEIGHT) * f
+            self._add_button("play", "Jugar", 6 * f, y1, 106 * f, btn_text)
+            self._add_button("cover", "Portada", 114 * f, y1, 106 * f, btn_text)
+            self.details = []
+        else:
+            h = self.LIST_HEIGHT
+            c.coords(self.bg, 0, 0, 0, 0)
+            c.coords(self.image, 10 * f, 5 * f)
+            self.name = c.create_text(
+                110 * f, h / 2 * f, anchor="w",
+                font=("Arial", -round(15 * f), "bold"), fill=text_color, tags=tags
+            )
+            self.details = [
+                c.create_text(x * f, h / 2 * f, anchor="w", font=("Arial", -round(13 * f)),
+                              fill=text_color, tags=tags)
+                for x in (420, 560)
+            ]
+            self._add_button("play", "Jugar", 0, (h - self.BUTTON_HEIGHT) / 2 * f, 100 * f, btn_text)
+
+    def _add_button(self, action, text, x, y, width, text_color):
+        c = self.canvas
+        f = self._f
+        h = self.BUTTON_HEIGHT * f
+        rect = c.create_polygon(
+            *_round_rect_points(x, y, x + width, y + h, 6 * f),
+            smooth=True, fill=self.btn_color, outline="", tags=(self.tag,)
+        )
+        label = c.create_text(
+            x + width / 2, y + h / 2, text=text, fill=text_color,
+            font=("Arial", -round(13 * f)), tags=(self.tag,)
+        )
+        self.buttons[action] = (rect, label, width)
+        self.grid._hit[rect] = (self, action)
+        self.grid._hit[label] = (self, action)
+
+    # ----------------------------
+    # Contenido
+    # ----------------------------
+    def set_text(self, name, *details):
+        self.canvas.itemconfigure(self.name, text=name)
+        for item, text in zip(self.details, details):
+            self.canvas.itemconfigure(item, text=text)
+
+    def set_fill(self, color):
+        self.canvas.itemconfigure(self.bg, fill=color)
+
+    def set_cover(self, img, size):
+        f = self._f
+        img = img.resize((round(size[0] * f), round(size[1] * f)))
+        self.photo = ImageTk.PhotoImage(img)
+        self.canvas.itemconfigure(self.image, image=self.photo)
+
+    def set_focused(self, focused):
+        if focused:
+            self.canvas.itemconfigure(self.bg, outline=self.FOCUS_COLOR, width=3 * self._f)
+        else:
+            self.canvas.itemconfigure(self.bg, outline="", width=1)
+
+    def set_hover(self, action, hovered):
+        rect = self.buttons[action][0]
+        self.canvas.itemconfigure(rect, fill=self.btn_hover if hovered else self.btn_color)
+
+    # ----------------------------
+    # Posición / visibilidad
+    # ----------------------------
+    def show(self, x, y, width=None):
+        c = self.canvas
+        if (x, y) != (self.x, self.y):
+            c.move(self.tag, x - self.x, y - self.y)
+            self.x, self.y = x, y
+        if width is not None and width != self.width:
+            self._stretch(width)
+        c.itemconfigure(self.tag, state="normal")
+
+    def _stretch(self, width):
+        # en modo lista el fondo ocupa todo el ancho y "Jugar" va a la derecha
+        c = self.canvas
+        f = self._f
+        self.width = width
+        h = self.LIST_HEIGHT * f
+        c.coords(self.bg, *_round_rect_points(self.x, self.y, self.x + width, self.y + h, 0))
+        rect, label, bw = self.buttons["play"]
+        bx = self.x + width - 10 * f - bw
+        by = self.y + (h - self.BUTTON_HEIGHT * f) / 2
+        c.coords(rect, *_round_rect_points(bx, by, bx + bw, by + self.BUTTON_HEIGHT * f, 6 * f))
+        c.coords(label, bx + bw / 2, by + self.BUTTON_HEIGHT * f / 2)
+
+    def hide(self):
+        self.canvas.itemconfigure(self.tag, state="hidden")
+
+    def destroy(self):
+        for rect, label, _w in self.buttons.values():
+            self.grid._hit.pop(rect, None)
+            self.grid._hit.pop(label, None)
+        self.canvas.delete(self.tag)
+        self.photo = None
+
+
+class CanvasGrid(VirtualGrid):
+    """
+    Backend alternativo de VirtualGrid: todas las tarjetas son items de un
+    mismo tk.Canvas (ver CanvasCard) en lugar de árboles de widgets CTk.
+    create_card(grid) debe devolver una CanvasCard; on_action(game, action)
+    recibe los clics en "play" / "cover".
+    """
+
+    def __init__(self, master, on_action=None, **kwargs):
+        self.on_action = on_action
+        self._hit = {}                  # id de item -> (tarjeta, acción)
+        self._hover = None
+        self._card_ids = itertools.count()
+        super().__init__(master, **kwargs)
+        self.canvas.bind("<Motion>", self._on_motion)
+        self.canvas.bind("<Leave>", lambda e: self._set_hover(None))
+        self.canvas.bind("<Button-1>", self._on_click)
+
+    def _new_card(self):
+        return self.create_card(self)
+
+    def _show_card(self, card, x, y, width=None):
+        card.show(x, y, width)
+
+    def _hide_card(self, card):
+        if self._hover and self._hover[0] is card:
+            self._set_hover(None)
+        card.hide()
+
+    def _destroy_card(self, card):
+        if self._hover and self._hover[0] is card:
+            self._hover = None
+        card.destroy()
+
+    # ----------------------------
+    # Hit-test
+    # ----------------------------
+    def _hit_test(self):
+        current = self.canvas.find_withtag("current")
+        return self._hit.get(current[0]) if current else None
+
+    def _set_hover(self, hit):
+        if hit == self._hover:
+            return
+        if self._hover:
+            self._hover[0].set_hover(self._hover[1], False)
+        self._hover = hit
+        if hit:
+            hit[0].set_hover(hit[1], True)
+        self.canvas.configure(cursor="hand2" if hit else "")
+
+    def _on_motion(self, event):
+        self._set_hover(self._hit_test())
+
+    def _on_click(self, event):
+        hit = self._hit_test()
+        if hit and hit[0].game is not None and self.on_action:
+            self.on_action(hit[0].game, hit[1])
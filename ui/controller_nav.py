@@ -0,0 +1,165 @@
+# ui/controller_nav.py
+import threading
+from collections import deque
+
+from core.input_service import get_service
+
+
+class ControllerNavigator:
+    """
+    Navegación de la biblioteca con mando (estilo "big picture").
+
+    Escucha el servicio de mandos: en su hilo traduce cruceta y stick
+    izquierdo a una dirección (con histéresis en el stick) y los botones a
+    acciones; sólo los cambios pasan a Tk, por una cola con un único after
+    pendiente. En Tk la dirección mueve el foco de la rejilla (sólo se
+    redibujan las dos tarjetas afectadas) y, mientras se mantiene, se repite
+    tras REPEAT_DELAY_MS cada REPEAT_MS; al soltar se cancela. No hay
+    temporizadores mientras no se toca el mando.
+
+    A lanza el juego con foco, X/Y abre el diálogo de portada y B quita el
+    foco. Se ignora la entrada si el launcher no tiene el foco del teclado
+    (otra ventana delante, el propio juego); en modo juego ni se escucha
+    (pause / start).
+    """
+
+    AXIS_ON = 0.6                   # el stick cuenta como dirección a partir de aquí...
+    AXIS_OFF = 0.35                 # ...y deja de contar por debajo de esto
+    REPEAT_DELAY_MS = 350
+    REPEAT_MS = 110
+    BUTTON_ACTIONS = {0: "play", 1: "back", 2: "cover", 3: "cover"}     # A, B, X, Y
+
+    def __init__(self, window):
+        self.window = window
+        self.service = get_service()
+        self._unsubscribe = None
+        # estado en el hilo del servicio
+        self._hat = (0, 0)
+        self._stick = [0.0, 0.0]
+        self._stick_dir = (0, 0)
+        self._direction = (0, 0)
+        # paso a Tk
+        self._inbox = deque()
+        self._lock = threading.Lock()
+        self._drain_pending = False
+        self._repeat_job = None
+
+    @property
+    def active(self):
+        return self._unsubscribe is not None
+
+    def start(self):
+        if self._unsubscribe is None:
+            self._unsubscribe = self.service.subscribe(self._on_input)
+
+    def pause(self):
+        """Deja de escuchar y de repetir sin quitar el foco. True si estaba activo."""
+        if self._unsubscribe is None:
+            return False
+        self._unsubscribe()
+        self._unsubscribe = None
+        self._cancel_repeat()
+        # al volver se parte de nada pulsado
+        self._hat, self._stick, self._stick_dir, self._direction = (0, 0), [0.0, 0.0], (0, 0), (0, 0)
+        return True
+
+    def stop(self):
+        if self._unsubscribe is not None:
+            self._unsubscribe()
+            self._unsubscribe = None
+        self._cancel_repeat()
+        self.window.games_view.set_focus(None)
+
+    # ----------------------------
+    # Hilo del servicio
+    # ----------------------------
+    def _on_input(self, event):
+        if event.kind == "button":
+            action = self.BUTTON_ACTIONS.get(event.index)
+            if action and event.value:
+                self._post(("action", action))
+            return
+        if event.kind == "hat" and event.index == 0:
+            self._hat = (event.value[0], -event.value[1])   # en el hat, arriba es +1
+        elif event.kind == "axis" and event.index in (0, 1):
+            self._stick[event.index] = event.value
+            self._stick_dir = self._stick_direction()
+        else:
+            return
+        direction = self._hat if self._hat != (0, 0) else self._stick_dir
+        if direction != self._direction:
+            self._direction = direction
+            self._post(("direction", direction))
+
+    def _stick_direction(self):
+        x, y = self._stick
+        held = self._stick_dir != (0, 0)
+        threshold = self.AXIS_OFF if held else self.AXIS_ON
+        if max(abs(x), abs(y)) < threshold:
+            return (0, 0)
+        if abs(x) >= abs(y):
+            return (1 if x > 0 else -1, 0)
+        return (0, 1 if y > 0 else -1)
+
+    def _post(self, item):
+        with self._lock:
+            self._inbox.append(item)
+            if self._drain_pending:
+                return
+            self._drain_pending = True
+        try:
+            self.window.after(0, self._drain)
+        except RuntimeError:
+            pass                        # la ventana ya no existe
+
+    # ----------------------------
+    # Hilo de Tk
+    # ----------------------------
+    def _drain(self):
+        with self._lock:
+            items = list(self._inbox)
+            self._inbox.clear()
+            self._drain_pending = False
+        if not self.active:
+            return
+        for kind, value in items:
+            if kind == "direction":
+                self._cancel_repeat()
+                if value != (0, 0) and self._accepts_input():
+                    self._step(value, self.REPEAT_DELAY_MS)
+            elif self._accepts_input():
+                self._act(value)
+
+    def _accepts_input(self):
+        w = self.window
+        if w.game_mode.active:
+            return False
+        try:
+            focus = w.focus_get()
+        except KeyError:
+            focus = None                # foco en un menú desplegable de Tk
+        return focus is not None and focus.winfo_toplevel() is w
+
+    def _step(self, direction, next_ms):
+        self.window.games_view.move_focus(*direction)
+        self._repeat_job = self.window.after(next_ms, self._step, direction, self.REPEAT_MS)
+
+    def _cancel_repeat(self):
+        if self._repeat_job is not None:
+            self.window.after_cancel(self._repeat_job)
+            self._repeat_job = None
+
+    def _act(self, action):
+        view = self.window.games_view
+        if action == "back":
+            view.set_focus(None)
+            return
+        game = view.focused_item()
+        if game is None:
+            view.move_focus(0, 0)       # primera pulsación: sólo aparece el foco
+            return
+        self._cancel_repeat()
+        if action == "play":
+            self.window.launch_game(game)
+        else:
+            self.window.change_cover_dialog(game)
@@ -2,10 +2,40 @@
 
 import customtkinter as ctk
 import tkinter as tk
-import pygame
+import threading
+from collections import deque
+
+from core.input_service import get_service
+from core.input_sampler import InputSampler, format_stats
+from core.settings import get_setting
+
+ON = "#00ff88"
+OFF = "#333"
+NO_DEVICES = "No hay controles"
 
 
 class ControllerWindow(ctk.CTkToplevel):
+    """
+    Tester de mandos dirigido por eventos.
+
+    Se suscribe al servicio de mandos (core/input_service.py): los eventos
+    llegan desde su hilo a una cola y se aplican en el de Tk con un único
+    after pendiente. Se comparan con el último estado del mando elegido (los
+    ejes, tras aplicar la zona muerta y redondear) y sólo se redibuja en el
+    canvas lo que cambió. El panel de texto se actualiza aparte, como mucho
+    cada TEXT_MS y sólo las líneas afectadas. Sin eventos no corre nada.
+    La lista de mandos se mantiene con los avisos de conexión/desconexión.
+
+    Aparte, un InputSampler lee el mando elegido en su propio hilo (hasta
+    1 kHz) y cada STATS_MS se muestran jitter, ruido, deriva y rebotes.
+    En modo juego (pause / resume) se suelta el servicio y se para el
+    muestreador.
+    """
+
+    TEXT_MS = 150
+    DEADZONE = 0.08
+    AXIS_STEP = 0.01                # resolución de los ejes para decidir si cambiaron
+    STATS_MS = 1000
 
     def __init__(self, parent):
         super().__init__(parent)
@@ -17,15 +47,27 @@ class ControllerWindow(ctk.CTkToplevel):
         self.after(200, lambda: self.attributes("-topmost", False))
 
         self.title("Controller Professional Tester")
-        self.geometry("900x600")
+        self.geometry("900x700")
         self.resizable(False, False)
 
         self.center_window(parent)
 
-        pygame.init()
-        pygame.joystick.init()
-
+        self.service = get_service()
         self.joystick = None
+        self.device_id = None
+        self.buttons = []
+        self.axes = []
+        self.hats = []
+        self._lines = {}            # clave ("button", i) / ("axis", i) / ("hat", i) -> nº de línea
+        self._dirty = set()         # líneas del panel pendientes de reescribir
+        self._inbox = deque()       # eventos del hilo del servicio pendientes de aplicar
+        self._inbox_lock = threading.Lock()
+        self._drain_job = None
+        self._text_job = None
+        self._closed = False
+        self.sampler = None
+        self._stats_job = None
+        self._paused = None             # modo juego: si el muestreador estaba en marcha
 
         # -------- HEADER --------
         title = ctk.CTkLabel(self, text="🎮 Controller Professional Tester", font=("Arial", 22))
@@ -41,9 +83,6 @@ class ControllerWindow(ctk.CTkToplevel):
         )
         self.device_menu.pack(pady=5)
 
-        refresh_btn = ctk.CTkButton(self, text="Actualizar dispositivos", command=self.refresh_devices)
-        refresh_btn.pack(pady=5)
-
         # -------- MAIN FRAME --------
         main = ctk.CTkFrame(self)
         main.pack(fill="both", expand=True, padx=20, pady=15)
@@ -56,39 +95,91 @@ class ControllerWindow(ctk.CTkToplevel):
         self.info_panel = ctk.CTkTextbox(main, width=220)
         self.info_panel.pack(side="right", fill="y", padx=10)
 
+        # Medición del muestreador
+        self.stats_label = ctk.CTkLabel(self, text="", justify="left", anchor="w", font=("Consolas", 12))
+        self.stats_label.pack(fill="x", padx=20, pady=(0, 10))
+
         self.setup_visual()
 
-        self.update_loop()
+        self._unsubscribe = self.service.subscribe(self.on_input)
 
     # --------------------------------------------------
     # DETECCIÓN DE DISPOSITIVOS
     # --------------------------------------------------
 
     def get_devices(self):
-        devices = []
-        for i in range(pygame.joystick.get_count()):
-            joy = pygame.joystick.Joystick(i)
-            joy.init()
-            devices.append(f"{i} - {joy.get_name()}")
-        if not devices:
-            devices = ["No hay controles"]
-        return devices
+        devices = [f"{d['id']} - {d['name']}" for d in self.service.devices()]
+        return devices or [NO_DEVICES]
 
     def refresh_devices(self):
-        pygame.joystick.quit()
-        pygame.joystick.init()
+        """Tras conectar o desconectar un mando (evento del servicio)."""
         devices = self.get_devices()
         self.device_menu.configure(values=devices)
-        self.device_var.set(devices[0])
+        current = self.device_var.get()
+        if current not in devices:
+            self.device_var.set(devices[0])
+            self.select_device(devices[0])
 
     def select_device(self, value):
-        if "No hay" in value:
-            self.joystick = None
+        self.stop_sampler()
+        self.joystick = self.device_id = None
+        if value == NO_DEVICES:
+            return
+
+        device = int(value.split(" - ")[0])
+        self.joystick = self.service.joystick(device)
+        if self.joystick is None:
+            return
+        self.device_id = device
+        self.read_full_state()
+        self.start_sampler()
+
+    # --------------------------------------------------
+    # MUESTREO DE ALTA FRECUENCIA
+    # --------------------------------------------------
+
+    def start_sampler(self):
+        try:
+            self.sampler = InputSampler(self.joystick, rate_hz=get_setting("input_sample_hz", 1000)).start()
+        except RuntimeError as e:
+            self.stats_label.configure(text=str(e))
             return
+        self.stats_label.configure(text=format_stats(None))
+        self._stats_job = self.after(self.STATS_MS, self.show_stats)
+
+    def stop_sampler(self):
+        if self._stats_job is not None:
+            self.after_cancel(self._stats_job)
+            self._stats_job = None
+        if self.sampler is not None:
+            self.sampler.stop()
+            self.sampler = None
+
+    def pause(self):
+        """Modo juego: sin eventos del servicio ni muestreador hasta resume()."""
+        if self._paused is not None:
+            return
+        self._paused = self.sampler is not None
+        self.stop_sampler()
+        self._unsubscribe()
 
-        index = int(value.split(" - ")[0])
-        self.joystick = pygame.joystick.Joystick(index)
-        self.joystick.init()
+    def resume(self):
+        if self._paused is None or self._closed:
+            return
+        sampling, self._paused = self._paused, None
+        self._unsubscribe = self.service.subscribe(self.on_input)
+        self.refresh_devices()          # pudo conectarse o desconectarse algo durante el juego
+        if self.joystick is not None:
+            self.read_full_state()
+            if sampling and self.sampler is None:
+                self.start_sampler()
+
+    def show_stats(self):
+        self._stats_job = None
+        if self.sampler is None:
+            return
+        self.stats_label.configure(text=format_stats(self.sampler.stats()))
+        self._stats_job = self.after(self.STATS_MS, self.show_stats)
 
     # --------------------------------------------------
     # VISUAL PROFESIONAL
@@ -108,15 +199,15 @@ class ControllerWindow(ctk.CTkToplevel):
         self.canvas.create_oval(200, 220, 300, 320, outline="#666", width=3)
         self.canvas.create_oval(350, 220, 450, 320, outline="#666", width=3)
 
-        self.left_knob = self.canvas.create_oval(240, 260, 260, 280, fill="#00ff88")
-        self.right_knob = self.canvas.create_oval(390, 260, 410, 280, fill="#00ff88")
+        self.left_knob = self.canvas.create_oval(240, 260, 260, 280, fill=ON)
+        self.right_knob = self.canvas.create_oval(390, 260, 410, 280, fill=ON)
 
         # D-Pad
         self.dpad = {
-            "up": self.canvas.create_rectangle(150, 200, 180, 230, fill="#333"),
-            "down": self.canvas.create_rectangle(150, 270, 180, 300, fill="#333"),
-            "left": self.canvas.create_rectangle(120, 235, 150, 265, fill="#333"),
-            "right": self.canvas.create_rectangle(180, 235, 210, 265, fill="#333"),
+            "up": self.canvas.create_rectangle(150, 200, 180, 230, fill=OFF),
+            "down": self.canvas.create_rectangle(150, 270, 180, 300, fill=OFF),
+            "left": self.canvas.create_rectangle(120, 235, 150, 265, fill=OFF),
+            "right": self.canvas.create_rectangle(180, 235, 210, 265, fill=OFF),
         }
 
         # Botones dinámicos (todos)
@@ -129,70 +220,168 @@ class ControllerWindow(ctk.CTkToplevel):
             y = base_y + (i // 4) * 35
             self.button_visuals[i] = self.canvas.create_oval(
                 x, y, x+25, y+25,
-                fill="#333"
+                fill=OFF
             )
 
     # --------------------------------------------------
-    # LOOP ACTUALIZACIÓN
+    # ESTADO
     # --------------------------------------------------
 
-    def update_loop(self):
-
-        if self.joystick:
-            pygame.event.pump()
+    def filter_axis(self, value):
+        """Zona muerta y redondeo a AXIS_STEP: el ruido del stick en reposo no cuenta como cambio."""
+        if abs(value) < self.DEADZONE:
+            return 0.0
+        return round(value / self.AXIS_STEP) * self.AXIS_STEP
+
+    def read_full_state(self):
+        """Estado completo del mando elegido (al seleccionarlo) y redibujado de todo."""
+        joy = self.joystick
+        self.buttons = [bool(joy.get_button(i)) for i in range(joy.get_numbuttons())]
+        self.axes = [self.filter_axis(joy.get_axis(i)) for i in range(joy.get_numaxes())]
+        self.hats = [tuple(joy.get_hat(i)) for i in range(joy.get_numhats())]
+
+        for i, visual in self.button_visuals.items():
+            pressed = i < len(self.buttons) and self.buttons[i]
+            self.canvas.itemconfig(visual, fill=ON if pressed else OFF)
+        self.draw_hat(self.hats[0] if self.hats else (0, 0))
+        self.draw_sticks({0, 1, 2, 3})
+        self.rebuild_text()
+
+    def apply_event(self, event):
+        """Aplica un InputEvent al estado. Devuelve la clave de lo que cambió, o None."""
+        if event.kind == "button":
+            state, value = self.buttons, bool(event.value)
+        elif event.kind == "axis":
+            state, value = self.axes, self.filter_axis(event.value)
+        elif event.kind == "hat":
+            state, value = self.hats, event.value
+        else:
+            return None
+        if event.index >= len(state) or state[event.index] == value:
+            return None
+        state[event.index] = value
+        return (event.kind, event.index)
 
-            info = f"Nombre: {self.joystick.get_name()}\n"
-            info += f"Botones: {self.joystick.get_numbuttons()}\n"
-            info += f"Ejes: {self.joystick.get_numaxes()}\n"
-            info += f"Hats: {self.joystick.get_numhats()}\n\n"
-
-            # -------- BOTONES --------
-            for i in range(self.joystick.get_numbuttons()):
-                pressed = self.joystick.get_button(i)
-                info += f"Botón {i}: {'ON' if pressed else 'OFF'}\n"
-
-                if i in self.button_visuals:
-                    color = "#00ff88" if pressed else "#333"
-                    self.canvas.itemconfig(self.button_visuals[i], fill=color)
-
-            # -------- D-PAD (HAT) --------
-            if self.joystick.get_numhats() > 0:
-                hat = self.joystick.get_hat(0)
-
-                up = hat[1] == 1
-                down = hat[1] == -1
-                left = hat[0] == -1
-                right = hat[0] == 1
-
-                self.canvas.itemconfig(self.dpad["up"], fill="#00ff88" if up else "#333")
-                self.canvas.itemconfig(self.dpad["down"], fill="#00ff88" if down else "#333")
-                self.canvas.itemconfig(self.dpad["left"], fill="#00ff88" if left else "#333")
-                self.canvas.itemconfig(self.dpad["right"], fill="#00ff88" if right else "#333")
-
-                info += f"\nDPad: {hat}"
-
-            # -------- STICKS --------
-            max_offset = 30
-
-            if self.joystick.get_numaxes() >= 2:
-                lx = self.joystick.get_axis(0)
-                ly = self.joystick.get_axis(1)
-
-                self.move_knob(self.left_knob, self.left_center, lx, ly, max_offset)
-
-            if self.joystick.get_numaxes() >= 4:
-                rx = self.joystick.get_axis(2)
-                ry = self.joystick.get_axis(3)
+    # --------------------------------------------------
+    # EVENTOS DEL SERVICIO
+    # --------------------------------------------------
 
-                self.move_knob(self.right_knob, self.right_center, rx, ry, max_offset)
+    def on_input(self, event):
+        """Hilo del servicio: encola y pide un único drain en el hilo de Tk."""
+        with self._inbox_lock:
+            self._inbox.append(event)
+            if self._drain_job is not None:
+                return
+            self._drain_job = True
+        try:
+            self.after(0, self.drain)
+        except RuntimeError:
+            pass                        # la ventana ya no existe
+
+    def drain(self):
+        with self._inbox_lock:
+            events = list(self._inbox)
+            self._inbox.clear()
+            self._drain_job = None
+        if self._closed:
+            return
+        changed = set()
+        hotplug = False
+        for event in events:
+            if event.kind in ("added", "removed"):
+                hotplug = True
+            elif event.device == self.device_id:
+                key = self.apply_event(event)
+                if key is not None:
+                    changed.add(key)
+        if hotplug:
+            self.refresh_devices()
+        if changed:
+            self.redraw(changed)
+
+    def redraw(self, changed):
+        """Canvas ya; el panel de texto queda marcado para el próximo TEXT_MS."""
+        sticks = set()
+        for kind, i in changed:
+            if kind == "button" and i in self.button_visuals:
+                self.canvas.itemconfig(self.button_visuals[i], fill=ON if self.buttons[i] else OFF)
+            elif kind == "hat" and i == 0:
+                self.draw_hat(self.hats[0])
+            elif kind == "axis":
+                sticks.add(i)
+        if sticks:
+            self.draw_sticks(sticks)
+        self._dirty |= changed
+        if self._text_job is None:
+            self._text_job = self.after(self.TEXT_MS, self.flush_text)
+
+    def draw_hat(self, hat):
+        states = {"up": hat[1] == 1, "down": hat[1] == -1, "left": hat[0] == -1, "right": hat[0] == 1}
+        for name, on in states.items():
+            self.canvas.itemconfig(self.dpad[name], fill=ON if on else OFF)
+
+    def draw_sticks(self, axes):
+        max_offset = 30
+        if axes & {0, 1} and len(self.axes) >= 2:
+            self.move_knob(self.left_knob, self.left_center, self.axes[0], self.axes[1], max_offset)
+        if axes & {2, 3} and len(self.axes) >= 4:
+            self.move_knob(self.right_knob, self.right_center, self.axes[2], self.axes[3], max_offset)
 
-            self.info_panel.delete("1.0", "end")
-            self.info_panel.insert("1.0", info)
+    # --------------------------------------------------
+    # PANEL DE TEXTO
+    # --------------------------------------------------
 
-        self.after(30, self.update_loop)
+    def line_text(self, key):
+        kind, i = key
+        if kind == "button":
+            return f"Botón {i}: {'ON' if self.buttons[i] else 'OFF'}"
+        if kind == "axis":
+            return f"Eje {i}: {self.axes[i]:+.2f}"
+        return f"DPad {i}: {self.hats[i]}"
+
+    def rebuild_text(self):
+        """Texto completo: sólo al elegir mando."""
+        joy = self.joystick
+        lines = [
+            f"Nombre: {joy.get_name()}",
+            f"Botones: {len(self.buttons)}",
+            f"Ejes: {len(self.axes)}",
+            f"Hats: {len(self.hats)}",
+            "",
+        ]
+        self._lines = {}
+        keys = ([("button", i) for i in range(len(self.buttons))]
+                + [("axis", i) for i in range(len(self.axes))]
+                + [("hat", i) for i in range(len(self.hats))])
+        for key in keys:
+            lines.append(self.line_text(key))
+            self._lines[key] = len(lines)          # las líneas de Tk empiezan en 1
+        self._dirty.clear()
+        self.info_panel.delete("1.0", "end")
+        self.info_panel.insert("1.0", "\n".join(lines))
+
+    def flush_text(self):
+        """Reescribe sólo las líneas de lo que cambió desde el último flush."""
+        self._text_job = None
+        dirty, self._dirty = self._dirty, set()
+        for key in dirty:
+            line = self._lines.get(key)
+            if line is None:
+                continue
+            self.info_panel.delete(f"{line}.0", f"{line}.end")
+            self.info_panel.insert(f"{line}.0", self.line_text(key))
 
     # --------------------------------------------------
 
+    def destroy(self):
+        self._closed = True
+        self._unsubscribe()
+        self.stop_sampler()
+        if self._text_job is not None:
+            self.after_cancel(self._text_job)
+            self._text_job = None
+        super().destroy()
+
     def move_knob(self, knob, center, ax, ay, max_offset):
         new_x = center[0] + ax * max_offset
         new_y = center[1] + ay * max_offset
@@ -214,9 +403,9 @@ class ControllerWindow(ctk.CTkToplevel):
         ph = parent.winfo_height()
 
         w = 900
-        h = 600
+        h = 700
 
         x = px + (pw // 2) - (w // 2)
         y = py + (ph // 2) - (h // 2)
 
-        self.geometry(f"{w}x{h}+{x}+{y}")
\ No newline at end of file
+        self.geometry(f"{w}x{h}+{x}+{y}")
@@ -0,0 +1,211 @@
+# ui/cover_loader.py
+import collections
+import itertools
+import queue
+import os
+import threading
+import time
+
+from PIL import Image, ImageOps
+
+from core.cover_manager import get_best_cover
+
+
+def cover_token(game, size):
+    """Identifica la portada que muestra una tarjeta: cambia si cambia la imagen."""
+    return (game["ruta"], game.get("cover_path"), game.get("cover_rev", 0), size)
+
+
+def default_cover_path():
+    default = os.path.join(os.path.dirname(os.path.dirname(__file__)), "assets", "default_cover.png")
+    if os.path.isfile(default):
+        return default
+    return None
+
+
+def resolve_cover_path(game):
+    """Portada de la BD, la que haya junto al juego o la predeterminada (sin descargar)."""
+    cover_path = game.get("cover_path")
+    if not cover_path or not os.path.isfile(cover_path):
+        folder = game.get("folder") or os.path.dirname(game.get("ruta", ""))
+        cover_path = get_best_cover(game["nombre"], folder)
+        if not cover_path or not os.path.isfile(cover_path):
+            cover_path = default_cover_path()
+    return cover_path
+
+
+def read_cover(cover_path, size, atlas=None):
+    """
+    Decodifica una portada a size: primero el atlas (sin abrir archivos) y si
+    no, el archivo. Devuelve (imagen o None, True si salió del archivo).
+    Sin Tk: se llama desde hilos de fondo.
+    """
+    img = atlas.lookup(cover_path, size) if atlas else None
+    if img is not None or not cover_path or not os.path.isfile(cover_path):
+        return img, False
+    try:
+        img = Image.open(cover_path).convert("RGBA")
+        return ImageOps.contain(img, size), True
+    except Exception:
+        return None, False
+
+
+class _Ticket:
+    __slots__ = ("owner", "job", "callback", "priority", "cancelled")
+
+    def __init__(self, owner, job, callback, priority):
+        self.owner = owner
+        self.job = job
+        self.callback = callback
+        self.priority = priority
+        self.cancelled = False
+
+
+class CoverLoader:
+    """
+    Carga de portadas fuera del hilo de Tk.
+
+    request() encola un trabajo (decodificar una portada) para un dueño, por
+    ejemplo una tarjeta; cada dueño tiene como mucho un trabajo vivo, así que
+    re-enlazar o liberar la tarjeta cancela el anterior. Los trabajos visibles
+    salen antes que los de prefetch. Los resultados vuelven al hilo de Tk por
+    lotes acotados en cantidad y tiempo, o como tareas de un TaskScheduler
+    (ui/task_scheduler.py) si se le pasa uno.
+    """
+
+    PRIORITY_VISIBLE = 0
+    PRIORITY_PREFETCH = 1
+
+    def __init__(self, widget, workers=2, batch_size=12, batch_budget_ms=8,
+                 frame_ms=16, on_idle=None, scheduler=None):
+        self.widget = widget
+        self.frame_ms = frame_ms
+        self.workers = workers
+        self.batch_size = batch_size
+        self.batch_budget_ms = batch_budget_ms
+        self.on_idle = on_idle
+        self.scheduler = scheduler
+
+        self._queue = queue.PriorityQueue()
+        self._seq = itertools.count()
+        self._results = collections.deque()
+        self._tickets = {}              # dueño -> ticket vivo
+        self._lock = threading.Lock()
+        self._drain_scheduled = False
+        self._threads = []
+        self._pending = 0               # trabajos encolados o en curso
+
+    # ----------------------------
+    # API (hilo de Tk)
+    # ----------------------------
+    def request(self, owner, job, callback, priority=PRIORITY_VISIBLE):
+        """
+        job() se ejecuta en un hilo de fondo y su resultado se pasa a
+        callback(resultado) en el hilo de Tk, salvo que se cancele antes.
+        """
+        self.cancel(owner)
+        ticket = _Ticket(owner, job, callback, priority)
+        with self._lock:
+            self._tickets[owner] = ticket
+            self._pending += 1
+        self._ensure_workers()
+        self._queue.put((priority, next(self._seq), ticket))
+        return ticket
+
+    def cancel(self, owner):
+        """Cancela el trabajo vivo de owner. Devuelve True si había uno."""
+        with self._lock:
+            ticket = self._tickets.pop(owner, None)
+        if ticket is not None:
+            ticket.cancelled = True
+            return True
+        return False
+
+    def cancel_all(self):
+        """Cancela todo lo pendiente. Devuelve los dueños afectados."""
+        with self._lock:
+            tickets = list(self._tickets.values())
+            self._tickets.clear()
+        for t in tickets:
+            t.cancelled = True
+        return [t.owner for t in tickets]
+
+    def pending(self):
+        return self._pending
+
+    # ----------------------------
+    # Hilos de fondo
+    # ----------------------------
+    def _ensure_workers(self):
+        if self._threads:
+            return
+        for _ in range(self.workers):
+            t = threading.Thread(target=self._work, daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def _work(self):
+        while True:
+            _prio, _seq, ticket = self._queue.get()
+            result = None
+            if not ticket.cancelled:
+                try:
+                    result = ticket.job()
+                except Exception as e:
+                    print("Error cargando portada:", e)
+            self._results.append((ticket, result))
+            self._schedule_drain()
+
+    def _schedule_drain(self):
+        with self._lock:
+            if self._drain_scheduled:
+                return
+            self._drain_scheduled = True
+        try:
+            self.widget.after(0, self._drain)
+        except RuntimeError:
+            pass
+
+    # ----------------------------
+    # Entrega por lotes (hilo de Tk)
+    # ----------------------------
+    def _drain(self):
+        with self._lock:
+            self._drain_scheduled = False
+        if self.scheduler is not None:
+            # el planificador reparte los cambios de imagen entre frames
+            s = self.scheduler
+            while self._results:
+                ticket, result = self._results.popleft()
+                priority = s.PRIORITY_VISIBLE if ticket.priority == self.PRIORITY_VISIBLE else s.PRIORITY_PREFETCH
+                s.submit(self._deliver, ticket, result, priority=priority)
+            return
+        deadline = time.perf_counter() + self.batch_budget_ms / 1000
+        done = 0
+        while self._results and done < self.batch_size and time.perf_counter() < deadline:
+            ticket, result = self._results.popleft()
+            self._deliver(ticket, result, check_idle=False)
+            done += 1
+
+        if self._results:
+            # lo que no cupo en este lote sale en el siguiente frame
+            with self._lock:
+                if self._drain_scheduled:
+                    return
+                self._drain_scheduled = True
+            self.widget.after(self.frame_ms, self._drain)
+        elif self._pending == 0 and self.on_idle:
+            self.on_idle()
+
+    def _deliver(self, ticket, result, check_idle=True):
+        with self._lock:
+            self._pending -= 1
+            if self._tickets.get(ticket.owner) is ticket:
+                del self._tickets[ticket.owner]
+        if not ticket.cancelled and result is not None:
+            try:
+                ticket.callback(result)
+            except Exception as e:
+                print("Error aplicando portada:", e)
+        if check_idle and self._pending == 0 and not self._results and self.on_idle:
+            self.on_idle()
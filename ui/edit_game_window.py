@@ -35,4 +35,4 @@ class EditGameWindow(ctk.CTkToplevel):
         insert_or_update_game(self.game)  # asume que la función existe
         self.destroy()
         # Refrescar vista principal
-        self.master.refresh_games()
\ No newline at end of file
+        self.master.refresh.mark_catalog()
\ No newline at end of file
@@ -1,201 +1,100 @@
 # ui/game_card.py
 import customtkinter as ctk
-from PIL import Image, ImageOps
-import os
-import subprocess
-from core.cover_manager import get_best_cover, set_custom_cover
-from tkinter import filedialog, messagebox
 
-# Intento de soporte para resolver .lnk usando pywin32 si está instalado
-_HAS_PYWIN32 = False
-try:
-    from win32com.client import Dispatch  # type: ignore
-    _HAS_PYWIN32 = True
-except Exception:
-    _HAS_PYWIN32 = False
 
-
-def _resolve_lnk(lnk_path: str):
-    """
-    Intenta resolver .lnk a su target usando pywin32.
-    Devuelve ruta al target o None si no puede resolver.
-    """
-    if not _HAS_PYWIN32:
-        return None
-    try:
-        shell = Dispatch("WScript.Shell")
-        shortcut = shell.CreateShortcut(lnk_path)
-        target = shortcut.Targetpath
-        if target and os.path.exists(target):
-            return os.path.abspath(target)
-    except Exception:
-        return None
-    return None
-
-
-def _run_as_admin(path: str, cwd: str = None):
-    """
-    Intenta ejecutar el archivo como administrador usando ShellExecuteW.
-    Devuelve True si el intento devuelve código > 32 (éxito), False en otro caso.
+class GameCard(ctk.CTkFrame):
     """
-    try:
-        import ctypes
-        params = None
-        # ShellExecuteW devuelve >32 si éxito
-        res = ctypes.windll.shell32.ShellExecuteW(None, "runas", path, params, cwd or os.path.dirname(path), 1)
-        return int(res) > 32
-    except Exception:
-        return False
-
+    Tarjeta de un juego para la vista de rejilla y la de lista.
 
-def _launch_process(exe_path: str, cwd: str):
+    Los widgets hijos se crean una sola vez; set_mode() sólo los recoloca, así
+    la misma tarjeta sirve en las dos vistas y se recicla al cambiar de una a
+    otra. set_text() cambia los textos y set_cover() sustituye únicamente la
+    imagen. Los clics se avisan con on_action(game, "play" | "cover"), igual
+    que las tarjetas dibujadas en canvas (ui/canvas_grid.py).
     """
-    Intenta iniciar el ejecutable de forma robusta:
-    - si es .lnk: usa os.startfile (o intentará resolver)
-    - intenta subprocess.Popen(cwd=...)
-    - si falla, intenta _run_as_admin
-    Lanza excepciones si todo falla.
-    """
-    # Si es shortcut .lnk y no pudimos resolver antes, abrir con os.startfile
-    if exe_path.lower().endswith(".lnk"):
-        try:
-            os.startfile(exe_path)
-            return
-        except Exception as e:
-            raise RuntimeError(f"Intento con os.startfile falló: {e}")
-
-    # Si no es lnk: intentar lanzar con subprocess
-    try:
-        # subprocess.Popen con lista es más seguro
-        subprocess.Popen([exe_path], cwd=cwd)
-        return
-    except Exception as e_sub:
-        # intentar con shell True (algunos launchers requieren esto)
-        try:
-            subprocess.Popen(exe_path, cwd=cwd, shell=True)
-            return
-        except Exception:
-            # intentar elevar a admin
-            ok = _run_as_admin(exe_path, cwd=cwd)
-            if ok:
-                return
-            # si todo falla, propagar el error original
-            raise RuntimeError(f"Fallo al lanzar con subprocess: {e_sub}")
-
-
-class GameCard(ctk.CTkFrame):
-    def __init__(self, master, game, cover_size=(180, 240), *args, **kwargs):
-        """
-        game: dict con keys 'nombre','ruta' (y opcional 'folder' -> carpeta del exe)
-        """
-        super().__init__(master, corner_radius=8, *args, **kwargs)
-        self.game = game
-        self.cover_size = cover_size
-
-        # container
-        self.grid_propagate(False)
-
-        # cover image
-        self.cover_path = None
-        self._load_cover_image()
-
-        # label nombre
-        name_lbl = ctk.CTkLabel(self, text=self.game.get("nombre", "Sin nombre"), anchor="w")
-        name_lbl.pack(side="top", fill="x", padx=6, pady=(8, 4))
-
-        # buttons frame
-        btn_frame = ctk.CTkFrame(self, fg_color="transparent")
-        btn_frame.pack(side="bottom", fill="x", padx=6, pady=8)
-
-        play_btn = ctk.CTkButton(btn_frame, text="Jugar", command=self._play)
-        play_btn.pack(side="left", expand=True, fill="x", padx=(0, 4))
-
-        cover_btn = ctk.CTkButton(btn_frame, text="Cambiar portada", command=self._change_cover)
-        cover_btn.pack(side="left", expand=True, fill="x", padx=(4, 0))
-
-    def _load_cover_image(self):
-        # consigue la mejor portada y la muestra
-        folder = self.game.get("folder") or os.path.dirname(self.game.get("ruta", ""))
-        self.cover_path = get_best_cover(self.game.get("nombre", ""), folder)
-        try:
-            img = Image.open(self.cover_path).convert("RGBA")
-            img = ImageOps.contain(img, self.cover_size)
-        except Exception:
-            from PIL import Image
-            img = Image.new("RGBA", self.cover_size, (30, 30, 30, 255))
-        self.ctk_image = ctk.CTkImage(img, size=self.cover_size)
-        # imagen arriba
-        img_label = ctk.CTkLabel(self, image=self.ctk_image, text="")
-        img_label.pack(side="top", pady=(6, 4))
-
-    def refresh_cover(self):
-        # recarga la imagen (si cambió)
-        for w in self.winfo_children():
-            w.destroy()
-        self._load_cover_image()
-        # re-add name and buttons
-        name_lbl = ctk.CTkLabel(self, text=self.game.get("nombre", "Sin nombre"), anchor="w")
-        name_lbl.pack(side="top", fill="x", padx=6, pady=(8, 4))
-        btn_frame = ctk.CTkFrame(self, fg_color="transparent")
-        btn_frame.pack(side="bottom", fill="x", padx=6, pady=8)
-        play_btn = ctk.CTkButton(btn_frame, text="Jugar", command=self._play)
-        play_btn.pack(side="left", expand=True, fill="x", padx=(0, 4))
-        cover_btn = ctk.CTkButton(btn_frame, text="Cambiar portada", command=self._change_cover)
-        cover_btn.pack(side="left", expand=True, fill="x", padx=(4, 0))
-
-    def _play(self):
-        ruta = self.game.get("ruta")
-        resolved = self.game.get("resolved_path")  # si el scanner devolvió resolved_path, lo preferimos
-
-        # Determinar ruta final a lanzar y cwd
-        exe_to_launch = None
-        cwd = None
-
-        try:
-            # Priorizar resolved_path si existe y es un exe
-            if resolved and os.path.isfile(resolved) and resolved.lower().endswith(".exe"):
-                exe_to_launch = resolved
-                cwd = os.path.dirname(resolved)
-            else:
-                # si la ruta original es .lnk, intentar resolver dinámicamente
-                if ruta and ruta.lower().endswith(".lnk"):
-                    dynamic = _resolve_lnk(ruta)
-                    if dynamic and os.path.isfile(dynamic) and dynamic.lower().endswith(".exe"):
-                        exe_to_launch = dynamic
-                        cwd = os.path.dirname(dynamic)
-                    else:
-                        # no se pudo resolver: abrimos directamente el .lnk con os.startfile
-                        exe_to_launch = ruta
-                        cwd = os.path.dirname(ruta)
-                else:
-                    # ruta usual (.exe)
-                    exe_to_launch = ruta
-                    cwd = os.path.dirname(ruta)
-        except Exception as e:
-            messagebox.showerror("Error", f"No se pudo preparar la ejecución:\n{e}")
-            return
-
-        if not exe_to_launch or not os.path.exists(exe_to_launch):
-            messagebox.showerror("Error", f"Archivo no encontrado:\n{exe_to_launch}")
-            return
-
-        # Intentar lanzar
-        try:
-            _launch_process(exe_to_launch, cwd)
-        except Exception as e:
-            # mostrar mensaje con detalle
-            messagebox.showerror("Error al abrir", f"No se pudo abrir el juego.\n{e}")
-            return
 
-    def _change_cover(self):
-        # abrir file dialog para seleccionar imagen
-        f = filedialog.askopenfilename(title="Selecciona una imagen para la portada",
-                                       filetypes=[("Imágenes", "*.png *.jpg *.jpeg *.bmp")])
-        if not f:
+    GRID_SIZE = (220, 340)
+    LIST_HEIGHT = 60
+    FOCUS_COLOR = "#00ff88"
+
+    def __init__(self, master, on_action=None, mode="grid", **kwargs):
+        super().__init__(master, border_color=self.FOCUS_COLOR, **kwargs)
+        self.on_action = on_action
+        self.mode = None
+        self.game = None
+        self.cover_token = None
+        self._image = None
+
+        self.pack_propagate(False)
+        self.cover_label = ctk.CTkLabel(self, text="")
+        self.name_label = ctk.CTkLabel(self, text="")
+        self.playtime_label = ctk.CTkLabel(self, text="")
+        self.last_label = ctk.CTkLabel(self, text="")
+        self.spacer = ctk.CTkFrame(self, fg_color="transparent", height=1)
+
+        self.btn_frame = ctk.CTkFrame(self, fg_color="transparent")
+        self.play_btn = ctk.CTkButton(self.btn_frame, text="Jugar", command=lambda: self._action("play"))
+        self.cover_btn = ctk.CTkButton(self.btn_frame, text="Portada", command=lambda: self._action("cover"))
+
+        self.set_mode(mode)
+
+    def _action(self, action):
+        if self.game is not None and self.on_action:
+            self.on_action(self.game, action)
+
+    # ----------------------------
+    # Presentación
+    # ----------------------------
+    def set_mode(self, mode):
+        """Recoloca los hijos para "grid" o "list" sin recrearlos."""
+        if mode == self.mode:
             return
-        try:
-            newpath = set_custom_cover(self.game.get("nombre", ""), f)
-            self.cover_path = newpath
-            self.refresh_cover()
-        except Exception as e:
-            messagebox.showerror("Error", f"No se pudo establecer la portada:\n{e}")
\ No newline at end of file
+        self.mode = mode
+        for w in (self.cover_label, self.name_label, self.playtime_label,
+                  self.last_label, self.spacer, self.btn_frame, self.play_btn, self.cover_btn):
+            w.pack_forget()
+
+        if mode == "grid":
+            w, h = self.GRID_SIZE
+            self.configure(width=w, height=h, corner_radius=8)
+            self.cover_label.pack(pady=(12, 8))
+            self.name_label.configure(wraplength=200, font=("Arial", 12))
+            self.name_label.pack()
+            self.btn_frame.pack(side="bottom", fill="x", pady=(8, 12), padx=6)
+            self.play_btn.configure(width=140)
+            self.play_btn.pack(side="left", expand=True, fill="x", padx=(0, 4))
+            self.cover_btn.pack(side="left", expand=True, fill="x", padx=(4, 0))
+        else:
+            self.configure(height=self.LIST_HEIGHT, corner_radius=0)
+            self.cover_label.pack(side="left", padx=10, pady=5)
+            self.name_label.configure(wraplength=0, font=("Arial", 15, "bold"))
+            self.name_label.pack(side="left", padx=20)
+            self.playtime_label.pack(side="left", padx=20)
+            self.last_label.pack(side="left", padx=20)
+            self.spacer.pack(side="left", expand=True, fill="x")
+            self.btn_frame.pack(side="right", padx=10, pady=5)
+            self.play_btn.configure(width=100)
+            self.play_btn.pack(side="right")
+
+    # ----------------------------
+    # Contenido
+    # ----------------------------
+    def set_text(self, name, *details):
+        self.name_label.configure(text=name)
+        for label, text in zip((self.playtime_label, self.last_label), details):
+            label.configure(text=text)
+
+    def set_fill(self, color):
+        self.configure(fg_color=color)
+
+    def set_focused(self, focused):
+        """Marco de foco para la navegación con mando."""
+        self.configure(border_width=3 if focused else 0)
+
+    def set_cover(self, img, size):
+        """Cambia sólo la imagen: la etiqueta y su CTkImage se reutilizan."""
+        if self._image is None:
+            self._image = ctk.CTkImage(img, size=size)
+            self.cover_label.configure(image=self._image)
+        else:
+            self._image.configure(light_image=img, size=size)
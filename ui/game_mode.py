@@ -0,0 +1,89 @@
+# ui/game_mode.py
+from core.resource_usage import UsageMeter, release_memory, fmt_mb
+from core.settings import get_setting
+
+
+class GameMode:
+    """
+    Modo de bajo consumo mientras hay un juego en marcha.
+
+    Al entrar: cancela las portadas pendientes, pausa descargas y trabajo de
+    fondo (atlas, paletas), el planificador de tareas y el de refrescos, deja
+    de escuchar los mandos (navegación y testers abiertos, con su muestreo
+    de alta frecuencia, así el hilo del servicio termina), suelta las tarjetas
+    libres del pool y el mmap del atlas, devuelve memoria al sistema y,
+    opcionalmente, minimiza la ventana. Al salir el último juego se
+    restablece todo y se retoma lo que quedó pendiente.
+    Cada transición imprime RSS y % de CPU del launcher.
+    """
+
+    def __init__(self, window, minimize=None, keep_cards=None):
+        self.window = window
+        self.minimize = get_setting("game_mode_minimize", False) if minimize is None else minimize
+        self.keep_cards = get_setting("game_mode_keep_cards", 0) if keep_cards is None else keep_cards
+        self.active = False
+        self.meter = UsageMeter()
+        self._was_iconic = False
+        self._nav_paused = False
+        self._testers = []
+
+    def update(self, running):
+        """Llamar en el hilo de Tk con el número de juegos en marcha."""
+        if running and not self.active:
+            self.enter()
+        elif not running and self.active:
+            self.exit()
+
+    def enter(self):
+        w = self.window
+        before = self.meter.sample()
+        self.active = True
+        w.background_paused = True
+        for owner in w.covers.cancel_all():
+            owner.cover_token = None     # se vuelve a pedir al salir
+        w.tasks.pause()
+        w.refresh.pause()
+        self._nav_paused = w.navigator is not None and w.navigator.pause()
+        self._testers = w.controller_windows()
+        for tester in self._testers:
+            tester.pause()
+        trimmed = w.games_view.trim_pool(self.keep_cards)
+        if w.atlas:
+            w.atlas.close()
+        if self.minimize:
+            self._was_iconic = w.state() == "iconic"
+            w.iconify()
+        release_memory()
+        after = self.meter.sample()
+        print(
+            f"Modo juego: RSS {fmt_mb(before['rss'])} -> {fmt_mb(after['rss'])}, "
+            f"CPU antes {before['cpu_percent']:.2f}% ({trimmed} tarjetas liberadas)"
+        )
+
+    def exit(self):
+        w = self.window
+        during = self.meter.sample()
+        self.active = False
+        w.background_paused = False
+        if w.atlas:
+            try:
+                w.atlas.reopen()
+            except Exception as e:
+                print("Atlas de portadas no disponible:", e)
+                w.atlas = None
+        w.tasks.resume()
+        w.refresh.resume()
+        if self._nav_paused:
+            w.navigator.start()
+        for tester in self._testers:
+            if tester.winfo_exists():
+                tester.resume()
+        self._testers = []
+        w.games_view.rebind_visible()
+        if self.minimize and not self._was_iconic:
+            w.deiconify()
+        w.resume_background()
+        print(
+            f"Modo juego terminado: RSS {fmt_mb(during['rss'])}, "
+            f"CPU durante el juego {during['cpu_percent']:.2f}% en {during['seconds'] / 60:.1f} min"
+        )
@@ -4,12 +4,22 @@ import threading
 import time
 import tkinter as tk
 
-# intentamos importar vlc
-try:
-    import vlc
-    _HAS_VLC = True
-except Exception:
-    _HAS_VLC = False
+# vlc se importa al crear la intro y sólo si existe el video (tarda en cargar)
+vlc = None
+_HAS_VLC = None
+
+
+def _load_vlc():
+    global vlc, _HAS_VLC
+    if _HAS_VLC is None:
+        try:
+            import vlc as _vlc
+            vlc = _vlc
+            _HAS_VLC = True
+        except Exception:
+            _HAS_VLC = False
+    return _HAS_VLC
+
 
 class IntroWindow(tk.Tk):
     """
@@ -41,7 +51,7 @@ class IntroWindow(tk.Tk):
         tk.Button(ctrl, text=("Silenciar" if not self.mute else "Activar sonido"), command=self._toggle_mute).pack(side="right", padx=8, pady=6)
 
         # Si no hay vlc o no existe el archivo -> fallback y cerrar rápido
-        if (not _HAS_VLC) or (not os.path.isfile(self.video_path)):
+        if (not os.path.isfile(self.video_path)) or (not _load_vlc()):
             print("Intro: VLC no disponible o video no encontrado, saltando intro.")
             self.after(self.timeout_fallback, self._finish_and_close)
             return
@@ -1,37 +1,124 @@
 # ui/main_window.py
 import os
-import subprocess
+import sys
 import threading
-import time
 from datetime import datetime
 import customtkinter as ctk
-from PIL import Image, ImageOps
+from PIL import Image
 from tkinter import filedialog, messagebox
 
 from core.database import (
     init_db, get_all_games, insert_or_update_game,
-    update_playtime, update_cover_path
+    update_cover_path, update_palettes, update_sizes
 )
-from core.scanner import buscar_juegos
-from core.cover_manager import get_best_cover, search_cover_online
+from core.scanner import buscar_juegos, folder_size
+from core.cover_manager import search_cover_online
+from core.cover_atlas import CoverAtlas
+from core import cover_palette
+from core.catalog import merge_games, game_key, render_signature, CatalogIndex
 from core import launcher as core_launcher
-from ui.controller_window import ControllerWindow
+from core import session_journal
+from core import launch_metrics
+from core import startup
+from ui.virtual_grid import VirtualGrid
+from ui.canvas_grid import CanvasGrid, CanvasCard
+from ui.game_card import GameCard
+from core.settings import get_setting, set_setting
+from ui.refresh_scheduler import RefreshScheduler
+from ui.cover_loader import CoverLoader, cover_token, default_cover_path, read_cover, resolve_cover_path
+from ui.task_scheduler import TaskScheduler
+from ui.game_mode import GameMode
 
 ctk.set_appearance_mode("dark")
 ctk.set_default_color_theme("dark-blue")
 
+SORT_LABELS = {
+    "nombre": "Nombre",
+    "playtime": "Tiempo jugado",
+    "last_played": "Jugado recientemente",
+    "added_at": "Añadido recientemente",
+    "size": "Tamaño en disco",
+}
+FILTER_LABELS = {
+    "all": "Todos",
+    "installed": "Instalados",
+    "missing": "No encontrados",
+    "with_cover": "Con portada",
+    "no_cover": "Sin portada",
+    "shortcut": "Accesos directos",
+    "exe": "Ejecutables",
+}
+
+
+def _key_for(labels, label):
+    return next(k for k, v in labels.items() if v == label)
+
 
 class MainWindow(ctk.CTk):
-    def __init__(self):
+    def __init__(self, preload=None):
+        """preload: ui.preload.Preload ya terminado (BD, catálogo y primeras portadas)."""
         super().__init__()
         self.title("GAME LAUNCHER")
         self.geometry("1180x720")
 
-        # Inicializar base de datos y cargar juegos
-        init_db()
-        self.juegos = get_all_games()
-        self.image_refs = []       # referencias a CTkImage para evitar GC
+        # Inicializar base de datos y cargar juegos (o tomarlos de la precarga)
+        if preload is None:
+            with startup.phase("bd"):
+                init_db()
+            with startup.phase("catálogo"):
+                self.juegos = get_all_games()
+                # Órdenes y filtros precalculados; cambiar de uno a otro no reordena nada
+                self.catalog = CatalogIndex(self.juegos)
+        else:
+            self.juegos = preload.games
+            self.catalog = preload.catalog
         self.view_mode = "grid"    # "grid" o "list"
+        self.sort_mode = get_setting("sort_mode", "nombre")
+        self.filter_mode = "all"
+        self.group_by_library = False
+        self.visible_games = []
+        # "widgets": tarjetas CTk; "canvas": todo dibujado en un único canvas
+        self.render_backend = get_setting("render_backend", "widgets")
+
+        # Atlas de miniaturas mapeado en memoria (fallback: archivo por archivo)
+        if preload is not None:
+            self.atlas = preload.atlas
+        else:
+            self.atlas = CoverAtlas()
+            try:
+                self.atlas.open()
+            except Exception as e:
+                print("Atlas de portadas no disponible:", e)
+                self.atlas = None
+        self._atlas_misses = {}    # size -> set de rutas a añadir al atlas
+        self._palette_pending = {} # ruta -> portada sin colores precalculados
+        self._fetching = set()     # rutas con búsqueda online en curso
+        self._pending_lock = threading.Lock()
+        self.background_paused = False   # modo juego: sin descargas ni trabajo de fondo
+        self._deferred_fetch = []
+        # portadas ya decodificadas durante la intro: se usan una vez, sin placeholder
+        self._preloaded = preload.covers if preload is not None else {}
+
+        # Trabajo en el hilo de Tk troceado en rodajas de 8 ms por frame
+        self.tasks = TaskScheduler(self)
+
+        # Portadas: placeholder inmediato y decodificación en segundo plano
+        self.covers = CoverLoader(self, on_idle=self._after_covers_loaded, scheduler=self.tasks)
+
+        # Los refrescos (desde cualquier hilo) se fusionan: máx. un pase por frame
+        self.refresh = RefreshScheduler(self, self.reload_games, self.update_game, key=game_key)
+
+        # Un único supervisor vigila los juegos lanzados (BD y UI se suscriben)
+        supervisor = core_launcher.get_supervisor()
+        session_journal.install(supervisor)
+        launch_metrics.install(supervisor)
+        supervisor.subscribe("exit", self._record_session)
+        supervisor.subscribe("start", self._on_session_event)
+        supervisor.subscribe("exit", self._on_session_event)
+        # sesiones que quedaron abiertas en la ejecución anterior
+        if session_journal.recover(supervisor, self.juegos)[1]:
+            self.catalog.sync(self.juegos)
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
 
         # Top bar
         top = ctk.CTkFrame(self, height=60)
@@ -56,20 +143,59 @@ class MainWindow(ctk.CTk):
         self.btn_controllers = ctk.CTkButton(right, text="Controllers", command=self.open_controllers)
         self.btn_controllers.grid(row=0, column=3, padx=6)
 
+        self.nav_switch = ctk.CTkSwitch(right, text="Modo mando", command=self.toggle_controller_nav)
+        self.nav_switch.grid(row=0, column=4, padx=6)
+
         # Status area
         self.status_label = ctk.CTkLabel(top, text=f"Juegos: {len(self.juegos)}", anchor="w")
         self.status_label.pack(side="left", padx=12)
+        self.playing_label = ctk.CTkLabel(top, text="", anchor="w")
+        self.playing_label.pack(side="left", padx=12)
+
+        # Orden / filtro / agrupar por biblioteca
+        bar = ctk.CTkFrame(self, fg_color="transparent")
+        bar.pack(side="top", fill="x", padx=12, pady=(0, 8))
+
+        ctk.CTkLabel(bar, text="Ordenar:").pack(side="left", padx=(12, 4))
+        self.sort_menu = ctk.CTkOptionMenu(
+            bar, values=list(SORT_LABELS.values()), width=150,
+            command=lambda label: self.set_sort(_key_for(SORT_LABELS, label))
+        )
+        self.sort_menu.set(SORT_LABELS.get(self.sort_mode, SORT_LABELS["nombre"]))
+        self.sort_menu.pack(side="left", padx=4)
+
+        ctk.CTkLabel(bar, text="Mostrar:").pack(side="left", padx=(12, 4))
+        self.filter_menu = ctk.CTkOptionMenu(
+            bar, values=list(FILTER_LABELS.values()), width=150,
+            command=lambda label: self.set_filter(_key_for(FILTER_LABELS, label))
+        )
+        self.filter_menu.set(FILTER_LABELS["all"])
+        self.filter_menu.pack(side="left", padx=4)
 
-        # Scrollable area for games
-        self.scroll_area = ctk.CTkScrollableFrame(self, width=1140, height=600)
-        self.scroll_area.pack(padx=12, pady=(0,12), fill="both", expand=True)
+        self.group_switch = ctk.CTkSwitch(bar, text="Agrupar por biblioteca", command=self.toggle_group)
+        self.group_switch.pack(side="left", padx=12)
 
-        # container inside scrollable for grid/list layout
-        self.games_frame = ctk.CTkFrame(self.scroll_area, fg_color="transparent")
-        self.games_frame.pack(fill="both", expand=True, padx=8, pady=8)
+        # saltar a una biblioteca (sólo con la vista agrupada)
+        self.group_menu = ctk.CTkOptionMenu(bar, values=[""], width=220, command=self._jump_to_group)
+        self._group_starts = {}
+
+        # Área virtualizada: sólo existen widgets para las filas visibles
+        self.games_view = self._build_games_view()
+        self.games_view.pack(padx=12, pady=(0,12), fill="both", expand=True)
+
+        # Modo juego: el launcher reduce su consumo mientras hay un juego abierto
+        self.game_mode = GameMode(self)
+
+        # Navegación con mando (rejilla con foco); pygame se carga al activarla
+        self.navigator = None
+        if get_setting("controller_navigation", False):
+            self.nav_switch.select()
+            self.after_idle(self._start_navigator)
 
         # Dibujar vista inicial
-        self.refresh_games()
+        with startup.phase("primer dibujado"):
+            self.refresh_games()
+        self.after_idle(startup.report)
 
     # ----------------------------
     # Añadir juegos
@@ -84,11 +210,18 @@ class MainWindow(ctk.CTk):
             messagebox.showerror("Error", f"No se pudo escanear la carpeta:\n{e}")
             return
 
-        for game in nuevos:
-            insert_or_update_game(game)
-        self.juegos = get_all_games()
-        self.refresh_games()
-        messagebox.showinfo("Carpeta agregada", f"Se agregaron {len(nuevos)} juegos desde:\n{folder}")
+        def insert_all():
+            # un juego por paso: la ventana sigue respondiendo con carpetas grandes
+            for game in nuevos:
+                insert_or_update_game(game)
+                yield
+
+        def done():
+            self.refresh.mark_catalog()
+            self._measure_sizes(nuevos)
+            messagebox.showinfo("Carpeta agregada", f"Se agregaron {len(nuevos)} juegos desde:\n{folder}")
+
+        self.tasks.submit_steps(insert_all(), on_done=done)
 
     def add_single_game(self):
         file_path = filedialog.askopenfilename(
@@ -107,85 +240,262 @@ class MainWindow(ctk.CTk):
             "folder": os.path.dirname(file_path),
             "is_shortcut": False,
             "resolved_path": file_path,
+            "size_bytes": None,         # se mide en segundo plano
+            "library_root": os.path.dirname(os.path.dirname(file_path)),
             "playtime": 0,
             "last_played": None,
             "cover_path": None
         }
         insert_or_update_game(game)
-        self.juegos = get_all_games()
-        self.refresh_games()
+        self.refresh.mark_catalog()
+        self._measure_sizes([game])
         messagebox.showinfo("Juego agregado", f"Se agregó '{nombre}' a la biblioteca.")
 
+    def _measure_sizes(self, games):
+        """Tamaño en disco de los juegos que el escaneo no midió (accesos directos, juegos sueltos)."""
+        pending = [g for g in games if g.get("size_bytes") is None and g.get("resolved_path")]
+        if not pending:
+            return
+
+        def worker():
+            rows = [(g["ruta"], folder_size(os.path.dirname(g["resolved_path"]))) for g in pending]
+            try:
+                update_sizes(rows)
+            except Exception as e:
+                print("No se pudo guardar el tamaño de los juegos:", e)
+                return
+            self.refresh.mark_catalog()
+
+        threading.Thread(target=worker, daemon=True).start()
+
     # ----------------------------
     # Vista
     # ----------------------------
     def toggle_view(self):
         self.view_mode = "list" if self.view_mode == "grid" else "grid"
+        # las GameCard se recolocan para la otra vista en lugar de recrearse
+        self.games_view.set_layout(
+            **self._layout_for(self.view_mode),
+            keep_pool=self.render_backend != "canvas"
+        )
         self.refresh_games()
 
+    def _build_games_view(self):
+        view_kwargs = dict(key=game_key, signature=render_signature,
+                           release_card=self._release_card, scheduler=self.tasks)
+        if self.render_backend == "canvas":
+            return CanvasGrid(
+                self, on_action=self._on_card_action,
+                **view_kwargs, **self._layout_for(self.view_mode)
+            )
+        return VirtualGrid(self, **view_kwargs, **self._layout_for(self.view_mode))
+
+    def _layout_for(self, mode):
+        if self.render_backend == "canvas":
+            create_card = lambda grid: CanvasCard(grid, mode)
+        else:
+            create_card = self._create_card
+        if mode == "grid":
+            return dict(create_card=create_card, bind_card=self._bind_card,
+                        cell_width=256, cell_height=376, cols=None, pad=18)
+        return dict(create_card=create_card, bind_card=self._bind_card,
+                    move_card=self._move_list_row,
+                    cell_width=1140, cell_height=60, cols=1, stretch=True)
+
+    def set_sort(self, sort):
+        self.sort_mode = sort
+        set_setting("sort_mode", sort)
+        self.refresh_games()
+
+    def set_filter(self, filt):
+        self.filter_mode = filt
+        # "Instalados" / "No encontrados" se vuelven a comprobar al elegirlos
+        self.catalog.invalidate_disk()
+        self.refresh_games()
+
+    def toggle_group(self):
+        self.group_by_library = bool(self.group_switch.get())
+        self.refresh_games()
+
+    def _jump_to_group(self, label):
+        start = self._group_starts.get(label)
+        if start is not None:
+            self.games_view.scroll_to(start)
+
+    def reload_games(self):
+        """Relee la BD y aplica sólo las diferencias a la vista."""
+        self.juegos, _diff = merge_games(self.juegos, get_all_games())
+        self.catalog.sync(self.juegos)
+        self.refresh_games()
+
+    def update_game(self, game, force=False):
+        """Un juego cambió en memoria: actualizar sólo su tarjeta (o su posición)."""
+        if self.catalog.update(game):
+            # cambió de sitio en el orden / filtro actual
+            self.refresh_games()
+        self.games_view.refresh_item(game, force=force)
+
     def refresh_games(self):
-        # Limpiar widgets anteriores
-        for w in self.games_frame.winfo_children():
-            w.destroy()
-        self.image_refs.clear()
-
-        if not self.juegos:
-            ctk.CTkLabel(
-                self.games_frame,
-                text="No hay juegos. Usa 'Agregar carpeta' o 'Agregar Juego'"
-            ).pack(pady=30)
-            self.status_label.configure(text="Juegos: 0")
+        self.visible_games = self.catalog.view(self.sort_mode, self.filter_mode, self.group_by_library)
+        if self.filter_mode == "all":
+            empty = "No hay juegos. Usa 'Agregar carpeta' o 'Agregar Juego'"
+        else:
+            empty = "Ningún juego coincide con el filtro"
+        self.games_view.set_items(self.visible_games, empty_text=empty)
+        self._update_group_menu()
+        shown = len(self.visible_games)
+        total = len(self.juegos)
+        self.status_label.configure(
+            text=f"Juegos: {total}" if shown == total else f"Juegos: {shown} de {total}"
+        )
+
+    def _update_group_menu(self):
+        if not self.group_by_library:
+            self.group_menu.pack_forget()
             return
+        self._group_starts = {}
+        for root, start, count in self.catalog.groups(self.visible_games):
+            label = f"{os.path.basename(root) or root} ({count})"
+            self._group_starts[label] = start
+        labels = list(self._group_starts) or [""]
+        self.group_menu.configure(values=labels)
+        self.group_menu.set(labels[0])
+        self.group_menu.pack(side="left", padx=4)
+
+    def _after_covers_loaded(self):
+        # cuando la cola de portadas se vacía, guardar lo aprendido
+        if self.background_paused:
+            return
+        self._sync_atlas()
+        self._precompute_palettes()
 
-        if self.view_mode == "grid":
-            self._draw_grid()
-        else:
-            self._draw_list()
+    def resume_background(self):
+        """Retoma lo que el modo juego dejó pendiente."""
+        with self._pending_lock:
+            deferred, self._deferred_fetch = self._deferred_fetch, []
+        for game in deferred:
+            threading.Thread(target=self._fetch_cover_online, args=(game,), daemon=True).start()
+        self._after_covers_loaded()
+
+    # ----------------------------
+    # Atlas de portadas
+    # ----------------------------
+    def _sync_atlas(self):
+        """Añade al atlas, en segundo plano, las portadas que se cargaron del disco."""
+        with self._pending_lock:
+            if not self.atlas or not self._atlas_misses:
+                return
+            misses = self._atlas_misses
+            self._atlas_misses = {}
 
-        self.status_label.configure(text=f"Juegos: {len(self.juegos)}")
+        def worker():
+            for size, paths in misses.items():
+                try:
+                    self.atlas.update_many(paths, size)
+                except Exception as e:
+                    print("Error actualizando atlas de portadas:", e)
+
+        threading.Thread(target=worker, daemon=True).start()
 
     # ----------------------------
-    # Carga de imágenes (con soporte asíncrono)
+    # Colores dominantes y placeholders
     # ----------------------------
-    def get_default_cover_path(self):
-       default = os.path.join(os.path.dirname(os.path.dirname(__file__)), "assets", "default_cover.png")
-       if os.path.isfile(default):
-        return default
-       return None
+    def _precompute_palettes(self):
+        """Calcula en segundo plano los colores de las portadas nuevas o cambiadas."""
+        with self._pending_lock:
+            if not self._palette_pending:
+                return
+            pending = self._palette_pending
+            self._palette_pending = {}
+        by_ruta = {g["ruta"]: g for g in self.juegos}
 
-    def _create_ctk_image(self, cover_path, size):
-        try:
-            if cover_path and os.path.isfile(cover_path):
-               img = Image.open(cover_path).convert("RGBA")
-               img = ImageOps.contain(img, size)
-            else:
-                img = Image.new("RGBA", size, (30, 30, 30, 255))
-        except Exception:
-           img = Image.new("RGBA", size, (30, 30, 30, 255))
-        ctk_img = ctk.CTkImage(img, size=size)
-        self.image_refs.append(ctk_img)
-        return ctk_img
-
-    def load_game_image(self, game, size=(180, 240)):
-    # 1. Intentar cover_path de la BD
-        cover_path = game.get("cover_path")
-        if not cover_path or not os.path.isfile(cover_path):
-        # 2. Buscar localmente (sin descargar)
-           folder = game.get("folder") or os.path.dirname(game.get("ruta", ""))
-           cover_path = get_best_cover(game["nombre"], folder)
-        # Si sigue sin existir, usar default
-           if not cover_path or not os.path.isfile(cover_path):
-              cover_path = self.get_default_cover_path()
-
-    # Crear imagen con la portada actual
-        img = self._create_ctk_image(cover_path, size)
-
-    # Si la portada es la predeterminada, buscar online en segundo plano
-        if cover_path == self.get_default_cover_path():
-           threading.Thread(target=self._fetch_cover_online, args=(game,), daemon=True).start()
+        def worker():
+            try:
+                rows = cover_palette.precompute(pending)
+                if rows:
+                    update_palettes(rows)
+            except Exception as e:
+                print("Error precalculando colores de portadas:", e)
+                return
+            for ruta, dom, pal, ph, stamp in rows:
+                g = by_ruta.get(ruta)
+                if g is not None:
+                    g.update(dominant_color=dom, palette=pal, placeholder=ph, palette_stamp=stamp)
+                    self.refresh.mark_item(g)
+
+        threading.Thread(target=worker, daemon=True).start()
 
+    def _card_color(self, game, base="#2b2b2b"):
+        return cover_palette.tint_color(game.get("dominant_color"), base=base)
+
+    # ----------------------------
+    # Carga de imágenes (con soporte asíncrono)
+    # ----------------------------
+    def _placeholder(self, game, size):
+        img = cover_palette.placeholder_image(game, size) if game else None
+        if img is None:
+            img = Image.new("RGBA", size, (30, 30, 30, 255))
+        return img
+
+    def _decode_cover(self, game, size):
+        """Se ejecuta en un hilo del CoverLoader: nada de Tk aquí."""
+        cover_path = resolve_cover_path(game)
+        img, from_disk = read_cover(cover_path, size, self.atlas)
+        self._note_cover(game, size, cover_path, from_disk)
         return img
 
+    def _note_cover(self, game, size, cover_path, from_disk):
+        """Trabajo pendiente tras decodificar una portada (atlas, colores, búsqueda online)."""
+        # Programar el cálculo de colores si la portada es nueva o cambió
+        stale_palette = cover_path and game.get("palette_stamp") != cover_palette.cover_stamp(cover_path)
+
+        # Si la portada es la predeterminada, buscar online en segundo plano
+        fetch = False
+        with self._pending_lock:
+            if stale_palette:
+                self._palette_pending[game["ruta"]] = cover_path
+            if from_disk and self.atlas:
+                self._atlas_misses.setdefault(size, set()).add(cover_path)
+            if cover_path == default_cover_path() and game["ruta"] not in self._fetching:
+                self._fetching.add(game["ruta"])
+                if self.background_paused:
+                    self._deferred_fetch.append(game)     # modo juego: se lanza al salir
+                else:
+                    fetch = True
+        if fetch:
+            threading.Thread(target=self._fetch_cover_online, args=(game,), daemon=True).start()
+
+    def load_game_image(self, game, size, owner, visible=True):
+        """
+        Devuelve al instante un placeholder (PIL) y encola la portada real;
+        cuando esté decodificada se pasa a owner.set_cover(img, size) en el
+        hilo de Tk. Si la portada se precargó durante la intro, la devuelve
+        directamente.
+        Devuelve None si owner ya muestra (o está cargando) esa misma portada.
+        """
+        token = cover_token(game, size)
+        if getattr(owner, "cover_token", None) == token:
+            return None
+        owner.cover_token = token
+        preloaded = self._preloaded.pop(token, None)
+        if preloaded is not None:
+            img, cover_path, from_disk = preloaded
+            self._note_cover(game, size, cover_path, from_disk)
+            return img
+        priority = CoverLoader.PRIORITY_VISIBLE if visible else CoverLoader.PRIORITY_PREFETCH
+        self.covers.request(
+            owner,
+            lambda: self._decode_cover(game, size),
+            lambda img: owner.set_cover(img, size),
+            priority
+        )
+        return self._placeholder(game, size)
+
+    def _release_card(self, card):
+        # si la portada no llegó a cargarse, la próxima vez hay que pedirla
+        if self.covers.cancel(card):
+            card.cover_token = None
+
     def _fetch_cover_online(self, game):
         from core.cover_manager import search_cover_online
         new_path = search_cover_online(game["nombre"])
@@ -193,89 +503,48 @@ class MainWindow(ctk.CTk):
           from core.database import update_cover_path
           update_cover_path(game["ruta"], new_path)
           game["cover_path"] = new_path
-        # Refrescar la UI en el hilo principal
-          self.after(0, self.refresh_games)
+        # Refrescar sólo esa tarjeta (el scheduler lo lleva al hilo de Tk)
+          self.refresh.mark_item(game)
 
     # ----------------------------
     # Dibujado
     # ----------------------------
-    def _draw_grid(self):
-        cols = 4
-        row = 0
-        col = 0
-        padx = 18
-        pady = 18
-
-        for game in self.juegos:
-            frame = ctk.CTkFrame(self.games_frame, width=220, height=320, corner_radius=8)
-            frame.grid(row=row, column=col, padx=padx, pady=pady)
-            frame.grid_propagate(False)
-
-            cover = self.load_game_image(game, size=(180, 240))
-            cover_label = ctk.CTkLabel(frame, image=cover, text="")
-            cover_label.image = cover
-            cover_label.pack(pady=(12, 8))
-
-            name_lbl = ctk.CTkLabel(
-                frame, text=game.get("nombre", "Sin nombre"),
-                wraplength=200, font=("Arial", 12)
-            )
-            name_lbl.pack()
-
-            btn_frame = ctk.CTkFrame(frame, fg_color="transparent")
-            btn_frame.pack(side="bottom", fill="x", pady=(8, 12), padx=6)
-
-            play_btn = ctk.CTkButton(
-                btn_frame, text="Jugar",
-                command=lambda g=game: self.launch_game(g)
-            )
-            play_btn.pack(side="left", expand=True, fill="x", padx=(0, 4))
-
-            cover_btn = ctk.CTkButton(
-                btn_frame, text="Portada",
-                command=lambda g=game: self.change_cover_dialog(g)
-            )
-            cover_btn.pack(side="left", expand=True, fill="x", padx=(4, 0))
-
-            col += 1
-            if col >= cols:
-                col = 0
-                row += 1
-
-    def _draw_list(self):
-        for index, game in enumerate(self.juegos):
-            bg = "#2b2b2b" if index % 2 == 0 else "#242424"
-            row = ctk.CTkFrame(self.games_frame, fg_color=bg, corner_radius=0)
-            row.pack(fill="x")
-
-            cover = self.load_game_image(game, size=(80, 50))
-            img_label = ctk.CTkLabel(row, image=cover, text="")
-            img_label.image = cover
-            img_label.pack(side="left", padx=10, pady=5)
-
-            name_label = ctk.CTkLabel(
-                row, text=game.get("nombre", "Sin nombre"),
-                font=("Arial", 15, "bold")
-            )
-            name_label.pack(side="left", padx=20)
-
-            minutes = game.get("playtime", 0)
-            hours = round(minutes / 60, 1)
-            playtime_label = ctk.CTkLabel(row, text=f"{hours} h jugadas")
-            playtime_label.pack(side="left", padx=20)
-
-            last = game.get("last_played", "Nunca")
-            last_label = ctk.CTkLabel(row, text=f"Última vez: {last}")
-            last_label.pack(side="left", padx=20)
-
-            spacer = ctk.CTkFrame(row, fg_color="transparent")
-            spacer.pack(side="left", expand=True, fill="x")
-
-            play_btn = ctk.CTkButton(
-                row, text="Jugar", width=100,
-                command=lambda g=game: self.launch_game(g)
-            )
-            play_btn.pack(side="right", padx=10, pady=5)
+    def _create_card(self, parent):
+        return GameCard(parent, on_action=self._on_card_action, mode=self.view_mode)
+
+    def _list_details(self, game):
+        minutes = game.get("playtime", 0)
+        hours = round(minutes / 60, 1)
+        last = game.get("last_played") or "Nunca"
+        return f"{hours} h jugadas", f"Última vez: {last}"
+
+    def _move_list_row(self, row, index):
+        # el color de la fila alterna según su posición
+        bg = "#2b2b2b" if index % 2 == 0 else "#242424"
+        row.set_fill(self._card_color(row.game, bg))
+
+    def _bind_card(self, card, game, index):
+        """Enlaza una tarjeta (GameCard o CanvasCard) con un juego."""
+        card.game = game
+        if isinstance(card, GameCard):
+            card.set_mode(self.view_mode)
+        if card.mode == "grid":
+            size = (180, 240)
+            card.set_text(game.get("nombre", "Sin nombre"))
+            card.set_fill(self._card_color(game))
+        else:
+            size = (80, 50)
+            card.set_text(game.get("nombre", "Sin nombre"), *self._list_details(game))
+            self._move_list_row(card, index)
+        cover = self.load_game_image(game, size, card, self.games_view.is_on_screen(index))
+        if cover is not None:
+            card.set_cover(cover, size)
+
+    def _on_card_action(self, game, action):
+        if action == "play":
+            self.launch_game(game)
+        elif action == "cover":
+            self.change_cover_dialog(game)
 
     # ----------------------------
     # Cambiar portada manualmente
@@ -292,8 +561,10 @@ class MainWindow(ctk.CTk):
             newpath = set_custom_cover(game["nombre"], file)
             # Actualizar en BD
             update_cover_path(game["ruta"], newpath)
-            # Refrescar vista
-            self.refresh_games()
+            game["cover_path"] = newpath
+            game["cover_rev"] = game.get("cover_rev", 0) + 1
+            # Refrescar sólo esa tarjeta (el archivo puede tener la misma ruta)
+            self.refresh.mark_item(game, force=True)
             messagebox.showinfo("Portada guardada", f"Portada guardada en:\n{newpath}")
         except Exception as e:
             messagebox.showerror("Error", f"No se pudo guardar la portada:\n{e}")
@@ -302,54 +573,68 @@ class MainWindow(ctk.CTk):
     # Lanzar juego
     # ----------------------------
     def launch_game(self, game):
-        path_to_run = game.get("resolved_path") or game.get("ruta") or ""
-        if not path_to_run:
-            messagebox.showerror("Error", "Ruta de juego inválida.")
-            return
-
-        # Si es .exe, lanzar con subprocess y monitorizar tiempo
-        if path_to_run.lower().endswith(".exe") and os.path.isfile(path_to_run):
-            try:
-                cwd = game.get("folder") or os.path.dirname(path_to_run)
-                proc = subprocess.Popen([path_to_run], cwd=cwd)
-            except Exception as e:
-                messagebox.showerror("Error al abrir", f"No se pudo iniciar el juego:\n{e}")
-                return
+        try:
+            core_launcher.launch(game)
+        except FileNotFoundError as e:
+            messagebox.showerror("Error", f"No se encontró el juego:\n{e}")
+        except Exception as e:
+            messagebox.showerror("Error al abrir", f"No se pudo iniciar el juego:\n{e}")
+
+    def _record_session(self, session):
+        """Suscriptor de "exit" (hilo del supervisor); la BD la escribe session_journal."""
+        g = session.game
+        minutes = int(session.duration() / 60)
+        if minutes > 0:
+            g["playtime"] = g.get("playtime", 0) + minutes
+        g["last_played"] = datetime.fromtimestamp(session.ended_at).strftime("%d/%m/%Y %H:%M")
+        # Refrescar sólo la tarjeta de ese juego
+        self.refresh.mark_item(g)
+
+    def _on_session_event(self, session):
+        try:
+            self.after(0, self._update_playing)
+        except RuntimeError:
+            pass
 
-            def monitor_process(p, g):
-                start = time.time()
-                try:
-                    p.wait()
-                except Exception:
-                    pass
-                end = time.time()
-                minutes = int((end - start) / 60)
-                if minutes > 0:
-                    g["playtime"] = g.get("playtime", 0) + minutes
-                g["last_played"] = datetime.now().strftime("%d/%m/%Y %H:%M")
-                # Guardar en BD
-                update_playtime(g["ruta"], minutes, g["last_played"])
-                # Refrescar UI
-                self.after(0, self.refresh_games)
-
-            threading.Thread(target=monitor_process, args=(proc, game), daemon=True).start()
-            return
+    def _update_playing(self):
+        names = [s.game.get("nombre", "") for s in core_launcher.get_supervisor().sessions()]
+        self.playing_label.configure(text=f"Jugando: {', '.join(names)}" if names else "")
+        self.game_mode.update(len(names))
 
-        # Si no es .exe (por ejemplo .lnk), usar core_launcher
+    def _on_close(self):
+        # el supervisor es un hilo daemon: guardar las sesiones abiertas antes de salir
         try:
-            if hasattr(core_launcher, "launch_game"):
-                core_launcher.launch_game(game.get("ruta"), resolved_path=game.get("resolved_path"))
-                return
+            core_launcher.get_supervisor().checkpoint_now()
         except Exception as e:
-            messagebox.showerror("Error", f"No se pudo lanzar el juego (fallback):\n{e}")
-            return
-
-        messagebox.showerror("Error", "No se pudo ejecutar el juego. Ruta inválida o sin soporte.")
+            print("No se pudo guardar el checkpoint de sesiones:", e)
+        self.destroy()
 
     # ----------------------------
     # Ventana de mandos
     # ----------------------------
+    def toggle_controller_nav(self):
+        enabled = bool(self.nav_switch.get())
+        set_setting("controller_navigation", enabled)
+        if enabled:
+            self._start_navigator()
+        elif self.navigator is not None:
+            self.navigator.stop()
+
+    def _start_navigator(self):
+        if self.navigator is None:
+            from ui.controller_nav import ControllerNavigator
+            self.navigator = ControllerNavigator(self)
+        self.navigator.start()
+
+    def controller_windows(self):
+        """Testers de mandos abiertos (si nunca se abrió uno, ni se importa el módulo)."""
+        module = sys.modules.get("ui.controller_window")
+        if module is None:
+            return []
+        return [w for w in self.winfo_children() if isinstance(w, module.ControllerWindow)]
+
     def open_controllers(self):
+        from ui.controller_window import ControllerWindow     # importa pygame
         win = ControllerWindow(self)
         try:
             win.lift()
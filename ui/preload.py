@@ -0,0 +1,111 @@
+# ui/preload.py
+import importlib
+import threading
+
+from core import startup
+
+
+class Preload:
+    """
+    Trabajo de arranque de MainWindow hecho en segundo plano mientras se ve
+    la intro, en este orden: BD y catálogo con sus órdenes, atlas de
+    portadas, los módulos de la ventana principal (modules) y las portadas
+    de la primera pantalla (orden guardado, sin filtro), ya decodificadas.
+
+    take() se llama al terminar u omitir la intro. Sólo espera a la BD y al
+    catálogo, sin los que no hay ventana; el atlas se entrega si ya está
+    abierto (si no, esta sesión lee las portadas de sus archivos) y las
+    portadas que falten las carga el CoverLoader como siempre. La precarga
+    deja de decodificar portadas en cuanto se llama. Lo único que puede
+    seguir bloqueando es importar modules desde el hilo de Tk mientras este
+    hilo aún los importa: Python espera a que termine ese import.
+    """
+
+    FIRST_SCREEN = 24           # ~3 filas de 4-5 tarjetas en 1180x720, con margen
+
+    def __init__(self, modules=()):
+        self.modules = modules
+        self.games = None
+        self.catalog = None
+        self.atlas = None
+        self.covers = {}            # cover_token -> (imagen, ruta de la portada, leída del archivo)
+        self.error = None
+        self._catalog_ready = threading.Event()
+        self._atlas_ready = threading.Event()
+        self._stop = threading.Event()
+        self._lock = threading.Lock()       # entrega del atlas frente a take()
+        self._thread = threading.Thread(target=self._run, name="preload", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def take(self):
+        """Hilo de Tk. Devuelve self con games/catalog listos, o None si la precarga falló."""
+        with self._lock:
+            self._stop.set()
+        with startup.phase("espera a la precarga"):
+            self._catalog_ready.wait()
+        if self.error:
+            return None
+        if not self._atlas_ready.is_set():
+            print("Precarga: el atlas de portadas aún no está listo, se usarán los archivos")
+        return self
+
+    def _run(self):
+        # también las importaciones (sqlite3, PIL...) se hacen en este hilo:
+        # importar este módulo no debe retrasar la intro
+        try:
+            with startup.phase("módulos del catálogo"):
+                from core.database import init_db, get_all_games
+                from core.catalog import CatalogIndex
+                from core.cover_atlas import CoverAtlas, GRID_SIZE
+                from core.settings import get_setting
+                from ui.cover_loader import cover_token, read_cover, resolve_cover_path
+            with startup.phase("bd"):
+                init_db()
+            with startup.phase("catálogo"):
+                self.games = get_all_games()
+                self.catalog = CatalogIndex(self.games)
+        except Exception as e:
+            print("Precarga del catálogo fallida:", e)
+            self.error = e
+            return
+        finally:
+            self._catalog_ready.set()
+
+        with startup.phase("atlas de portadas"):
+            atlas = CoverAtlas()
+            try:
+                atlas.open()
+            except Exception as e:
+                print("Atlas de portadas no disponible:", e)
+                atlas = None
+            with self._lock:
+                # tarde: la ventana ya se creó sin él
+                if not self._stop.is_set():
+                    self.atlas = atlas
+                    self._atlas_ready.set()
+
+        with startup.phase("módulos de la ventana principal"):
+            for name in self.modules:
+                try:
+                    importlib.import_module(name)
+                except Exception as e:
+                    # se vuelve a importar (y a fallar) en el hilo de Tk, con el error real
+                    print(f"Precarga: no se pudo importar {name}:", e)
+
+        first = self.catalog.view(get_setting("sort_mode", "nombre"), "all", False)[:self.FIRST_SCREEN]
+        with startup.phase("portadas de la primera pantalla"):
+            for game in first:
+                if self._stop.is_set():
+                    break
+                try:
+                    cover_path = resolve_cover_path(game)
+                    img, from_disk = read_cover(cover_path, GRID_SIZE, self.atlas)
+                except Exception as e:
+                    print("Error cargando portada:", e)
+                    continue
+                if img is not None:
+                    self.covers[cover_token(game, GRID_SIZE)] = (img, cover_path, from_disk)
+        print(f"Precarga: {len(self.covers)} de {len(first)} portadas")
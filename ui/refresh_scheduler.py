@@ -0,0 +1,152 @@
+# ui/refresh_scheduler.py
+import threading
+import time
+
+
+class RefreshScheduler:
+    """
+    Junta las peticiones de refresco que llegan desde cualquier hilo y aplica
+    como mucho un pase de render por intervalo de frame.
+
+    - mark_catalog(): hay que releer el catálogo completo (BD -> vista)
+    - mark_item(game, force=False): sólo cambió ese juego
+
+    Las marcas repetidas antes del siguiente pase se fusionan; cada pase
+    respeta un presupuesto de tiempo y deja lo que sobre para el siguiente.
+    Con pause() (modo juego) las marcas se siguen fusionando pero no hay
+    pases hasta resume().
+    """
+
+    STORM_THRESHOLD = 50    # peticiones fusionadas en un pase que merecen aviso
+
+    def __init__(self, widget, apply_catalog, apply_item, key=id,
+                 interval_ms=16, budget_ms=8):
+        self.widget = widget
+        self.apply_catalog = apply_catalog
+        self.apply_item = apply_item
+        self.key = key
+        self.interval_ms = interval_ms
+        self.budget_ms = budget_ms
+
+        self._lock = threading.Lock()
+        self._catalog = False
+        self._items = {}            # clave -> (game, force)
+        self._scheduled = False
+        self._paused = False
+        self._last_pass = 0.0
+
+        # métricas
+        self.requests = 0           # marcas recibidas
+        self.merged = 0             # marcas absorbidas por un pase ya pendiente
+        self.passes = 0
+        self.last_pass_ms = 0.0
+        self.max_pass_ms = 0.0
+        self._merged_in_batch = 0
+
+    # ----------------------------
+    # Marcas (cualquier hilo)
+    # ----------------------------
+    def mark_catalog(self):
+        with self._lock:
+            self.requests += 1
+            if self._catalog:
+                self._count_merge()
+            self._catalog = True
+        self._request_pass()
+
+    def mark_item(self, game, force=False):
+        k = self.key(game)
+        with self._lock:
+            self.requests += 1
+            prev = self._items.get(k)
+            if prev is not None or self._catalog:
+                self._count_merge()
+            self._items[k] = (game, force or (prev is not None and prev[1]))
+        self._request_pass()
+
+    def _count_merge(self):
+        self.merged += 1
+        self._merged_in_batch += 1
+
+    def pause(self):
+        with self._lock:
+            self._paused = True
+
+    def resume(self):
+        with self._lock:
+            self._paused = False
+            pending = self._catalog or bool(self._items)
+        if pending:
+            self._request_pass()
+
+    def _request_pass(self):
+        with self._lock:
+            if self._scheduled or self._paused:
+                return
+            self._scheduled = True
+        try:
+            self.widget.after(0, self._schedule)
+        except RuntimeError:
+            # la ventana ya no existe (cierre de la app)
+            pass
+
+    # ----------------------------
+    # Pase de render (hilo de Tk)
+    # ----------------------------
+    def _schedule(self):
+        elapsed_ms = (time.perf_counter() - self._last_pass) * 1000
+        wait = int(self.interval_ms - elapsed_ms)
+        if wait > 0:
+            self.widget.after(wait, self._run)
+        else:
+            self._run()
+
+    def _run(self):
+        start = time.perf_counter()
+        deadline = start + self.budget_ms / 1000
+        with self._lock:
+            if self._paused:
+                # se pausó con el pase ya programado: las marcas esperan a resume()
+                self._scheduled = False
+                return
+            catalog = self._catalog
+            items = list(self._items.values())
+            merged = self._merged_in_batch
+            self._catalog = False
+            self._items = {}
+            self._merged_in_batch = 0
+            self._scheduled = False
+
+        if catalog:
+            self.apply_catalog()
+            # la reconciliación ya cubre los cambios normales; quedan los forzados
+            items = [(g, f) for g, f in items if f]
+
+        leftover = []
+        for i, (game, force) in enumerate(items):
+            if time.perf_counter() > deadline:
+                leftover = items[i:]
+                break
+            self.apply_item(game, force)
+
+        if leftover:
+            with self._lock:
+                for game, force in leftover:
+                    self._items.setdefault(self.key(game), (game, force))
+        self._last_pass = time.perf_counter()
+        self.passes += 1
+        self.last_pass_ms = (self._last_pass - start) * 1000
+        self.max_pass_ms = max(self.max_pass_ms, self.last_pass_ms)
+        if merged >= self.STORM_THRESHOLD:
+            print(f"Refresco: {merged} peticiones fusionadas en un pase")
+        if leftover:
+            self._request_pass()
+
+    def stats(self):
+        return {
+            "requests": self.requests,
+            "merged": self.merged,
+            "passes": self.passes,
+            "last_pass_ms": round(self.last_pass_ms, 2),
+            "max_pass_ms": round(self.max_pass_ms, 2),
+        }
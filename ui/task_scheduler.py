@@ -0,0 +1,221 @@
+# ui/task_scheduler.py
+import collections
+import threading
+import time
+
+
+class _Task:
+    __slots__ = ("fn", "args", "key", "queued_at", "steps", "on_done", "cancelled")
+
+    def __init__(self, fn, args, key, steps=None, on_done=None):
+        self.fn = fn
+        self.args = args
+        self.key = key
+        self.queued_at = time.perf_counter()
+        self.steps = steps          # iterador: cada next() es una unidad de trabajo
+        self.on_done = on_done
+        self.cancelled = False
+
+
+class TaskScheduler:
+    """
+    Planificador cooperativo para trabajo que tiene que correr en el hilo de Tk.
+
+    Las tareas se encolan por prioridad (entrada del usuario, tarjetas
+    visibles, prefetch, fondo) y se ejecutan en rodajas de como mucho
+    slice_ms por tick; entre tick y tick Tk procesa eventos y redibuja. Una
+    tarea que lleva esperando más de aging_ms sube un nivel por cada
+    aging_ms, así el prefetch no se queda sin turno si nunca dejan de llegar
+    tareas visibles.
+
+    submit() encola una llamada; submit_steps() un generador que se avanza
+    paso a paso (trabajo largo troceado). Con key, una tarea nueva sustituye
+    a la pendiente con la misma clave.
+    """
+
+    PRIORITY_INPUT = 0
+    PRIORITY_VISIBLE = 1
+    PRIORITY_PREFETCH = 2
+    PRIORITY_BACKGROUND = 3
+    LEVELS = 4
+
+    def __init__(self, widget, slice_ms=8, frame_ms=16, aging_ms=250):
+        self.widget = widget
+        self.slice_ms = slice_ms
+        self.frame_ms = frame_ms
+        self.aging_ms = aging_ms
+
+        self._queues = [collections.deque() for _ in range(self.LEVELS)]
+        self._keyed = {}                # clave -> tarea pendiente
+        self._lock = threading.Lock()
+        self._scheduled = False
+        self._paused = False
+        self._last_tick = None
+
+        # métricas
+        self.tasks_run = 0
+        self.ticks = 0
+        self.last_tick_ms = 0.0         # trabajo hecho en el último tick
+        self.max_tick_ms = 0.0
+        self.frame_ms_avg = 0.0         # tiempo entre ticks mientras hay trabajo
+        self.max_frame_ms = 0.0
+        self.max_wait_ms = 0.0          # espera más larga de una tarea en cola
+
+    # ----------------------------
+    # Encolar (cualquier hilo)
+    # ----------------------------
+    def submit(self, fn, *args, priority=PRIORITY_VISIBLE, key=None):
+        return self._push(_Task(fn, args, key), priority)
+
+    def submit_steps(self, steps, priority=PRIORITY_BACKGROUND, key=None, on_done=None):
+        """steps es un iterable; on_done() se llama al agotarlo."""
+        return self._push(_Task(None, (), key, iter(steps), on_done), priority)
+
+    def cancel(self, key):
+        with self._lock:
+            task = self._keyed.pop(key, None)
+        if task is not None:
+            task.cancelled = True
+            return True
+        return False
+
+    def _push(self, task, priority):
+        priority = min(max(priority, 0), self.LEVELS - 1)
+        with self._lock:
+            if task.key is not None:
+                old = self._keyed.get(task.key)
+                if old is not None:
+                    old.cancelled = True
+                self._keyed[task.key] = task
+            self._queues[priority].append(task)
+        self._request_tick()
+        return task
+
+    def pause(self):
+        """Deja de programar ticks; las tareas siguen en cola hasta resume()."""
+        self._paused = True
+
+    def resume(self):
+        self._paused = False
+        self._last_tick = None
+        if self.depth():
+            self._request_tick()
+
+    def _request_tick(self, delay=0):
+        with self._lock:
+            if self._scheduled or self._paused:
+                return
+            self._scheduled = True
+        try:
+            # after + after_idle: primero eventos pendientes, luego trabajo
+            self.widget.after(delay, lambda: self.widget.after_idle(self._tick))
+        except RuntimeError:
+            # la ventana ya no existe
+            pass
+
+    # ----------------------------
+    # Tick (hilo de Tk)
+    # ----------------------------
+    def _next(self, now):
+        """Saca la tarea con mejor prioridad efectiva (prioridad - envejecimiento)."""
+        with self._lock:
+            best = None
+            for level, q in enumerate(self._queues):
+                while q and q[0].cancelled:
+                    q.popleft()
+                if not q:
+                    continue
+                waited_ms = (now - q[0].queued_at) * 1000
+                effective = level - int(waited_ms // self.aging_ms)
+                if best is None or effective < best[0]:
+                    best = (effective, level)
+            if best is None:
+                return None
+            task = self._queues[best[1]].popleft()
+            if task.steps is None and task.key is not None:
+                self._keyed.pop(task.key, None)
+            self.max_wait_ms = max(self.max_wait_ms, (now - task.queued_at) * 1000)
+            return task, best[1]
+
+    def _tick(self):
+        start = time.perf_counter()
+        with self._lock:
+            self._scheduled = False
+        if self._paused:
+            return
+        if self._last_tick is not None:
+            frame = (start - self._last_tick) * 1000
+            self.frame_ms_avg = frame if not self.frame_ms_avg else self.frame_ms_avg * 0.9 + frame * 0.1
+            self.max_frame_ms = max(self.max_frame_ms, frame)
+        self.ticks += 1
+
+        deadline = start + self.slice_ms / 1000
+        now = start
+        while now < deadline:
+            picked = self._next(now)
+            if picked is None:
+                break
+            task, level = picked
+            self._run(task, level)
+            now = time.perf_counter()
+
+        self.last_tick_ms = (time.perf_counter() - start) * 1000
+        self.max_tick_ms = max(self.max_tick_ms, self.last_tick_ms)
+        if self.depth():
+            self._last_tick = start
+            self._request_tick(max(1, int(self.frame_ms - self.last_tick_ms)))
+        else:
+            self._last_tick = None
+
+    def _run(self, task, level):
+        self.tasks_run += 1
+        try:
+            if task.steps is None:
+                task.fn(*task.args)
+                return
+            next(task.steps)
+        except StopIteration:
+            self._finish(task)
+            return
+        except Exception as e:
+            print("Error en tarea:", e)
+            if task.steps is not None:
+                self._finish(task)
+            return
+        # un paso hecho: el resto vuelve a la cola en su nivel original
+        with self._lock:
+            if not task.cancelled:
+                task.queued_at = time.perf_counter()
+                self._queues[level].append(task)
+
+    def _finish(self, task):
+        with self._lock:
+            if task.key is not None and self._keyed.get(task.key) is task:
+                del self._keyed[task.key]
+        if task.on_done and not task.cancelled:
+            try:
+                task.on_done()
+            except Exception as e:
+                print("Error en tarea:", e)
+
+    # ----------------------------
+    # Métricas
+    # ----------------------------
+    def depth(self):
+        with self._lock:
+            return sum(1 for q in self._queues for t in q if not t.cancelled)
+
+    def stats(self):
+        with self._lock:
+            per_level = [sum(1 for t in q if not t.cancelled) for q in self._queues]
+        return {
+            "depth": sum(per_level),
+            "depth_by_priority": per_level,
+            "tasks_run": self.tasks_run,
+            "ticks": self.ticks,
+            "last_tick_ms": round(self.last_tick_ms, 2),
+            "max_tick_ms": round(self.max_tick_ms, 2),
+            "frame_ms_avg": round(self.frame_ms_avg, 2),
+            "max_frame_ms": round(self.max_frame_ms, 2),
+            "max_wait_ms": round(self.max_wait_ms, 2),
+        }
@@ -0,0 +1,457 @@
+# ui/virtual_grid.py
+import sys
+import tkinter as tk
+import customtkinter as ctk
+
+
+class VirtualGrid(ctk.CTkFrame):
+    """
+    Vista con scroll que sólo crea widgets para las filas visibles.
+
+    Mantiene un pool de tarjetas (visibles + unas filas de margen) y al hacer
+    scroll las re-asigna a otros juegos con bind_card(card, game, index).
+    La región de scroll se calcula con el total de elementos, no con los
+    widgets existentes.
+
+    - create_card(parent) -> widget nuevo (se crea sólo cuando el pool crece)
+    - bind_card(card, game, index) -> actualiza el widget para mostrar game
+    - move_card(card, index) -> opcional, la tarjeta cambió de posición
+    - release_card(card) -> opcional, la tarjeta salió de la vista o se destruye
+    - key(game) / signature(game) -> identidad y contenido visible; una
+      tarjeta sólo se vuelve a enlazar si su firma cambió
+
+    Con cols=None el número de columnas sale del ancho disponible; al
+    redimensionar la ventana (con debounce) las tarjetas existentes sólo se
+    recolocan, no se recrean.
+
+    Con scheduler (ui/task_scheduler.py) las celdas que necesitan tarjeta
+    nueva se rellenan como tareas: primero las que se ven, luego las filas de
+    margen, sin bloquear el bucle de Tk en un único render largo.
+
+    Foco (navegación con mando): set_focus()/move_focus() marcan un elemento
+    con card.set_focused(); al moverlo sólo cambian la tarjeta que lo pierde
+    y la que lo gana. El foco sigue al juego (por clave) si la lista cambia.
+    """
+
+    RESIZE_DEBOUNCE_MS = 120
+
+    def __init__(self, master, create_card, bind_card, cell_width, cell_height,
+                 cols=4, pad=0, buffer_rows=2, stretch=False, move_card=None,
+                 release_card=None, key=id, signature=None, on_render=None, scheduler=None,
+                 **kwargs):
+        super().__init__(master, **kwargs)
+        self.create_card = create_card
+        self.bind_card = bind_card
+        self.move_card = move_card
+        self.release_card = release_card
+        self.key = key
+        self.signature = signature
+        self.cell_width = cell_width
+        self.cell_height = cell_height
+        self.auto_cols = cols is None   # columnas según el ancho de la ventana
+        self.cols = cols or 1
+        self.pad = pad                  # margen de la tarjeta dentro de su celda
+        self.buffer_rows = buffer_rows
+        self.stretch = stretch          # True: la celda ocupa todo el ancho (lista)
+        self.on_render = on_render
+        self.scheduler = scheduler
+
+        self.items = []
+        self._free = []                 # tarjetas del pool sin asignar
+        self._visible = {}              # índice -> tarjeta
+        self._cards = []                # todas las tarjetas creadas (pool)
+        self._windows = {}              # tarjeta -> id de ventana en el canvas
+        self._bound = {}                # tarjeta -> (clave, firma, índice)
+        self.bind_count = 0             # enlaces hechos (para medir refrescos)
+        self._render_pending = False
+        self._layout_dirty = True       # recolocar todas las tarjetas en el próximo render
+        self._resize_job = None
+        self._width = None              # ancho con el que se calculó el layout
+        self._offset_x = 0              # margen para centrar la rejilla
+        self.focus_index = None
+        self._focus_key = None
+        self._focused_card = None       # la tarjeta que se dibuja con foco
+
+        bg = self.cget("fg_color")
+        if bg == "transparent":
+            bg = self._detect_color_of_master()
+        self.canvas = tk.Canvas(
+            self, highlightthickness=0, bd=0,
+            bg=self._apply_appearance_mode(bg),
+            yscrollincrement=40
+        )
+        self.scrollbar = ctk.CTkScrollbar(self, orientation="vertical", command=self._on_scrollbar)
+        self.canvas.configure(yscrollcommand=self.scrollbar.set)
+        self.scrollbar.pack(side="right", fill="y")
+        self.canvas.pack(side="left", fill="both", expand=True)
+
+        self.empty_label = ctk.CTkLabel(self, text="")
+
+        self.canvas.bind("<Configure>", self._on_configure)
+        if sys.platform.startswith("linux"):
+            self.bind_all("<Button-4>", self._on_mouse_wheel, add=True)
+            self.bind_all("<Button-5>", self._on_mouse_wheel, add=True)
+        else:
+            self.bind_all("<MouseWheel>", self._on_mouse_wheel, add=True)
+
+    # ----------------------------
+    # API
+    # ----------------------------
+    def set_layout(self, create_card, bind_card, cell_width, cell_height, cols,
+                   pad=0, stretch=False, move_card=None, keep_pool=False):
+        """
+        Cambia la disposición de las tarjetas. Con keep_pool=True las tarjetas
+        existentes vuelven al pool y se reutilizan con el nuevo bind_card
+        (tarjetas que saben presentarse de las dos formas); si no, se destruyen.
+        """
+        if keep_pool:
+            for card in list(self._visible.values()):
+                self._release(card)
+            self._visible.clear()
+        else:
+            for card in self._cards:
+                if self.release_card:
+                    self.release_card(card)
+                self._destroy_card(card)
+            self._focused_card = None
+            self._cards.clear()
+            self._visible.clear()
+            self._free.clear()
+            self._bound.clear()
+        self.create_card = create_card
+        self.bind_card = bind_card
+        self.move_card = move_card
+        self.cell_width = cell_width
+        self.cell_height = cell_height
+        self.auto_cols = cols is None
+        self.cols = cols or 1
+        self.pad = pad
+        self.stretch = stretch
+        self._width = None
+        self._layout_dirty = True
+        self.canvas.yview_moveto(0)
+        if self.canvas.winfo_width() > 1:
+            self._relayout(self.canvas.winfo_width())
+
+    def set_items(self, items, empty_text=""):
+        """
+        Reconcilia la vista con una lista nueva sin reconstruirla: las tarjetas
+        de juegos que siguen visibles se conservan (y se mueven sólo si cambió
+        su posición), se re-enlazan sólo las que cambiaron de contenido y las
+        demás se liberan o se toman del pool.
+        """
+        self.items = items
+        if self._focus_key is not None:
+            self.focus_index = next(
+                (i for i, item in enumerate(items) if self.key(item) == self._focus_key), None
+            )
+        if not items and empty_text:
+            self.empty_label.configure(text=empty_text)
+            self.empty_label.place(relx=0.5, y=30, anchor="n")
+        else:
+            self.empty_label.place_forget()
+        by_key = {}
+        for card in self._visible.values():
+            by_key[self._bound[card][0]] = card
+        self._visible = {}
+        self._update_scrollregion()
+        first, last = self.visible_range()
+        for index in range(first, last):
+            card = by_key.pop(self.key(items[index]), None)
+            if card is not None:
+                self._visible[index] = card
+        for card in by_key.values():
+            self._release(card)
+        self._render()
+
+    def refresh_item(self, item, force=False):
+        """Re-enlaza sólo la tarjeta visible de item (si su firma cambió)."""
+        k = self.key(item)
+        for index, card in self._visible.items():
+            if self._bound[card][0] == k:
+                if force or self._bound[card][1] != self._sig(item):
+                    self._bind(card, item, index)
+                return True
+        return False
+
+    def rebind_visible(self):
+        """Vuelve a enlazar todas las tarjetas visibles (p.ej. tras cancelar sus cargas)."""
+        for index, card in self._visible.items():
+            self._bind(card, self.items[index], index)
+
+    def trim_pool(self, keep=0):
+        """Destruye las tarjetas libres del pool (y sus imágenes) salvo keep."""
+        extra = self._free[keep:]
+        del self._free[keep:]
+        for card in extra:
+            self._cards.remove(card)
+            self._destroy_card(card)
+        return len(extra)
+
+    def scroll_to(self, index):
+        """Lleva la fila de index al borde superior de la vista."""
+        rows = self._rows()
+        if rows:
+            self.canvas.yview_moveto((index // self.cols) / rows)
+            self._schedule_render()
+
+    def set_focus(self, index):
+        """Pone el foco en index (None lo quita) y lo hace visible."""
+        if index is not None and not self.items:
+            index = None
+        if index is not None:
+            index = min(max(index, 0), len(self.items) - 1)
+        self.focus_index = index
+        self._focus_key = self.key(self.items[index]) if index is not None else None
+        card = self._visible.get(index) if index is not None else None
+        if card is not self._focused_card:
+            if self._focused_card is not None:
+                self._focused_card.set_focused(False)
+            if card is not None:
+                card.set_focused(True)
+            self._focused_card = card
+        if index is not None:
+            self.ensure_visible(index)
+
+    def move_focus(self, dx, dy):
+        """Mueve el foco una celda; sin foco, lo pone en la primera que se ve."""
+        if not self.items:
+            return
+        if self.focus_index is None:
+            top = int(self.canvas.canvasy(0) // self._scaled(self.cell_height))
+            self.set_focus(min(top * self.cols, len(self.items) - 1))
+            return
+        row, col = divmod(self.focus_index, self.cols)
+        col = min(max(col + dx, 0), self.cols - 1)
+        row = min(max(row + dy, 0), self._rows() - 1)
+        self.set_focus(min(row * self.cols + col, len(self.items) - 1))
+
+    def focused_item(self):
+        return self.items[self.focus_index] if self.focus_index is not None else None
+
+    def ensure_visible(self, index):
+        """Desplaza lo mínimo para que la fila de index se vea entera."""
+        rows = self._rows()
+        if not rows:
+            return
+        row_h = self._scaled(self.cell_height)
+        height = max(self.canvas.winfo_height(), 1)
+        top = self.canvas.canvasy(0)
+        y = (index // self.cols) * row_h
+        if y < top:
+            self.canvas.yview_moveto(y / (rows * row_h))
+        elif y + row_h > top + height:
+            self.canvas.yview_moveto((y + row_h - height) / (rows * row_h))
+        else:
+            return
+        self._schedule_render()
+
+    def is_on_screen(self, index):
+        """True si la fila de index se ve ahora mismo (sin contar el margen)."""
+        row_h = self._scaled(self.cell_height)
+        top = self.canvas.canvasy(0)
+        y = (index // self.cols) * row_h
+        return y + row_h > top and y < top + max(self.canvas.winfo_height(), 1)
+
+    def visible_range(self):
+        """(primer, último+1) índices con tarjeta asignada, margen incluido."""
+        height = max(self.canvas.winfo_height(), 1)
+        row_h = self._scaled(self.cell_height)
+        top = self.canvas.canvasy(0)
+        first_row = max(int(top // row_h) - self.buffer_rows, 0)
+        last_row = int((top + height) // row_h) + 1 + self.buffer_rows
+        first = first_row * self.cols
+        last = min(last_row * self.cols, len(self.items))
+        return first, last
+
+    # ----------------------------
+    # Render
+    # ----------------------------
+    def _scaled(self, value):
+        return self._apply_widget_scaling(value)
+
+    def _rows(self):
+        return (len(self.items) + self.cols - 1) // self.cols
+
+    def _update_scrollregion(self):
+        width = self.canvas.winfo_width()
+        height = self._rows() * self._scaled(self.cell_height)
+        self.canvas.configure(scrollregion=(0, 0, width, height))
+
+    def _on_configure(self, event):
+        # el primer tamaño real se aplica ya; los siguientes, con debounce
+        if self._width is None:
+            self._apply_resize()
+            return
+        if self._resize_job is not None:
+            self.after_cancel(self._resize_job)
+        self._resize_job = self.after(self.RESIZE_DEBOUNCE_MS, self._apply_resize)
+
+    def _apply_resize(self):
+        self._resize_job = None
+        width = self.canvas.winfo_width()
+        if width != self._width:
+            self._relayout(width)
+        self._schedule_render()
+
+    def _relayout(self, width):
+        """Recalcula columnas y centrado; mantiene a la vista el primer elemento."""
+        cell_w = self._scaled(self.cell_width)
+        cols = max(1, int(width // cell_w)) if self.auto_cols else self.cols
+        offset = 0 if self.stretch else max(0, (width - cols * cell_w) / 2)
+        self._width = width
+        if cols == self.cols and offset == self._offset_x and not self.stretch:
+            return
+        anchor = int(self.canvas.canvasy(0) // self._scaled(self.cell_height)) * self.cols
+        self.cols = cols
+        self._offset_x = offset
+        self._layout_dirty = True
+        self._update_scrollregion()
+        rows = self._rows()
+        if rows:
+            self.canvas.yview_moveto((anchor // cols) / rows)
+
+    def _schedule_render(self):
+        if not self._render_pending:
+            self._render_pending = True
+            self.after_idle(self._render)
+
+    def _render(self):
+        self._render_pending = False
+        self._update_scrollregion()
+        first, last = self.visible_range()
+
+        # liberar las tarjetas que salieron del rango
+        for index in [i for i in self._visible if i < first or i >= last]:
+            self._release(self._visible.pop(index))
+
+        relayout = self._layout_dirty
+        self._layout_dirty = False
+        for index in range(first, last):
+            item = self.items[index]
+            card = self._visible.get(index)
+            if card is None:
+                if self.scheduler is not None:
+                    self._defer_fill(index)
+                else:
+                    self._fill(index)
+                continue
+            old_index = self._bound[card][2]
+            if self._bound[card][1] != self._sig(item):
+                self._bind(card, item, index)
+            elif old_index != index:
+                k, sig, _old = self._bound[card]
+                self._bound[card] = (k, sig, index)
+                if self.move_card:
+                    self.move_card(card, index)
+                self._sync_focus(card, index)
+            if relayout or old_index != index:
+                self._place(card, index)
+
+        if self.on_render:
+            self.on_render()
+
+    def _fill(self, index):
+        card = self._acquire()
+        self._visible[index] = card
+        self._bind(card, self.items[index], index)
+        self._place(card, index)
+
+    def _defer_fill(self, index):
+        s = self.scheduler
+        priority = s.PRIORITY_VISIBLE if self.is_on_screen(index) else s.PRIORITY_PREFETCH
+        s.submit(self._fill_deferred, index, priority=priority, key=(id(self), index))
+
+    def _fill_deferred(self, index):
+        # la vista pudo cambiar mientras la tarea esperaba
+        first, last = self.visible_range()
+        if first <= index < last and index not in self._visible:
+            self._fill(index)
+
+    def _place(self, card, index):
+        row, col = divmod(index, self.cols)
+        x = self._offset_x + col * self._scaled(self.cell_width) + self._scaled(self.pad)
+        y = row * self._scaled(self.cell_height) + self._scaled(self.pad)
+        width = self._width if self.stretch else None
+        self._show_card(card, x, y, width)
+
+    def _sig(self, item):
+        return self.signature(item) if self.signature else None
+
+    def _bind(self, card, item, index):
+        self.bind_card(card, item, index)
+        self._bound[card] = (self.key(item), self._sig(item), index)
+        self.bind_count += 1
+        self._sync_focus(card, index)
+
+    def _sync_focus(self, card, index):
+        """La tarjeta pasó a mostrar index: ganar o perder el foco si hace falta."""
+        if index == self.focus_index:
+            if card is not self._focused_card:
+                if self._focused_card is not None:
+                    self._focused_card.set_focused(False)
+                card.set_focused(True)
+                self._focused_card = card
+        elif card is self._focused_card:
+            card.set_focused(False)
+            self._focused_card = None
+
+    def _acquire(self):
+        if self._free:
+            return self._free.pop()
+        card = self._new_card()
+        self._cards.append(card)
+        return card
+
+    def _release(self, card):
+        if card is self._focused_card:
+            card.set_focused(False)
+            self._focused_card = None
+        self._hide_card(card)
+        self._bound.pop(card, None)
+        if self.release_card:
+            self.release_card(card)
+        self._free.append(card)
+
+    # ----------------------------
+    # Tarjetas como widgets (las subclases pueden dibujarlas de otra forma)
+    # ----------------------------
+    def _new_card(self):
+        card = self.create_card(self.canvas)
+        self._windows[card] = self.canvas.create_window(0, 0, window=card, anchor="nw")
+        return card
+
+    def _show_card(self, card, x, y, width=None):
+        win = self._windows[card]
+        self.canvas.coords(win, x, y)
+        # width=0: la ventana vuelve a su ancho pedido (tarjeta reciclada de la lista)
+        self.canvas.itemconfigure(win, width=width or 0, state="normal")
+
+    def _hide_card(self, card):
+        self.canvas.itemconfigure(self._windows[card], state="hidden")
+
+    def _destroy_card(self, card):
+        self.canvas.delete(self._windows.pop(card))
+        card.destroy()
+
+    # ----------------------------
+    # Scroll
+    # ----------------------------
+    def _on_scrollbar(self, *args):
+        self.canvas.yview(*args)
+        self._schedule_render()
+
+    def _owns(self, widget):
+        return isinstance(widget, tk.Misc) and str(widget).startswith(str(self))
+
+    def _on_mouse_wheel(self, event):
+        if not self._owns(event.widget) or self.canvas.yview() == (0.0, 1.0):
+            return
+        if sys.platform.startswith("linux"):
+            step = -1 if event.num == 4 else 1
+        elif sys.platform == "darwin":
+            step = -event.delta
+        else:
+            step = -int(event.delta / 120) or (-1 if event.delta > 0 else 1)
+        self.canvas.yview_scroll(step, "units")
+        self._schedule_render()